@@ -0,0 +1,141 @@
+import datetime
+
+from rest_framework.test import APIClient
+
+from api.v1.serializers import ERROR_CONFLICT, ERROR_EXISTS
+from schedules.models import Schedule, ScheduleChange
+from schedules.tests.factories import START, CalendarTestCase
+
+URL = '/api/v1/schedules/batch/'
+
+
+def day(weeks, days=0):
+    """Дата через weeks недель и days дней после START."""
+    return (START + datetime.timedelta(weeks=weeks, days=days)).isoformat()
+
+
+class ScheduleBatchTests(CalendarTestCase):
+    """Пакет операций с расписаниями: POST /api/v1/schedules/batch/."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, *operations):
+        return self.client.post(URL, {'operations': list(operations)},
+                                format='json')
+
+    def get_week_ids(self, date):
+        return set(Schedule.objects.get(
+            author=self.user, date=date
+        ).week.values_list('id', flat=True))
+
+    def test_operations_applied(self):
+        self.post({'op': 'create', 'date': day(0), 'text': 'old'},
+                  {'op': 'create', 'date': day(0, 1), 'text': 'old'})
+        response = self.post(
+            {'op': 'create', 'date': day(0, 2), 'text': 'new'},
+            {'op': 'patch', 'date': day(0), 'text': 'patched'},
+            {'op': 'delete', 'date': day(0, 1)},
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [result['op'] for result in response.data['results']],
+            ['create', 'patch', 'delete']
+        )
+        self.assertIsNone(response.data['results'][2]['schedule'])
+        self.assertEqual(
+            dict(Schedule.objects.filter(author=self.user).values_list(
+                'date', 'text'
+            )),
+            {START: 'patched', START + datetime.timedelta(days=2): 'new'}
+        )
+        self.assertEqual(
+            list(ScheduleChange.objects.filter(
+                author=self.user
+            ).order_by('-id').values_list('action', flat=True)[:3]),
+            ['updated', 'created', 'deleted']
+        )
+
+    def test_conflict_between_operations(self):
+        response = self.post(
+            {'op': 'create', 'date': day(0), 'text': 'first',
+             'repetition_rate': 1, 'repetition_count': 2},
+            {'op': 'create', 'date': day(2), 'text': 'second'},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['operations'][0], {})
+        self.assertEqual(
+            response.data['operations'][1]['non_field_errors'],
+            [ERROR_CONFLICT]
+        )
+        self.assertFalse(Schedule.objects.exists())
+
+    def test_conflict_with_existing_schedule(self):
+        self.post({'op': 'create', 'date': day(1), 'text': 'existing'})
+        response = self.post(
+            {'op': 'create', 'date': day(0), 'text': 'repeated',
+             'repetition_rate': 1, 'repetition_count': 1},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['operations'][0]['non_field_errors'],
+            [ERROR_CONFLICT]
+        )
+
+    def test_moved_repetition_does_not_conflict_with_itself(self):
+        self.post({'op': 'create', 'date': day(0), 'text': 'repeated',
+                   'repetition_rate': 1, 'repetition_count': 2})
+        response = self.post({'op': 'patch', 'date': day(0),
+                              'repetition_rate': 2})
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_all_or_nothing(self):
+        self.post({'op': 'create', 'date': day(0), 'text': 'existing'},
+                  {'op': 'create', 'date': day(0, 3), 'text': 'existing'})
+        changes = ScheduleChange.objects.count()
+        response = self.post(
+            {'op': 'create', 'date': day(0, 1), 'text': 'valid'},
+            {'op': 'patch', 'date': day(0), 'text': 'valid'},
+            {'op': 'create', 'date': day(0, 3), 'text': 'duplicate'},
+            {'op': 'delete', 'date': day(0, 2)},
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['operations']
+        self.assertEqual(errors[:2], [{}, {}])
+        self.assertEqual(errors[2]['non_field_errors'], [ERROR_EXISTS])
+        self.assertIn('non_field_errors', errors[3])
+        self.assertEqual(
+            list(Schedule.objects.order_by('date').values_list(
+                'date', 'text'
+            )),
+            [(START, 'existing'),
+             (START + datetime.timedelta(days=3), 'existing')]
+        )
+        self.assertEqual(ScheduleChange.objects.count(), changes)
+
+    def test_week_links_rewritten(self):
+        self.post({'op': 'create', 'date': day(0), 'text': 'repeated',
+                   'repetition_rate': 1, 'repetition_count': 3})
+        weeks = [week.id for week in self.weeks]
+        self.assertEqual(self.get_week_ids(START), set(weeks[:4]))
+        response = self.post({'op': 'patch', 'date': day(0),
+                              'repetition_rate': 2, 'repetition_count': 1})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.get_week_ids(START), {weeks[0], weeks[2]})
+        through = Schedule.week.through
+        self.assertEqual(through.objects.count(), 2)
+
+    def test_week_links_for_created_schedules(self):
+        response = self.post(
+            {'op': 'create', 'date': day(0), 'text': 'a',
+             'repetition_rate': 1, 'repetition_count': 1},
+            {'op': 'create', 'date': day(0, 1), 'text': 'b'},
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        weeks = [week.id for week in self.weeks]
+        self.assertEqual(self.get_week_ids(START), set(weeks[:2]))
+        self.assertEqual(
+            self.get_week_ids(START + datetime.timedelta(days=1)),
+            {weeks[0]}
+        )
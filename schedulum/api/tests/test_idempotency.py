@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.core.cache import cache, caches
+from rest_framework.test import APIClient
+
+from api.v1.idempotency import REPLAYED_HEADER
+from api.v1.views import ScheduleViewSet
+from schedules.models import Schedule, ScheduleChange
+from schedules.tests.factories import START, CalendarTestCase
+
+URL = '/api/v1/schedules/'
+DATA = {'date': START.isoformat(), 'text': 'text'}
+
+
+class IdempotencyTests(CalendarTestCase):
+    """Создание расписания с заголовком Idempotency-Key."""
+
+    USERS = 2
+
+    def setUp(self):
+        cache.clear()
+        caches['idempotency'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, data=DATA, key='key'):
+        return self.client.post(URL, data, format='json',
+                                HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_replay_without_side_effects(self):
+        response = self.post()
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertNotIn(REPLAYED_HEADER, response)
+        changes = ScheduleChange.objects.count()
+        with self.assertNumQueries(0):
+            replayed = self.post()
+        self.assertEqual(replayed.status_code, 201)
+        self.assertEqual(replayed[REPLAYED_HEADER], 'true')
+        self.assertEqual(replayed.data, response.data)
+        self.assertEqual(Schedule.objects.count(), 1)
+        self.assertEqual(ScheduleChange.objects.count(), changes)
+
+    def test_validation_error_releases_key(self):
+        data = dict(DATA, text='')
+        self.assertEqual(self.post(data).status_code, 400)
+        response = self.post(data)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(REPLAYED_HEADER, response)
+        self.assertEqual(self.post().status_code, 201)
+
+    def test_body_mismatch(self):
+        self.post()
+        response = self.post(dict(DATA, text='other'))
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(
+            list(Schedule.objects.values_list('text', flat=True)), ['text']
+        )
+
+    def test_request_in_flight(self):
+        responses = []
+        perform_create = ScheduleViewSet.perform_create
+
+        def perform_create_with_retry(view, serializer):
+            responses.append(self.post())
+            perform_create(view, serializer)
+
+        with mock.patch.object(ScheduleViewSet, 'perform_create',
+                               perform_create_with_retry):
+            response = self.post()
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(responses[0].status_code, 409)
+        self.assertEqual(Schedule.objects.count(), 1)
+
+    def test_keys_are_per_user(self):
+        self.post()
+        self.client.force_authenticate(self.users[1])
+        response = self.post()
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertNotIn(REPLAYED_HEADER, response)
+        self.assertEqual(Schedule.objects.count(), 2)
+
+    def test_request_without_key(self):
+        self.client.post(URL, DATA, format='json')
+        response = self.client.post(URL, DATA, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(REPLAYED_HEADER, response)
@@ -0,0 +1,100 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+KEY_MAX_LENGTH = 255
+# Время, в течение которого запрос с ключом считается выполняющимся.
+PENDING_TIMEOUT = 60
+
+
+def get_fingerprint(request):
+    """Отпечаток запроса: метод, путь и тело, чтобы отличить другой запрос."""
+    body = json.dumps(request.data, sort_keys=True, ensure_ascii=False,
+                      default=str)
+    return hashlib.sha256(
+        f'{request.method} {request.path} {body}'.encode()
+    ).hexdigest()
+
+
+def get_cache_key(scope, request, key):
+    """Ключ хранилища: область, пользователь и ключ идемпотентности."""
+    user = request.user
+    ident = user.pk if user and user.is_authenticated else 'anon'
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'idempotency:{scope}:{ident}:{digest}'
+
+
+def is_storable(response):
+    """Сохраняются завершенные ответы, кроме ошибок сервера и лимитов."""
+    return (hasattr(response, 'data')
+            and response.status_code < 500
+            and response.status_code != status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+def idempotent(scope):
+    """
+    Декоратор обработчика POST с поддержкой заголовка Idempotency-Key.
+    1. Ответ на запрос с ключом хранится в кеше idempotency
+    до истечения TTL, повторный запрос с тем же ключом и телом получает
+    сохраненный ответ без валидации, хеширования пароля и записи в базу;
+    2. Тот же ключ с другим телом - ошибка 422, повтор во время
+    выполнения первого запроса - ошибка 409;
+    3. Запросы без заголовка выполняются как обычно.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, Request))
+            key = request.META.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return handler(*args, **kwargs)
+            if len(key) > KEY_MAX_LENGTH:
+                return Response(
+                    {'detail': 'Слишком длинный ключ идемпотентности.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            store = caches['idempotency']
+            cache_key = get_cache_key(scope, request, key)
+            fingerprint = get_fingerprint(request)
+            pending = {'fingerprint': fingerprint, 'status': None}
+            if not store.add(cache_key, pending, PENDING_TIMEOUT):
+                return replay(store.get(cache_key), fingerprint)
+            try:
+                response = handler(*args, **kwargs)
+            except Exception:
+                store.delete(cache_key)
+                raise
+            if is_storable(response):
+                store.set(cache_key, {'fingerprint': fingerprint,
+                                      'status': response.status_code,
+                                      'data': response.data})
+            else:
+                store.delete(cache_key)
+            return response
+        return wrapper
+    return decorator
+
+
+def replay(stored, fingerprint):
+    """Ответ на повторный запрос с уже использованным ключом."""
+    if stored is None or stored['status'] is None:
+        return Response(
+            {'detail': 'Запрос с этим ключом идемпотентности еще '
+                       'выполняется.'},
+            status=status.HTTP_409_CONFLICT
+        )
+    if stored['fingerprint'] != fingerprint:
+        return Response(
+            {'detail': 'Ключ идемпотентности уже использован для другого '
+                       'запроса.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(stored['data'], status=stored['status'],
+                    headers={REPLAYED_HEADER: 'true'})
@@ -0,0 +1,30 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON рендерер с ускоренной сериализацией через orjson.
+    1. Если orjson не установлен, используется стандартный JSONRenderer;
+    2. Запросы с отступами (indent) обрабатываются стандартным рендерером.
+    """
+
+    encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Рендер данных в JSON при помощи orjson, если он доступен."""
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if orjson is None or data is None or indent is not None:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        ret = orjson.dumps(data, default=self.encoder.default,
+                           option=orjson.OPT_PASSTHROUGH_DATETIME)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
@@ -2,59 +2,155 @@ import datetime
 
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.validators import validate_email
+from django.db import transaction
 from rest_framework import serializers, validators
 
-from schedules.models import Week, Schedule
+from schedules.models import (CHANGE_DELETED, COUNT_CHOICES, RATE_CHOICES,
+                              Profile, Week, Schedule)
+from schedules.occurrences import (get_occurrence_dates, get_schedules_dates,
+                                   match_weeks)
+
+DAY_FIELDS = ('text', 'notes')
+EMPTY_DAY = {field: '' for field in DAY_FIELDS}
+WEEK_FIELDS = ('date',) + DAY_FIELDS
+SCHEDULE_FIELDS = ('text', 'notes', 'date', 'repetition_rate',
+                   'repetition_count', 'created_at', 'updated_at')
+BATCH_FIELDS = ('text', 'notes', 'repetition_rate', 'repetition_count')
+BATCH_MAX_OPERATIONS = 50
+OP_CREATE = 'create'
+OP_PATCH = 'patch'
+OP_DELETE = 'delete'
+ERROR_SUNDAY = 'Воскресенье неучебный день.'
+ERROR_REPETITION = ('При назначении повторения должны быть указаны '
+                    'количество и частота.')
+ERROR_NO_WEEK = ('Вы пытаетесь добавить или повторить расписание на '
+                 'несуществующую неделю.')
+ERROR_CONFLICT = ('Ваше расписание попадает на день другого расписания. '
+                  'Или повтор совпадает с другим расписанием.')
+ERROR_EXISTS = 'У вас уже существует расписание на эту дату.'
+CHANGE_FIELDS = ('text', 'notes', 'repetition_rate', 'repetition_count')
+OCCUPANCY_MAX_DAYS = 31
+
+
+def parse_fields(value, allowed):
+    """
+    Получение полей ответа из параметра fields (через запятую).
+    1. Поля возвращаются в порядке allowed, пустой параметр - все поля;
+    2. Неизвестное поле - ошибка валидации.
+    """
+    if not value:
+        return allowed
+    fields = {field.strip() for field in value.split(',') if field.strip()}
+    unknown = fields.difference(allowed)
+    if unknown or not fields:
+        raise serializers.ValidationError({'fields': [
+            f'Допустимые поля: {", ".join(allowed)}.'
+        ]})
+    return tuple(field for field in allowed if field in fields)
+
+
+def serialize_week(week, rows, fields=DAY_FIELDS):
+    """
+    Сборка расписания на неделю из кортежей (date, *fields).
+    Для каждого дня недели берется первое расписание с тем же днем недели.
+    """
+    days = {}
+    for date, *values in rows:
+        days.setdefault(date.weekday(), dict(zip(fields, values)))
+    schedules = {}
+    for number in range(7):
+        date = week.start + datetime.timedelta(days=number)
+        schedules[date.strftime('%Y-%m-%d')] = days.get(date.weekday(), '')
+    return schedules
+
+
+def serialize_changes(changes):
+    """
+    Сборка списка изменений расписания из записей журнала.
+    1. Для каждой даты остается только последнее изменение;
+    2. Записи об изменении удаленного позже расписания пропускаются,
+    так как после них в журнале есть запись об удалении.
+    """
+    days = {}
+    for change in changes:
+        schedule = change.schedule
+        if change.action != CHANGE_DELETED and schedule is None:
+            continue
+        days.pop(change.date, None)
+        days[change.date] = {
+            'date': change.date.strftime('%Y-%m-%d'),
+            'action': change.action,
+            'schedule': None if schedule is None else {
+                field: getattr(schedule, field) for field in CHANGE_FIELDS
+            },
+        }
+    return list(days.values())
+
+
+def serialize_search_results(schedules):
+    """Сборка результатов поиска с датами всех повторений расписания."""
+    dates = get_schedules_dates(
+        (schedule.date, schedule.repetition_rate, schedule.repetition_count)
+        for schedule in schedules
+    )
+    return [
+        {
+            'date': schedule.date.strftime('%Y-%m-%d'),
+            'dates': [date.strftime('%Y-%m-%d')
+                      for date in schedule_dates],
+            'text': schedule.text,
+            'notes': schedule.notes,
+        }
+        for schedule, schedule_dates in zip(schedules, dates)
+    ]
+
+
+def serialize_occupancy(index, start, end, rooms=None):
+    """
+    Сборка занятости аудиторий по дням интервала: для каждой даты
+    аудитории с интервалами занятости в виде ["09:00", "10:30"].
+    """
+    occupancy = {}
+    for number in range((end - start).days + 1):
+        date = start + datetime.timedelta(days=number)
+        occupancy[date.strftime('%Y-%m-%d')] = {
+            room: [[f'{begin:%H:%M}', f'{finish:%H:%M}']
+                   for begin, finish in intervals]
+            for room, intervals in index.get_occupancy(date, rooms).items()
+        }
+    return occupancy
 
 
 class ScheduleMixinSerializer():
     """Миксин для сериализатора Schedule."""
 
-    def get_related_obj(self, date):
-        """Получение объекта related модели по полям start и end."""
-        return Week.objects.filter(start__lte=date, end__gte=date).first()
-
-    def exits_schedule(self, date_str, week_objects):
+    def exits_schedule(self, date, week_objects):
         """Проверка попадания расписания в даты другого объекта расписания."""
         user = self.context['request'].user
-        date = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
-        current_schedule = Schedule.objects.filter(
-            date=date, author=user
-        ).first()
-        for week_obj in week_objects:
-            schedule_objs = Schedule.objects.filter(
-                author=user, week=week_obj)
-            for schedule in schedule_objs:
-                if (schedule.date.weekday() == date.weekday()
-                        and schedule != current_schedule):
-                    raise serializers.ValidationError(
-                        'Ваше расписание попадает на день другого расписания. '
-                        'Или повтор совпадает с другим расписанием.'
-                    )
+        conflict = Schedule.objects.filter(
+            author=user,
+            week__in=week_objects,
+            date__week_day=date.weekday() + 2,
+        ).exclude(date=date).exists()
+        if conflict:
+            raise serializers.ValidationError(ERROR_CONFLICT)
         return None
 
-    def get_related_week_objects(self, date_str, rate=False, count=False):
+    def get_related_week_objects(self, date, rate=None, count=None):
         """
         Получение списка всех объектов Week, указанных при помощи даты
-        и повторений.
+        и повторений, одним запросом.
         """
-        date = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
-        week_objects = []
-        if rate and count:
-            for repeat in range(1, count + 1):
-                new_date = date + datetime.timedelta(
-                    days=((7 * rate) * repeat)
-                )
-                week_obj = self.get_related_obj(new_date)
-                week_objects.append(week_obj)
-        basic_week_obj = self.get_related_obj(date)
-        week_objects.append(basic_week_obj)
-        return week_objects
+        dates = get_occurrence_dates(date, rate, count)
+        weeks = Week.objects.filter(
+            start__lte=max(dates), end__gte=min(dates)
+        ).order_by('start')
+        return match_weeks(dates, list(weeks))
 
     def validate_date(self, value):
         """Проверка попадания даты на воскресенье."""
         if value.weekday() == 6:
-            raise serializers.ValidationError('Воскресенье неучебный день.')
+            raise serializers.ValidationError(ERROR_SUNDAY)
         return value
 
     def validate(self, attrs):
@@ -63,24 +159,17 @@ class ScheduleMixinSerializer():
         2. Проверка наличия необходимого объекта related модели;
         3. Запуск проверки попадания расписания в даты другого расписания.
         """
-        date = self.initial_data.get('date')
+        date = attrs.get('date')
         if date is None:
             date = self.instance.date
-            date = date.strftime('%Y-%m-%d')
-        rate = self.initial_data.get('repetition_rate')
-        count = self.initial_data.get('repetition_count')
+        rate = attrs.get('repetition_rate')
+        count = attrs.get('repetition_count')
         repetition_list = [rate, count]
         if any(repetition_list) and not all(repetition_list):
-            raise serializers.ValidationError(
-                'При назначении повторения должны быть указаны количество и '
-                'частота.'
-            )
+            raise serializers.ValidationError(ERROR_REPETITION)
         week_objects = self.get_related_week_objects(date, rate, count)
         if None in week_objects:
-            raise serializers.ValidationError(
-                'Вы пытаетесь добавить или повторить расписание на '
-                'несуществующую неделю.'
-            )
+            raise serializers.ValidationError(ERROR_NO_WEEK)
         self.exits_schedule(date, week_objects)
         return attrs
 
@@ -108,7 +197,66 @@ class TokenObtainAccessSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField(required=True)
 
 
-class ScheduleSerializer(ScheduleMixinSerializer, serializers.ModelSerializer):
+class FreeRoomsSerializer(serializers.Serializer):
+    """Сериализатор параметров поиска свободных аудиторий."""
+
+    date = serializers.DateField()
+    start = serializers.TimeField()
+    end = serializers.TimeField()
+    room = serializers.ListField(
+        child=serializers.CharField(max_length=20),
+        required=False,
+    )
+
+    def validate(self, attrs):
+        """Проверка, что начало интервала раньше окончания."""
+        if attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError(
+                'Начало интервала должно быть раньше окончания.'
+            )
+        return attrs
+
+
+class OccupancySerializer(serializers.Serializer):
+    """Сериализатор параметров занятости аудиторий на интервал дат."""
+
+    start = serializers.DateField()
+    end = serializers.DateField()
+    room = serializers.ListField(
+        child=serializers.CharField(max_length=20),
+        required=False,
+    )
+
+    def validate(self, attrs):
+        """Проверка порядка и длины интервала дат."""
+        days = (attrs['end'] - attrs['start']).days + 1
+        if days < 1:
+            raise serializers.ValidationError(
+                'Начало интервала должно быть не позже окончания.'
+            )
+        if days > OCCUPANCY_MAX_DAYS:
+            raise serializers.ValidationError(
+                f'Интервал не может быть длиннее {OCCUPANCY_MAX_DAYS} дней.'
+            )
+        return attrs
+
+
+class SparseFieldsMixinSerializer():
+    """
+    Миксин сериализатора с ограничением полей ответа.
+    Принимает аргумент fields и удаляет остальные поля, поэтому они
+    не сериализуются.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields).difference(fields):
+                self.fields.pop(name)
+
+
+class ScheduleSerializer(SparseFieldsMixinSerializer, ScheduleMixinSerializer,
+                         serializers.ModelSerializer):
     """Сериализатор для модели Schedule."""
 
     text = serializers.CharField(max_length=500)
@@ -116,22 +264,41 @@ class ScheduleSerializer(ScheduleMixinSerializer, serializers.ModelSerializer):
 
     class Meta:
         model = Schedule
-        exclude = ('id', 'week')
+        exclude = ('id', 'week', 'deleted_at')
         validators = [
             validators.UniqueTogetherValidator(
                 queryset=Schedule.objects.all(),
                 fields=('date', 'author'),
-                message=('У вас уже существует расписание на эту дату.')
+                message=ERROR_EXISTS
             )
         ]
 
 
-class ScheduleDaySerializer(serializers.ModelSerializer):
-    """Сериализатор для получения расписания на определенный день."""
+class ScheduleDaySerializer(serializers.BaseSerializer):
+    """
+    Сериализатор для получения расписания на определенный день.
+    1. Принимает объект Schedule или кортеж значений полей fields
+    (по умолчанию text и notes) из values_list;
+    2. Не использует интроспекцию полей модели для ускорения ответа.
+    """
 
-    class Meta:
-        model = Schedule
-        fields = ('text', 'notes')
+    def __init__(self, instance=None, fields=DAY_FIELDS, **kwargs):
+        self.day_fields = fields
+        super().__init__(instance, **kwargs)
+
+    def to_representation(self, instance):
+        """Представление расписания в виде словаря с полями fields."""
+        if not isinstance(instance, tuple):
+            instance = [getattr(instance, field)
+                        for field in self.day_fields]
+        return dict(zip(self.day_fields, instance))
+
+    @property
+    def data(self):
+        """Пустые поля при отсутствии расписания."""
+        if self.instance is None:
+            return {field: EMPTY_DAY[field] for field in self.day_fields}
+        return super().data
 
 
 class ScheduleUpdateSerializer(ScheduleMixinSerializer,
@@ -141,3 +308,228 @@ class ScheduleUpdateSerializer(ScheduleMixinSerializer,
     class Meta:
         model = Schedule
         fields = ('text', 'notes', 'repetition_rate', 'repetition_count')
+
+
+class ProfileSerializer(serializers.ModelSerializer):
+    """Сериализатор настроек пользователя."""
+
+    class Meta:
+        model = Profile
+        fields = ('timezone',)
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    """
+    Сериализатор одной операции пакета: op - create, patch или delete,
+    date - дата расписания, остальные поля - новые значения.
+    """
+
+    op = serializers.ChoiceField(choices=(OP_CREATE, OP_PATCH, OP_DELETE))
+    date = serializers.DateField()
+    text = serializers.CharField(max_length=500, required=False)
+    notes = serializers.CharField(max_length=500, required=False,
+                                  allow_null=True, allow_blank=True)
+    repetition_rate = serializers.ChoiceField(
+        choices=RATE_CHOICES, required=False, allow_null=True
+    )
+    repetition_count = serializers.ChoiceField(
+        choices=COUNT_CHOICES, required=False, allow_null=True
+    )
+
+    def validate_date(self, value):
+        """Проверка попадания даты на воскресенье."""
+        if value.weekday() == 6:
+            raise serializers.ValidationError(ERROR_SUNDAY)
+        return value
+
+    def validate(self, attrs):
+        """Проверка наличия текста в операции создания."""
+        if attrs['op'] == OP_CREATE and not attrs.get('text'):
+            raise serializers.ValidationError(
+                {'text': ['Обязательное поле.']}
+            )
+        return attrs
+
+
+class ScheduleBatchSerializer(serializers.Serializer):
+    """
+    Сериализатор пакета операций с расписаниями пользователя.
+    1. Все операции проверяются вместе: расписания на даты операций
+    и расписания на их неделях загружаются двумя запросами, недели всех
+    повторений - одним, пересечения ищутся и с существующими
+    расписаниями, и между операциями пакета;
+    2. При ошибке хотя бы в одной операции не выполняется ни одна,
+    ошибки возвращаются списком в порядке операций;
+    3. Операции выполняются в одной транзакции, удаление - одним
+    запросом, привязка к неделям перезаписывается массово.
+    """
+
+    operations = BatchOperationSerializer(many=True, allow_empty=False)
+
+    def validate_operations(self, value):
+        """Проверка количества операций и уникальности дат."""
+        if len(value) > BATCH_MAX_OPERATIONS:
+            raise serializers.ValidationError(
+                f'Не больше {BATCH_MAX_OPERATIONS} операций в пакете.'
+            )
+        dates = [operation['date'] for operation in value]
+        if len(set(dates)) != len(dates):
+            raise serializers.ValidationError(
+                'В пакете может быть только одна операция на дату.'
+            )
+        return value
+
+    def get_targets(self, operations):
+        """
+        Получение изменяемых объектов Schedule в порядке операций:
+        новые объекты для create, существующие с новыми значениями полей
+        для patch, существующие для delete, None при ошибке.
+        """
+        user = self.context['request'].user
+        existing = {
+            schedule.date: schedule for schedule in Schedule.objects.filter(
+                author=user,
+                date__in=[operation['date'] for operation in operations],
+            )
+        }
+        targets = []
+        for operation, errors in zip(operations, self.operation_errors):
+            schedule = existing.get(operation['date'])
+            fields = {field: operation[field] for field in BATCH_FIELDS
+                      if field in operation}
+            if operation['op'] == OP_CREATE:
+                if schedule is not None:
+                    errors.append(ERROR_EXISTS)
+                    schedule = None
+                else:
+                    schedule = Schedule(author=user, date=operation['date'],
+                                        **fields)
+            elif schedule is None:
+                errors.append('Расписание на эту дату не найдено.')
+            elif operation['op'] == OP_PATCH:
+                for field, value in fields.items():
+                    setattr(schedule, field, value)
+            if schedule is not None and operation['op'] != OP_DELETE:
+                repetition = (schedule.repetition_rate,
+                              schedule.repetition_count)
+                if any(repetition) and not all(repetition):
+                    errors.append(ERROR_REPETITION)
+            targets.append(schedule)
+        return targets
+
+    def get_weeks(self, operations, targets):
+        """
+        Получение недель всех повторений изменяемых расписаний одним
+        запросом и проверка их наличия, возвращает списки недель
+        в порядке операций и все загруженные недели.
+        """
+        changed = [
+            (index, target) for index, (operation, target) in enumerate(
+                zip(operations, targets)
+            ) if target is not None and operation['op'] != OP_DELETE
+        ]
+        dates = get_schedules_dates(
+            (target.date, target.repetition_rate, target.repetition_count)
+            for _, target in changed
+        )
+        weeks = []
+        if changed:
+            weeks = list(Week.objects.filter(
+                start__lte=max(max(items) for items in dates),
+                end__gte=min(min(items) for items in dates),
+            ).order_by('start'))
+        week_lists = [None] * len(targets)
+        occurrences = [None] * len(targets)
+        for (index, _), schedule_dates in zip(changed, dates):
+            week_objects = match_weeks(schedule_dates, weeks)
+            if None in week_objects:
+                self.operation_errors[index].append(ERROR_NO_WEEK)
+            week_lists[index] = week_objects
+            occurrences[index] = schedule_dates
+        return week_lists, occurrences, weeks
+
+    def validate_conflicts(self, operations, targets, occurrences, weeks):
+        """
+        Проверка пересечений дат повторений изменяемых расписаний
+        с остальными расписаниями пользователя и между собой.
+        """
+        user = self.context['request'].user
+        changed_ids = [target.pk for target in targets
+                       if target is not None and target.pk is not None]
+        rows = list(Schedule.objects.filter(
+            author=user, week__in=weeks
+        ).exclude(id__in=changed_ids).distinct().values_list(
+            'date', 'repetition_rate', 'repetition_count'
+        ))
+        occupied = set()
+        for schedule_dates in get_schedules_dates(rows):
+            occupied.update(schedule_dates)
+        for index, schedule_dates in enumerate(occurrences):
+            if schedule_dates is None or self.operation_errors[index]:
+                continue
+            if occupied.intersection(schedule_dates):
+                self.operation_errors[index].append(ERROR_CONFLICT)
+            occupied.update(schedule_dates)
+
+    def validate(self, attrs):
+        """Совместная проверка всех операций пакета."""
+        operations = attrs['operations']
+        self.operation_errors = [[] for _ in operations]
+        targets = self.get_targets(operations)
+        week_lists, occurrences, weeks = self.get_weeks(operations, targets)
+        self.validate_conflicts(operations, targets, occurrences, weeks)
+        if any(self.operation_errors):
+            raise serializers.ValidationError({'operations': [
+                {'non_field_errors': errors} if errors else {}
+                for errors in self.operation_errors
+            ]})
+        attrs['targets'] = targets
+        attrs['week_lists'] = week_lists
+        return attrs
+
+    @transaction.atomic
+    def create(self, validated_data):
+        """
+        Выполнение операций пакета в одной транзакции.
+        Сигналы сохранения и удаления срабатывают для каждого расписания,
+        поэтому журнал изменений и индексы остаются согласованными.
+        """
+        operations = validated_data['operations']
+        targets = validated_data['targets']
+        week_lists = validated_data['week_lists']
+        deleted = [target.pk for operation, target in zip(operations, targets)
+                   if operation['op'] == OP_DELETE]
+        if deleted:
+            Schedule.objects.filter(pk__in=deleted).delete()
+        through = Schedule.week.through
+        links = []
+        patched = []
+        for operation, target, week_objects in zip(operations, targets,
+                                                   week_lists):
+            if operation['op'] == OP_DELETE:
+                continue
+            if operation['op'] == OP_PATCH:
+                patched.append(target.pk)
+            target.save(link_weeks=False)
+            links.extend(
+                through(schedule_id=target.pk, week_id=week_id)
+                for week_id in {week.id for week in week_objects}
+            )
+        through.objects.filter(schedule_id__in=patched).delete()
+        through.objects.bulk_create(links)
+        return validated_data
+
+    def to_representation(self, instance):
+        """Результаты операций в порядке операций пакета."""
+        results = []
+        for operation, target in zip(instance['operations'],
+                                     instance['targets']):
+            deleted = operation['op'] == OP_DELETE
+            results.append({
+                'op': operation['op'],
+                'date': operation['date'].strftime('%Y-%m-%d'),
+                'schedule': None if deleted else {
+                    field: getattr(target, field) for field in BATCH_FIELDS
+                },
+            })
+        return {'results': results}
@@ -0,0 +1,112 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from schedules.events import broker
+
+EVENTS_PATH = '/api/v1/events/'
+HEARTBEAT_INTERVAL = 15
+RETRY_INTERVAL_MS = 5000
+STREAM_HEADERS = [
+    (b'content-type', b'text/event-stream; charset=utf-8'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+]
+
+
+def get_raw_token(scope):
+    """
+    Получение JWT токена из заголовка Authorization или параметра token.
+    EventSource в браузере не умеет передавать заголовки, поэтому токен
+    можно указать в строке запроса.
+    """
+    authentication = JWTAuthentication()
+    for name, value in scope.get('headers', ()):
+        if name == b'authorization':
+            return authentication.get_raw_token(value)
+    query = parse_qs(scope.get('query_string', b'').decode())
+    token = query.get('token')
+    return token[0].encode() if token else None
+
+
+def get_user_id(scope):
+    """Получение id пользователя из токена без запроса к базе данных."""
+    raw_token = get_raw_token(scope)
+    if raw_token is None:
+        return None
+    try:
+        token = JWTAuthentication().get_validated_token(raw_token)
+    except InvalidToken:
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+def format_event(event):
+    """Формирование сообщения SSE из события расписания."""
+    data = json.dumps(event, ensure_ascii=False)
+    return f'id: {event["cursor"]}\nevent: schedule\ndata: {data}\n\n'.encode()
+
+
+async def send_error(send, status, detail):
+    """Отправка ответа с ошибкой в формате JSON."""
+    body = json.dumps({'detail': detail}, ensure_ascii=False).encode()
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def wait_disconnect(receive):
+    """Ожидание отключения клиента."""
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+async def schedule_events(scope, receive, send):
+    """
+    ASGI приложение потока событий расписания пользователя (SSE).
+    1. Пользователь определяется по JWT токену;
+    2. Событие содержит курсор журнала изменений, поэтому после
+    переподключения клиент может получить пропущенное через changes/;
+    3. Раз в HEARTBEAT_INTERVAL секунд отправляется комментарий,
+    чтобы прокси не закрывали простаивающее соединение.
+    """
+    if scope['method'] != 'GET':
+        return await send_error(send, 405, 'Метод не разрешен.')
+    user_id = get_user_id(scope)
+    if user_id is None:
+        return await send_error(
+            send, 401, 'Учетные данные не были предоставлены или неверны.'
+        )
+    subscriber = broker.subscribe(user_id)
+    _, queue = subscriber
+    disconnect = asyncio.ensure_future(wait_disconnect(receive))
+    event = asyncio.ensure_future(queue.get())
+    try:
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': STREAM_HEADERS})
+        await send({'type': 'http.response.body', 'more_body': True,
+                    'body': f'retry: {RETRY_INTERVAL_MS}\n\n'.encode()})
+        while True:
+            done, _ = await asyncio.wait(
+                (event, disconnect), timeout=HEARTBEAT_INTERVAL,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnect in done:
+                break
+            if event in done:
+                body = format_event(event.result())
+                event = asyncio.ensure_future(queue.get())
+            else:
+                body = b': ping\n\n'
+            await send({'type': 'http.response.body', 'body': body,
+                        'more_body': True})
+    finally:
+        event.cancel()
+        disconnect.cancel()
+        broker.unsubscribe(user_id, subscriber)
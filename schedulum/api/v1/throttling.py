@@ -0,0 +1,123 @@
+import hashlib
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowCounter():
+    """
+    Хранилище счетчиков скользящего окна в кеше Django.
+    1. Для каждого ключа хранятся только два числа: счетчики текущего
+    и предыдущего окна, поэтому проверка не зависит от лимита запросов;
+    2. Количество запросов за последние window секунд оценивается как
+    счетчик текущего окна плюс доля счетчика предыдущего окна;
+    3. Работает с локальным кешем, так как использует только
+    get_many, add и incr.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get_keys(self, key, window, now):
+        """Ключи счетчиков текущего и предыдущего окна."""
+        number = int(now // window)
+        return f'{key}:{number}', f'{key}:{number - 1}'
+
+    def estimate(self, key, window, now):
+        """Оценка количества запросов за последние window секунд."""
+        current_key, previous_key = self.get_keys(key, window, now)
+        counts = self.cache.get_many((current_key, previous_key))
+        elapsed = now % window
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+        return current, previous, previous * (window - elapsed) / window
+
+    def hit(self, key, limit, window, now):
+        """
+        Регистрация запроса, если лимит не превышен.
+        Возвращает пару (разрешен ли запрос, секунды до следующей попытки).
+        """
+        current, previous, weighted = self.estimate(key, window, now)
+        if current + weighted >= limit:
+            return False, self.get_wait(current, previous, limit, window, now)
+        current_key, _ = self.get_keys(key, window, now)
+        self.cache.add(current_key, 0, window * 2)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, window * 2)
+        return True, 0
+
+    def get_wait(self, current, previous, limit, window, now):
+        """Время, через которое оценка опустится ниже лимита."""
+        elapsed = now % window
+        if current >= limit or not previous:
+            return window - elapsed
+        wait = window - elapsed - (limit - current) * window / previous
+        return max(wait, 0)
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Базовый throttle со счетчиком скользящего окна вместо хранения
+    истории всех запросов в кеше.
+    """
+
+    def allow_request(self, request, view):
+        """Проверка лимита запросов для ключа текущего запроса."""
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        counter = SlidingWindowCounter(self.cache)
+        allowed, self.wait_time = counter.hit(
+            self.key, self.num_requests, self.duration, self.timer()
+        )
+        return allowed
+
+    def wait(self):
+        """Рекомендуемое время ожидания до следующего запроса."""
+        return self.wait_time
+
+
+class AuthIPThrottle(SlidingWindowRateThrottle):
+    """Ограничение запросов к эндпоинтам аутентификации по IP адресу."""
+
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request, view):
+        """Ключ счетчика по IP адресу клиента."""
+        return self.cache_format % {'scope': self.scope,
+                                    'ident': self.get_ident(request)}
+
+
+class AuthUsernameThrottle(SlidingWindowRateThrottle):
+    """Ограничение запросов к эндпоинтам аутентификации по username."""
+
+    scope = 'auth_username'
+
+    def get_cache_key(self, request, view):
+        """Ключ счетчика по хешу username из тела запроса."""
+        data = request.data
+        username = data.get('username') if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        ident = hashlib.md5(username.lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class ScheduleWriteThrottle(SlidingWindowRateThrottle):
+    """Ограничение изменяющих запросов к расписанию по пользователю."""
+
+    scope = 'schedule_write'
+
+    def get_cache_key(self, request, view):
+        """Ключ счетчика по пользователю, чтение не ограничивается."""
+        if request.method in SAFE_METHODS:
+            return None
+        if not request.user or not request.user.is_authenticated:
+            ident = self.get_ident(request)
+        else:
+            ident = request.user.pk
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -1,10 +1,13 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from api.v1.views import WeekView, ScheduleViewSet, get_token, registration
+from api.v1.views import (CompressionStatsView, ProfileView, RoomViewSet,
+                          WeekMatrixView, WeekView, ScheduleViewSet,
+                          get_token, registration)
 
 v1_router = DefaultRouter()
 v1_router.register('schedules', ScheduleViewSet, basename='schedule')
+v1_router.register('rooms', RoomViewSet, basename='room')
 
 auth_urls = [
     path('signup/', registration, name='registration'),
@@ -13,6 +16,11 @@ auth_urls = [
 
 urlpatterns = [
     path('', include(v1_router.urls)),
+    path('week/<int:week_id>/', WeekView.as_view()),
+    path('week/<int:week_id>/matrix/', WeekMatrixView.as_view()),
+    path('week/<int:year>/iso/<int:iso_week>/', WeekView.as_view()),
     path('week/<int:year>/<str:month>/<int:week_num>/', WeekView.as_view()),
     path('auth/', include(auth_urls)),
+    path('profile/', ProfileView.as_view()),
+    path('stats/compression/', CompressionStatsView.as_view()),
 ]
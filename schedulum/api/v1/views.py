@@ -1,23 +1,51 @@
 import datetime
 
-from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import mixins, status
-from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 from rest_framework_simplejwt.tokens import AccessToken
 
-from api.v1.serializers import (RegistrationSerializer,
+from api.v1.idempotency import idempotent
+from api.v1.serializers import (DAY_FIELDS, SCHEDULE_FIELDS,
+                                FreeRoomsSerializer, OccupancySerializer,
+                                ProfileSerializer, RegistrationSerializer,
+                                ScheduleBatchSerializer,
                                 TokenObtainAccessSerializer,
                                 ScheduleSerializer, ScheduleDaySerializer,
-                                ScheduleUpdateSerializer)
-from schedules.models import Month, Week, Schedule, Year, User
+                                ScheduleUpdateSerializer, parse_fields,
+                                serialize_changes, serialize_occupancy,
+                                serialize_search_results, serialize_week)
+from api.v1.throttling import (AuthIPThrottle, AuthUsernameThrottle,
+                               ScheduleWriteThrottle)
+from schedules.export import CONTENT_TYPES, EXPORT_FORMATS, iter_export
+from schedules.lessons import get_occupancy_index, get_rooms
+from schedules.matrix import (get_matrix_users, iter_matrix_json,
+                              iter_matrix_rows)
+from schedules.models import Profile, Schedule, ScheduleChange, User
+from schedules.routing import get_route_or_404
+from schedules.search import SEARCH_LIMIT, search_schedules
+from schedules.timezones import get_local_days
+from schedulum.compression import (get_compression_stats,
+                                   reset_compression_stats)
 
 ERROR_SAMPLE = 'Пользователь с заданным {field} уже существует!'
+CHANGES_LIMIT = 100
+CHANGES_MAX_LIMIT = 1000
+
+
+class SparseFieldsMixin():
+    """Миксин View для получения полей ответа из параметра fields."""
+
+    def get_fields(self, allowed):
+        """Поля ответа из параметра fields или все допустимые поля."""
+        return parse_fields(self.request.query_params.get('fields'), allowed)
 
 
 class BaseScheduleViewSet(mixins.RetrieveModelMixin,
@@ -32,6 +60,8 @@ class BaseScheduleViewSet(mixins.RetrieveModelMixin,
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((AuthIPThrottle, AuthUsernameThrottle))
+@idempotent('signup')
 def registration(request):
     """View-функция регистрации пользователей и получения кода."""
     serializer = RegistrationSerializer(data=request.data)
@@ -73,6 +103,7 @@ def registration(request):
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((AuthIPThrottle, AuthUsernameThrottle))
 def get_token(request):
     """View-функция для получения авторизационного токена."""
     serializer = TokenObtainAccessSerializer(data=request.data)
@@ -92,15 +123,40 @@ def get_token(request):
     )
 
 
-class ScheduleViewSet(BaseScheduleViewSet):
-    """ViewSet для модели Schedule."""
+class ScheduleViewSet(SparseFieldsMixin, BaseScheduleViewSet):
+    """
+    ViewSet для модели Schedule.
+    При получении расписания параметр fields (через запятую) ограничивает
+    и поля ответа, и поля, загружаемые из базы данных.
+    """
 
     queryset = Schedule.objects.all()
     serializer_class = ScheduleSerializer
+    throttle_classes = (ScheduleWriteThrottle,)
     http_method_names = ['get', 'post', 'patch', 'delete']
     lookup_field = 'date'
     lookup_url_kwarg = 'date'
 
+    def get_queryset(self):
+        """Загрузка только запрошенных полей при получении расписания."""
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.only(*self.get_fields(SCHEDULE_FIELDS))
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        """Передача запрошенных полей в сериализатор при чтении."""
+        if self.action == 'retrieve':
+            kwargs['fields'] = self.get_fields(SCHEDULE_FIELDS)
+        elif self.action in ('get_actual_schedule', 'get_tomorrow_schedule'):
+            kwargs['fields'] = self.get_fields(DAY_FIELDS)
+        return super().get_serializer(*args, **kwargs)
+
+    @idempotent('schedule_create')
+    def create(self, request, *args, **kwargs):
+        """Создание расписания с поддержкой заголовка Idempotency-Key."""
+        return super().create(request, *args, **kwargs)
+
     def get_object(self):
         """Получение объекта по полям date и author."""
         queryset = self.filter_queryset(self.get_queryset())
@@ -119,14 +175,16 @@ class ScheduleViewSet(BaseScheduleViewSet):
         return super().get_serializer_class()
 
     def get_schedule(self, date):
-        """Получение объекта Schedule по полям author и date."""
-        week = Week.objects.filter(start__lte=date, end__gte=date).first()
-        schedule = Schedule.objects.filter(
+        """
+        Получение запрошенных полей (text и notes) расписания по полям
+        author и date одним запросом через неделю, в которую попадает дата.
+        """
+        return Schedule.objects.filter(
             date__week_day=date.weekday() + 2,
             author=self.request.user,
-            week=week,
-        ).first()
-        return schedule
+            week__start__lte=date,
+            week__end__gte=date,
+        ).values_list(*self.get_fields(DAY_FIELDS)).first()
 
     @action(
         methods=['GET'],
@@ -135,8 +193,11 @@ class ScheduleViewSet(BaseScheduleViewSet):
         serializer_class=ScheduleDaySerializer
     )
     def get_actual_schedule(self, request):
-        """Получение и передача объекта Schedule на сегодняшний день."""
-        date = settings.CURRENT_DAY
+        """
+        Получение и передача объекта Schedule на сегодняшний день
+        в часовом поясе пользователя.
+        """
+        date, _ = get_local_days(request.user)
         schedule_obj = self.get_schedule(date)
         serializer = self.get_serializer(schedule_obj)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -148,34 +209,262 @@ class ScheduleViewSet(BaseScheduleViewSet):
         serializer_class=ScheduleDaySerializer
     )
     def get_tomorrow_schedule(self, request):
-        """Получение и передача объекта Schedule на завтрашний день."""
-        date = settings.NEXT_DAY
+        """
+        Получение и передача объекта Schedule на завтрашний день
+        в часовом поясе пользователя.
+        """
+        _, date = get_local_days(request.user)
         schedule_obj = self.get_schedule(date)
         serializer = self.get_serializer(schedule_obj)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(
+        methods=['POST'],
+        detail=False,
+        url_path='batch',
+        serializer_class=ScheduleBatchSerializer
+    )
+    def batch(self, request):
+        """
+        Выполнение пакета операций create, patch и delete с расписаниями
+        пользователя по датам: все операции проверяются вместе и
+        выполняются в одной транзакции либо не выполняется ни одна.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(
+        methods=['GET'],
+        detail=False,
+        url_path='changes',
+    )
+    def get_changes(self, request):
+        """
+        Получение изменений расписания пользователя после курсора since.
+        1. Курсор - id последней полученной записи журнала изменений;
+        2. Ответ содержит новый курсор и признак наличия следующей страницы.
+        """
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', CHANGES_LIMIT))
+        except ValueError:
+            return Response(
+                {'since': ['Курсор и лимит должны быть целыми числами.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, CHANGES_MAX_LIMIT))
+        changes = list(
+            ScheduleChange.objects.filter(
+                author=request.user, id__gt=since
+            ).select_related('schedule').order_by('id')[:limit + 1]
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        cursor = changes[-1].id if changes else max(since, 0)
+        return Response(
+            {'cursor': cursor,
+             'has_more': has_more,
+             'changes': serialize_changes(changes)},
+            status=status.HTTP_200_OK
+        )
+
+    @action(
+        methods=['GET'],
+        detail=False,
+        url_path='search',
+    )
+    def search(self, request):
+        """
+        Поиск расписаний пользователя по тексту и заметкам.
+        Для каждого найденного расписания возвращаются все даты повторений.
+        """
+        query = request.query_params.get('q', '')
+        if not query.strip():
+            return Response(
+                {'q': ['Укажите поисковый запрос.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        schedules = search_schedules(request.user.id, query, SEARCH_LIMIT)
+        return Response(serialize_search_results(schedules),
+                        status=status.HTTP_200_OK)
+
+    @action(
+        methods=['GET'],
+        detail=False,
+        url_path='export',
+    )
+    def export(self, request):
+        """
+        Потоковый экспорт всех расписаний пользователя с датами повторений.
+        1. Формат задается параметром type: csv (по умолчанию) или ndjson;
+        2. Строки формируются по мере чтения из базы данных частями,
+        поэтому ответ не собирается в памяти целиком.
+        """
+        export_format = request.query_params.get('type', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            formats = ', '.join(EXPORT_FORMATS)
+            return Response(
+                {'type': [f'Допустимые форматы: {formats}.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = Schedule.objects.filter(author=request.user)
+        response = StreamingHttpResponse(
+            iter_export(queryset, export_format),
+            content_type=CONTENT_TYPES[export_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="schedules.{export_format}"'
+        )
+        return response
+
+
+class RoomViewSet(GenericViewSet):
+    """
+    ViewSet занятости аудиторий по парам из расписаний всех пользователей.
+    Аудитории можно ограничить параметром room (несколько раз).
+    """
 
-class WeekView(APIView):
+    def get_params(self, serializer_class):
+        """Проверка параметров запроса и приведение аудиторий к виду пар."""
+        serializer = serializer_class(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        rooms = params.get('room')
+        if rooms:
+            params['room'] = sorted({room.strip().upper() for room in rooms})
+        else:
+            params['room'] = None
+        return params
+
+    @action(
+        methods=['GET'],
+        detail=False,
+        url_path='free',
+    )
+    def free(self, request):
+        """
+        Получение аудиторий, свободных на дату date в интервале времени
+        от start до end.
+        """
+        params = self.get_params(FreeRoomsSerializer)
+        date = params['date']
+        rooms = params['room'] or get_rooms()
+        index = get_occupancy_index(date, date)
+        free_rooms = index.get_free_rooms(date, params['start'],
+                                          params['end'], rooms)
+        return Response(
+            {'date': date.strftime('%Y-%m-%d'),
+             'start': params['start'].strftime('%H:%M'),
+             'end': params['end'].strftime('%H:%M'),
+             'rooms': free_rooms},
+            status=status.HTTP_200_OK
+        )
+
+    @action(
+        methods=['GET'],
+        detail=False,
+        url_path='occupancy',
+    )
+    def occupancy(self, request):
+        """Получение интервалов занятости аудиторий по дням от start до end."""
+        params = self.get_params(OccupancySerializer)
+        index = get_occupancy_index(params['start'], params['end'])
+        return Response(
+            serialize_occupancy(index, params['start'], params['end'],
+                                params['room']),
+            status=status.HTTP_200_OK
+        )
+
+
+class WeekView(SparseFieldsMixin, APIView):
+    """
+    View расписания на неделю, параметр fields ограничивает поля дней
+    и поля, загружаемые из базы данных.
+    """
+
+    def get_week_route(self, **kwargs):
+        """
+        Получение маршрута недели из таблицы маршрутов по id недели,
+        ISO номеру недели или заголовку месяца и номеру недели.
+        """
+        if 'week_id' in kwargs:
+            return get_route_or_404('by_id', kwargs['week_id'])
+        if 'iso_week' in kwargs:
+            return get_route_or_404('by_iso',
+                                    (kwargs['year'], kwargs['iso_week']))
+        week_title = 'Неделя ' + str(kwargs['week_num'])
+        return get_route_or_404('by_title',
+                                (kwargs['year'], kwargs['month'], week_title))
 
     def get(self, request, *args, **kwargs):
         """Получение и передача всех объектов Schedule на нужную неделю."""
-        year = get_object_or_404(Year, year=kwargs['year'])
-        month = get_object_or_404(Month, title=kwargs['month'], year=year)
-        week_number = kwargs['week_num']
-        week_title = 'Неделя ' + str(week_number)
-        week = get_object_or_404(Week, title=week_title, month=month)
-        schedules = {}
-        for number in range(7):
-            date = week.start + datetime.timedelta(days=number)
-            schedule = Schedule.objects.filter(
-                date__week_day=date.weekday() + 2,
-                author=request.user,
-                week=week
-            ).first()
-            date = date.strftime('%Y-%m-%d')
-            if schedule is None:
-                schedules[date] = ''
-            else:
-                schedules[date] = {'text': schedule.text,
-                                   'notes': schedule.notes}
+        fields = self.get_fields(DAY_FIELDS)
+        week = self.get_week_route(**kwargs)
+        rows = Schedule.objects.filter(
+            author=request.user,
+            week=week.id
+        ).values_list('date', *fields)
+        schedules = serialize_week(week, rows, fields)
         return Response(schedules, status=status.HTTP_200_OK)
+
+
+class WeekMatrixView(APIView):
+    """
+    View матрицы пользователи x дни недели для персонала.
+    Пользователи задаются параметрами username (несколько раз) и q
+    (начало логина), расписания всех пользователей читаются одним запросом
+    и отдаются потоком.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, week_id):
+        """Потоковая передача матрицы расписаний на неделю в JSON."""
+        week = get_route_or_404('by_id', week_id)
+        users = get_matrix_users(request.query_params.getlist('username'),
+                                 request.query_params.get('q'))
+        return StreamingHttpResponse(
+            iter_matrix_json(week, iter_matrix_rows(week, users)),
+            content_type='application/json; charset=utf-8'
+        )
+
+
+class ProfileView(APIView):
+    """View настроек пользователя: часового пояса."""
+
+    def get(self, request):
+        """Получение настроек пользователя."""
+        profile = Profile.objects.filter(user=request.user).first()
+        return Response(ProfileSerializer(
+            profile or Profile(user=request.user)
+        ).data)
+
+    def patch(self, request):
+        """Изменение настроек пользователя."""
+        profile, _ = Profile.objects.get_or_create(user=request.user)
+        serializer = ProfileSerializer(profile, data=request.data,
+                                       partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class CompressionStatsView(APIView):
+    """
+    View счетчиков сжатия ответов процесса для персонала: количество
+    ответов и байт до и после сжатия по endpoint. DELETE сбрасывает
+    счетчики.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        """Счетчики сжатия ответов по endpoint."""
+        return Response(get_compression_stats())
+
+    def delete(self, request):
+        """Сброс счетчиков сжатия."""
+        reset_compression_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,5 @@
+"""
+Бенчмарки проекта Schedulum.
+Запуск из папки schedulum: python -m benchmarks.<название модуля>.
+Каждый бенчмарк работает на временной тестовой базе данных.
+"""
@@ -0,0 +1,48 @@
+"""
+Время отрисовки страниц списка расписаний, недель и месяцев в админ-зоне.
+Количество пользователей задается аргументом: python -m
+benchmarks.admin_changelist 1000 (по 300 расписаний на пользователя).
+"""
+import sys
+
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from django.test import Client  # noqa: E402
+
+from benchmarks import fixtures  # noqa: E402
+from schedules.models import User  # noqa: E402
+
+USERS = 200
+URLS = (
+    ('/admin/schedules/schedule/', 'расписания'),
+    ('/admin/schedules/schedule/?month={month}', 'расписания за месяц'),
+    ('/admin/schedules/schedule/?p=50', 'расписания, страница 50'),
+    ('/admin/schedules/week/', 'недели'),
+    ('/admin/schedules/month/', 'месяцы'),
+)
+
+
+def main():
+    users_count = int(sys.argv[1]) if len(sys.argv) > 1 else USERS
+    weeks = fixtures.create_calendar(months=10)
+    users = fixtures.create_users(users_count)
+    total = fixtures.create_schedules(users, weeks, text='пара')
+    admin = User.objects.create_superuser('admin', 'admin@example.com',
+                                          'password')
+    client = Client()
+    client.force_login(admin)
+    rows = []
+    for url, name in URLS:
+        url = url.format(month=weeks[-1].month_id)
+
+        def get(url=url):
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+        rows.append((name, measure(get), count_queries(get)))
+    report(f'Админ-зона: {total} расписаний', rows)
+
+
+if __name__ == '__main__':
+    main()
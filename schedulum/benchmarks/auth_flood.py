@@ -0,0 +1,96 @@
+"""
+Нагрузочный тест: задержка чтения расписания во время потока запросов
+регистрации с неверным паролем (полная проверка PBKDF2) с ограничением
+частоты запросов и без него. Поток регистраций идет с постоянной
+частотой FLOOD_RATE запросов в секунду.
+"""
+import statistics
+import threading
+import time
+
+from benchmarks.harness import setup
+
+setup()
+
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from api.v1 import throttling  # noqa: E402
+from benchmarks import fixtures  # noqa: E402
+
+DURATION = 5
+FLOOD_THREADS = 4
+FLOOD_RATE = 40
+DISABLED_RATES = {'auth_ip': None, 'auth_username': None,
+                  'schedule_write': None}
+
+
+def flood(stop, counters):
+    client = APIClient()
+    data = {'username': 'user0', 'email': 'user0@example.com',
+            'password': 'wrong-password'}
+    interval = FLOOD_THREADS / FLOOD_RATE
+    next_time = time.perf_counter()
+    while not stop.is_set():
+        response = client.post('/api/v1/auth/signup/', data, format='json')
+        counters[response.status_code] = (
+            counters.get(response.status_code, 0) + 1
+        )
+        next_time += interval
+        time.sleep(max(next_time - time.perf_counter(), 0))
+
+
+def read(stop, token, url, timings):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+        timings.append((time.perf_counter() - start) * 1000)
+
+
+def run(name, token, url):
+    from django.core.cache import cache
+    cache.clear()
+    stop = threading.Event()
+    counters = {}
+    timings = []
+    threads = [threading.Thread(target=flood, args=(stop, counters))
+               for _ in range(FLOOD_THREADS)]
+    threads.append(threading.Thread(target=read,
+                                    args=(stop, token, url, timings)))
+    cpu_start = time.process_time()
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    cpu = time.process_time() - cpu_start
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95)]
+    print(f'{name:<20}{statistics.median(timings):>10.2f}{p95:>10.2f}'
+          f'{len(timings):>8}{cpu:>8.1f}   {counters}')
+
+
+def main():
+    weeks = fixtures.create_calendar(months=2)
+    users = fixtures.create_users(2)
+    fixtures.create_schedules(users, weeks)
+    users[0].set_password('password')
+    users[0].save()
+    token = str(AccessToken.for_user(users[1]))
+    url = f'/api/v1/week/{weeks[0].id}/'
+    print(f'Поток регистраций: {FLOOD_RATE} запросов/с, {DURATION} с')
+    print(f'{"сценарий":<20}{"p50, мс":>10}{"p95, мс":>10}{"чтений":>8}'
+          f'{"CPU, с":>8}   ответы на регистрацию')
+    rates = throttling.SlidingWindowRateThrottle.THROTTLE_RATES
+    throttling.SlidingWindowRateThrottle.THROTTLE_RATES = DISABLED_RATES
+    run('без ограничения', token, url)
+    throttling.SlidingWindowRateThrottle.THROTTLE_RATES = rates
+    run('с ограничением', token, url)
+
+
+if __name__ == '__main__':
+    main()
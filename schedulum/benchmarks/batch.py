@@ -0,0 +1,100 @@
+"""
+Изменение недели расписания: шесть отдельных запросов POST, PATCH
+и DELETE против одного пакета операций.
+"""
+import datetime
+import statistics
+import time
+
+from benchmarks.harness import count_queries, report, setup
+
+setup()
+
+from django.core.cache import cache  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from benchmarks import fixtures  # noqa: E402
+from schedules.models import Schedule  # noqa: E402
+
+DAYS = 6
+REPEAT = 5
+
+
+def run(func, prepare):
+    """
+    Замер времени и количества запросов шага после подготовки данных.
+    Кеш очищается, чтобы ограничение частоты записи не влияло на замер.
+    """
+    timings = []
+    for _ in range(REPEAT):
+        prepare()
+        cache.clear()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    prepare()
+    cache.clear()
+    return (min(timings), statistics.median(timings)), count_queries(func)
+
+
+def main():
+    weeks = fixtures.create_calendar(months=10)
+    users = fixtures.create_users(20)
+    fixtures.create_schedules(users[1:], weeks)
+    user = users[0]
+    client = APIClient()
+    client.force_authenticate(user)
+    week = weeks[5]
+    dates = [(week.start + datetime.timedelta(days=day)).isoformat()
+             for day in range(DAYS)]
+
+    def separate(method, data):
+        def func():
+            for date in dates:
+                if method == 'post':
+                    response = client.post('/api/v1/schedules/',
+                                           dict(data, date=date),
+                                           format='json')
+                else:
+                    response = getattr(client, method)(
+                        f'/api/v1/schedules/{date}/', data, format='json'
+                    )
+                assert response.status_code < 300, response.content
+        return func
+
+    def batch(op, data):
+        def func():
+            response = client.post('/api/v1/schedules/batch/', {
+                'operations': [dict(data, op=op, date=date)
+                               for date in dates]
+            }, format='json')
+            assert response.status_code == 200, response.content
+        return func
+
+    text = {'text': fixtures.TEXT_SAMPLE}
+    rows = []
+    for title, steps in (
+        ('отдельные запросы', (separate('post', text),
+                               separate('patch', {'notes': 'заметка'}),
+                               separate('delete', {}))),
+        ('пакет', (batch('create', text), batch('patch', {'notes': 'заметка'}),
+                   batch('delete', {}))),
+    ):
+        def prepare(create=steps[0]):
+            Schedule.objects.filter(author=user).delete()
+            cache.clear()
+            create()
+
+        for name, func in zip(('создание', 'изменение', 'удаление'), steps):
+            if name == 'создание':
+                timings, queries = run(func, lambda: Schedule.objects.filter(
+                    author=user
+                ).delete())
+            else:
+                timings, queries = run(func, prepare)
+            rows.append((f'{title}: {name}', timings, queries))
+    report(f'Неделя из {DAYS} дней', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Сжатие ответов: время обработки запроса и размер ответа без сжатия,
+с gzip и с brotli (если установлен модуль brotli) для страниц, недели
+в API, матрицы недели и потокового экспорта.
+"""
+import datetime
+
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import Client  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from benchmarks import fixtures  # noqa: E402
+from schedulum.compression import (brotli, get_compression_stats,  # noqa
+                                   reset_compression_stats)
+
+USERS = 300
+MONTHS = 3
+TEXT = '9:00-10:30 Математика ауд. 301\n10:45-12:15 Физика ауд. 215'
+
+
+def get_encodings():
+    """Кодировки для сравнения: без сжатия, gzip и brotli."""
+    encodings = [('без сжатия', 'identity'), ('gzip', 'gzip')]
+    if brotli is not None:
+        encodings.append(('brotli', 'br, gzip'))
+    return encodings
+
+
+def fetch(client, url, encoding):
+    """Запрос с чтением всего ответа, включая потоковый, возвращает размер."""
+    response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+    assert response.status_code == 200, response.status_code
+    if response.streaming:
+        return len(b''.join(response.streaming_content))
+    return len(response.content)
+
+
+def main():
+    start = settings.CURRENT_DAY - datetime.timedelta(days=7)
+    weeks = fixtures.create_calendar(months=MONTHS, start=start)
+    users = fixtures.create_users(USERS)
+    fixtures.create_schedules(users, weeks, text=TEXT)
+    users[0].is_staff = True
+    users[0].save()
+    client = Client(
+        HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(users[0])}'
+    )
+    client.force_login(users[0])
+    week = weeks[1]
+    urls = (
+        ('календарь', '/calendar/'),
+        ('неделя', f'/schedule/week/{week.id}/'),
+        ('API неделя', f'/api/v1/week/{week.id}/'),
+        ('API матрица', f'/api/v1/week/{week.id}/matrix/'),
+        ('API экспорт', '/api/v1/schedules/export/?type=csv'),
+    )
+    rows = []
+    sizes = []
+    for name, url in urls:
+        for title, encoding in get_encodings():
+            def get(url=url, encoding=encoding):
+                return fetch(client, url, encoding)
+            sizes.append((f'{name}, {title}', get()))
+            rows.append((f'{name}, {title}', measure(get, number=5),
+                         count_queries(get)))
+    report(f'Сжатие ответов: {USERS} пользователей, {len(weeks)} недель',
+           rows)
+    print(f'\n{"сценарий":<40}{"байт":>12}')
+    for name, size in sizes:
+        print(f'{name:<40}{size:>12}')
+    reset_compression_stats()
+    for name, url in urls:
+        fetch(client, url, 'gzip')
+    print(f'\n{"endpoint":<40}{"до, байт":>12}{"после, байт":>14}')
+    for endpoint, values in get_compression_stats().items():
+        print(f'{endpoint:<40}{values["original_bytes"]:>12}'
+              f'{values["compressed_bytes"]:>14}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Рассылка расписания на завтра 1000 пользователям: команда
+send_daily_digest против отправки по одному письму с поиском
+расписания каждого пользователя отдельным запросом.
+"""
+import datetime
+
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.core import mail  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from benchmarks import fixtures  # noqa: E402
+from schedules import digest  # noqa: E402
+from schedules.models import Schedule, User  # noqa: E402
+from schedules.tasks import run_task  # noqa: E402
+
+USERS = 1000
+BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+def send_one_by_one(date):
+    """Прежний способ: запрос расписания и письмо для каждого пользователя."""
+    for user in User.objects.exclude(email=''):
+        row = Schedule.objects.filter(
+            date__week_day=date.weekday() + 2,
+            author=user,
+            week__start__lte=date,
+            week__end__gte=date,
+        ).values_list('text', 'notes').first()
+        if row is None:
+            continue
+        mail.send_mail(
+            digest.DIGEST_SUBJECT.format(date=date),
+            digest.get_template(digest.DIGEST_TEMPLATE).render({
+                'username': user.username, 'date': date,
+                'text': row[0], 'notes': row[1],
+            }),
+            settings.DEFAULT_FROM_EMAIL, (user.email,)
+        )
+
+
+def main():
+    start = settings.CURRENT_DAY - datetime.timedelta(days=7)
+    weeks = fixtures.create_calendar(months=1, start=start)
+    users = fixtures.create_users(USERS)
+    fixtures.create_schedules(users, weeks)
+    date = settings.CURRENT_DAY + datetime.timedelta(days=1)
+    if date.weekday() == 6:
+        date += datetime.timedelta(days=1)
+
+    def command():
+        run_task(digest.create_digest_task(date))
+
+    rows = []
+    with override_settings(EMAIL_BACKEND=BACKEND):
+        for name, func in (('по одному письму',
+                            lambda: send_one_by_one(date)),
+                           ('send_daily_digest', command)):
+            timings = measure(func, repeat=3)
+            mail.outbox = []
+            rows.append((name, timings, count_queries(func)))
+    report(f'Рассылка: {USERS} пользователей, {len(mail.outbox)} писем',
+           rows)
+
+
+if __name__ == '__main__':
+    main()
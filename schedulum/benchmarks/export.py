@@ -0,0 +1,70 @@
+"""
+Потоковый экспорт расписаний: время и пиковая память при выгрузке
+около миллиона строк (расписания с повторениями) в CSV и NDJSON
+в сравнении со сборкой всего файла в памяти.
+"""
+import time
+import tracemalloc
+
+from benchmarks.harness import setup
+
+setup()
+
+from benchmarks import fixtures  # noqa: E402
+from schedules.export import iter_csv, iter_export, iter_rows  # noqa: E402
+from schedules.models import Schedule  # noqa: E402
+
+USERS = 50
+MONTHS = 20
+REPETITION_COUNT = 32
+
+
+def consume(lines):
+    """Чтение всех строк экспорта, как при отправке клиенту."""
+    size = 0
+    for line in lines:
+        size += len(line)
+    return size
+
+
+def build_in_memory(queryset):
+    """Экспорт без потоковой выдачи: все строки собираются в один текст."""
+    rows = list(iter_rows(queryset.all()))
+    return len(''.join(iter_csv(rows)))
+
+
+def run(func):
+    """Замер времени и пиковой памяти Python (tracemalloc)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, size
+
+
+def main():
+    weeks = fixtures.create_calendar(months=MONTHS)
+    users = fixtures.create_users(USERS)
+    total = fixtures.create_schedules(users, weeks, 'Математический анализ')
+    Schedule.objects.update(repetition_rate=1,
+                            repetition_count=REPETITION_COUNT)
+    queryset = Schedule.objects.all()
+    rows = total * (REPETITION_COUNT + 1)
+    scenarios = (
+        ('поток CSV', lambda: consume(iter_export(queryset, 'csv'))),
+        ('поток NDJSON', lambda: consume(iter_export(queryset, 'ndjson'))),
+        ('CSV в памяти', lambda: build_in_memory(queryset)),
+    )
+    print(f'\nЭкспорт: {total} расписаний, {rows} строк')
+    print(f'{"сценарий":<20}{"время, с":>10}{"строк/с":>12}'
+          f'{"пик, МБ":>10}{"объем, МБ":>12}')
+    for name, func in scenarios:
+        elapsed, peak, size = run(func)
+        print(f'{name:<20}{elapsed:>10.2f}{rows / elapsed:>12.0f}'
+              f'{peak:>10.1f}{size / 1024 / 1024:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
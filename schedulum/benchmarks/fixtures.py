@@ -0,0 +1,67 @@
+import datetime
+
+from schedules.models import Month, Schedule, User, Week, Year
+
+WEEKS_IN_MONTH = 5
+TEXT_SAMPLE = '09:00 Математический анализ, ауд. 301\n' * 10
+
+
+def first_monday(date):
+    """Получение ближайшего понедельника не раньше указанной даты."""
+    return date + datetime.timedelta(days=(7 - date.weekday()) % 7)
+
+
+def create_calendar(months, start=None):
+    """
+    Создание объектов Year и Month, недели создаются сигналом.
+    Каждый месяц содержит 5 недель, чтобы заголовки не повторялись.
+    """
+    start = first_monday(start or datetime.date.today())
+    for number in range(months):
+        month_start = start + datetime.timedelta(
+            weeks=WEEKS_IN_MONTH * number
+        )
+        month_end = month_start + datetime.timedelta(
+            weeks=WEEKS_IN_MONTH, days=-1
+        )
+        year = (month_start + datetime.timedelta(days=15)).year
+        Year.objects.get_or_create(year=year)
+        Month(start=month_start, end=month_end).save()
+    return list(Week.objects.all())
+
+
+def create_users(count, prefix='user'):
+    """Создание пользователей без хеширования паролей."""
+    users = [User(username=f'{prefix}{number}', email=f'{prefix}{number}@'
+                  'example.com') for number in range(count)]
+    User.objects.bulk_create(users)
+    return list(User.objects.filter(username__startswith=prefix))
+
+
+def create_schedules(users, weeks, text=TEXT_SAMPLE):
+    """
+    Создание расписания на каждый учебный день всех недель для
+    каждого пользователя и привязка к неделям без вызова save().
+    Если text - список, тексты расписаний выбираются из него по очереди.
+    """
+    texts = [text] if isinstance(text, str) else text
+    schedules = [
+        Schedule(author=user, text=texts[number % len(texts)],
+                 notes=texts[number % len(texts)],
+                 date=week.start + datetime.timedelta(days=day))
+        for number, (user, week, day) in enumerate(
+            (user, week, day)
+            for user in users for week in weeks for day in range(6)
+        )
+    ]
+    Schedule.objects.bulk_create(schedules, batch_size=2000)
+    week_by_start = {week.start: week for week in weeks}
+    through = Schedule.week.through
+    links = [
+        through(schedule_id=schedule_id, week_id=week_by_start[
+            date - datetime.timedelta(days=date.weekday())
+        ].id)
+        for schedule_id, date in Schedule.objects.values_list('id', 'date')
+    ]
+    through.objects.bulk_create(links, batch_size=2000)
+    return len(schedules)
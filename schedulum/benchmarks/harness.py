@@ -0,0 +1,60 @@
+import os
+import statistics
+import time
+
+import django
+
+
+def setup(database=True):
+    """Настройка Django и создание временной тестовой базы данных."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schedulum.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmarks')
+    os.environ.setdefault('ALLOWED_HOSTS', 'testserver,localhost')
+    django.setup()
+    if not database:
+        return
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def get_rss():
+    """Текущий объем резидентной памяти процесса в МБ."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(func, repeat=5, number=1):
+    """Замер времени выполнения функции: минимум и медиана в мс."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) * 1000 / number)
+    return min(timings), statistics.median(timings)
+
+
+def count_queries(func):
+    """Подсчет количества SQL запросов при выполнении функции."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context.captured_queries)
+
+
+def report(title, rows):
+    """Вывод результатов бенчмарка в виде таблицы."""
+    print(f'\n{title}')
+    print(f'{"сценарий":<40}{"min, мс":>12}{"median, мс":>14}{"запросы":>10}')
+    for name, (best, median), queries in rows:
+        print(f'{name:<40}{best:>12.2f}{median:>14.2f}{queries:>10}')
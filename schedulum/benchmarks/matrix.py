@@ -0,0 +1,66 @@
+"""
+Матрица пользователи x дни недели для 1000 пользователей: один запрос
+в API и на странице против открытия страницы недели каждого пользователя.
+"""
+import datetime
+
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import Client  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from benchmarks import fixtures  # noqa: E402
+
+USERS = 1000
+PER_USER_SAMPLE = 20
+
+
+def main():
+    start = settings.CURRENT_DAY - datetime.timedelta(days=7)
+    weeks = fixtures.create_calendar(months=1, start=start)
+    users = fixtures.create_users(USERS)
+    total = fixtures.create_schedules(users, weeks)
+    staff = users[0]
+    staff.is_staff = True
+    staff.save()
+    week = weeks[1]
+    api = APIClient()
+    api.force_authenticate(staff)
+    client = Client()
+    client.force_login(staff)
+
+    def consume(response):
+        assert response.status_code == 200, response.status_code
+        return b''.join(response.streaming_content)
+
+    def api_matrix():
+        consume(api.get(f'/api/v1/week/{week.id}/matrix/'))
+
+    def html_matrix():
+        consume(client.get(f'/schedule/week/{week.id}/matrix/'))
+
+    def per_user():
+        for user in users[:PER_USER_SAMPLE]:
+            client.force_login(user)
+            response = client.get(f'/schedule/week/{week.id}/')
+            assert response.status_code == 200, response.status_code
+        client.force_login(staff)
+
+    api_matrix()
+    rows = [
+        ('API: матрица', measure(api_matrix), count_queries(api_matrix)),
+        ('страница: матрица', measure(html_matrix),
+         count_queries(html_matrix)),
+    ]
+    best, median = measure(per_user, repeat=3)
+    scale = USERS / PER_USER_SAMPLE
+    rows.append(('страницы недели по одной', (best * scale, median * scale),
+                 int(count_queries(per_user) * scale)))
+    report(f'Матрица: {USERS} пользователей, {total} расписаний', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Развертывание повторений расписаний: вычисление всех дат для 100 тысяч
+расписаний через NumPy, без NumPy и циклом с timedelta по каждому
+расписанию, как в прежних методах модели и сериализатора.
+"""
+import datetime
+import random
+
+from benchmarks.harness import measure, report
+
+from schedules import occurrences
+
+SCHEDULES = 100000
+SEED = 2024
+
+
+def make_rows():
+    """Случайные даты, частоты и количества повторений."""
+    generator = random.Random(SEED)
+    start = datetime.date.today().toordinal()
+    rows = []
+    for _ in range(SCHEDULES):
+        repeated = generator.random() < 0.5
+        rows.append((
+            datetime.date.fromordinal(start + generator.randrange(365)),
+            generator.randint(1, 4) if repeated else None,
+            generator.randint(1, 10) if repeated else None,
+        ))
+    return rows
+
+
+def expand_timedelta(rows):
+    """Прежний способ: цикл по повторениям каждого расписания."""
+    result = []
+    for date, rate, count in rows:
+        dates = [date]
+        if rate and count:
+            for repeat in range(1, count + 1):
+                dates.append(date + datetime.timedelta(
+                    days=((7 * rate) * repeat)
+                ))
+        result.append(dates)
+    return result
+
+
+def main():
+    rows = make_rows()
+    ordinals = [date.toordinal() for date, _, _ in rows]
+    rates = [rate for _, rate, _ in rows]
+    counts = [count for _, _, count in rows]
+    total = len(occurrences._expand_python(ordinals, rates, counts)[1])
+    numpy = occurrences.numpy
+    scenarios = [
+        ('timedelta по расписаниям', lambda: expand_timedelta(rows)),
+        ('python: порядковые номера',
+         lambda: occurrences._expand_python(ordinals, rates, counts)),
+    ]
+    if numpy is not None:
+        scenarios.append((
+            'numpy: порядковые номера',
+            lambda: occurrences._expand_numpy(ordinals, rates, counts)
+        ))
+    results = []
+    for name, func in scenarios:
+        results.append((name, measure(func), 0))
+    for title, module in (('python', None), ('numpy', numpy)):
+        if title == 'numpy' and numpy is None:
+            continue
+        occurrences.numpy = module
+        results.append((f'{title}: списки дат',
+                        measure(lambda: occurrences.get_schedules_dates(rows)),
+                        0))
+    occurrences.numpy = numpy
+    report(f'Повторения: {SCHEDULES} расписаний, {total} дат', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Занятость аудиторий: индекс по парам, разобранным из текстов расписаний,
+с кешем процесса и без него, и разбор текстов всех расписаний недели
+при каждом запросе.
+"""
+import datetime
+import time
+
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from benchmarks import fixtures  # noqa: E402
+from schedules import lessons  # noqa: E402
+from schedules.models import Schedule  # noqa: E402
+
+USERS = 1000
+GROUP_SIZE = 25
+SUBJECTS = ('Математический анализ', 'Физика', 'Химия', 'История',
+            'Программирование', 'Базы данных')
+TIMES = ('09:00-10:30', '10:40-12:10', '12:40-14:10', '14:20-15:50')
+
+
+def make_texts():
+    """Тексты расписаний групп: у каждой группы свои аудитории."""
+    return [
+        '\n'.join(
+            f'{TIMES[number]} {SUBJECTS[(group + number) % len(SUBJECTS)]}, '
+            f'ауд. {100 + (group * len(TIMES) + number) % 200}'
+            for number in range(len(TIMES))
+        )
+        for group in range(USERS // GROUP_SIZE)
+    ]
+
+
+def scan_week(week):
+    """Прежний способ: разбор текстов всех расписаний недели."""
+    occupancy = {}
+    rows = Schedule.objects.filter(week=week).values_list('date', 'text')
+    for date, text in rows:
+        for lesson in lessons.parse_lessons(text):
+            occupancy.setdefault(date, {}).setdefault(
+                lesson.room, set()
+            ).add((lesson.start_time, lesson.end_time))
+    return occupancy
+
+
+def main():
+    weeks = fixtures.create_calendar(months=1)
+    users = fixtures.create_users(USERS)
+    total = fixtures.create_schedules(users, weeks)
+    for number, text in enumerate(make_texts()):
+        group = users[number * GROUP_SIZE:(number + 1) * GROUP_SIZE]
+        Schedule.objects.filter(author__in=group).update(text=text)
+    start = time.perf_counter()
+    _, count = lessons.backfill_lessons()
+    backfill = (time.perf_counter() - start) * 1000
+    week = weeks[2]
+    date = week.start + datetime.timedelta(days=2)
+
+    def occupancy():
+        index = lessons.get_occupancy_index(week.start, week.end)
+        for day in range(6):
+            index.get_occupancy(week.start + datetime.timedelta(days=day))
+
+    def free_rooms():
+        index = lessons.get_occupancy_index(date, date)
+        index.get_free_rooms(date, datetime.time(10), datetime.time(11),
+                             lessons.get_rooms())
+
+    def cold(func):
+        def wrapper():
+            lessons.invalidate_occupancy()
+            func()
+        return wrapper
+
+    rows = [
+        ('заполнение пар', (backfill, backfill), 0),
+        ('разбор текстов недели', measure(lambda: scan_week(week)),
+         count_queries(lambda: scan_week(week))),
+    ]
+    for title, func in (('занятость недели', occupancy),
+                        ('свободные аудитории', free_rooms)):
+        rows.append((f'индекс: {title}', measure(cold(func)),
+                     count_queries(cold(func))))
+        rows.append((f'кеш: {title}', measure(func), count_queries(func)))
+    report(f'Аудитории: {total} расписаний, {count} пар, '
+           f'{len(lessons.get_rooms())} аудиторий', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Поиск по тексту и заметкам расписания: индекс FTS5 и поиск по вхождению
+подстроки (LIKE) на истории расписаний многих пользователей.
+"""
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+
+from benchmarks import fixtures  # noqa: E402
+from schedules import search  # noqa: E402
+
+USERS = 200
+SUBJECTS = (
+    'Математический анализ', 'Физика', 'Лабораторная по физике', 'Химия',
+    'История', 'Философия', 'Иностранный язык', 'Программирование',
+    'Базы данных', 'Экономика', 'Физкультура', 'Линейная алгебра',
+)
+TEXTS = [
+    f'09:00 {first}, ауд. {number}\n10:40 {second}, ауд. {number + 1}'
+    for number, (first, second) in enumerate(
+        (first, second) for first in SUBJECTS for second in SUBJECTS
+    )
+]
+QUERIES = ('физика лаб', 'анализ', 'ауд 57', 'несуществующийпредмет')
+
+
+def main():
+    weeks = fixtures.create_calendar(months=20)
+    users = fixtures.create_users(USERS)
+    total = fixtures.create_schedules(users, weeks, TEXTS)
+    search.rebuild_index()
+    author_id = users[USERS // 2].id
+    name = connection.settings_dict['NAME']
+    rows = []
+    for available, title in ((True, 'FTS5'), (False, 'LIKE')):
+        search._available[name] = available
+        for query in QUERIES:
+            def func(query=query):
+                search.search_schedules(author_id, query)
+            rows.append((f'{title}: {query}', measure(func),
+                         count_queries(func)))
+    report(f'Поиск: {total} расписаний, {USERS} пользователей', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Хранилища сессий: время отрисовки страниц и количество запросов к базе
+данных на страницу с сессиями в базе данных, в базе данных и кеше
+и в подписанной cookie. Удаление истекших сессий одним запросом
+(clearsessions) и частями (clear_expired_sessions).
+"""
+import datetime
+import io
+
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.sessions.models import Session  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from benchmarks import fixtures  # noqa: E402
+
+EXPIRED_SESSIONS = 50000
+MODES = ('db', 'cached_db', 'signed_cookies')
+
+
+def create_expired_sessions(count):
+    """Создание истекших сессий в базе данных."""
+    expire_date = timezone.now() - datetime.timedelta(days=1)
+    Session.objects.bulk_create(
+        (Session(session_key=f'expired{number:032}', session_data='',
+                 expire_date=expire_date) for number in range(count)),
+        batch_size=1000,
+    )
+
+
+def main():
+    start = settings.CURRENT_DAY - datetime.timedelta(days=7)
+    weeks = fixtures.create_calendar(months=3, start=start)
+    users = fixtures.create_users(2)
+    fixtures.create_schedules(users, weeks)
+    urls = (
+        ('календарь', '/calendar/'),
+        ('неделя', f'/schedule/week/{weeks[1].id}/'),
+        ('профиль', '/profile/'),
+    )
+    rows = []
+    for mode in MODES:
+        with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[mode]):
+            cache.clear()
+            client = Client()
+            client.force_login(users[0])
+            for name, url in urls:
+                def get(url=url):
+                    response = client.get(url)
+                    assert response.status_code == 200, response.status_code
+                get()
+                rows.append((f'{name}, {mode}', measure(get, number=20),
+                             count_queries(get)))
+    report('Страницы с разными хранилищами сессий', rows)
+    rows = []
+    for name, command in (('clearsessions', 'clearsessions'),
+                          ('частями', 'clear_expired_sessions')):
+        def clear(command=command):
+            call_command(command, stdout=io.StringIO())
+        create_expired_sessions(EXPIRED_SESSIONS)
+        timings = measure(clear, repeat=1)
+        create_expired_sessions(EXPIRED_SESSIONS)
+        rows.append((name, timings, count_queries(clear)))
+    report(f'Удаление {EXPIRED_SESSIONS} истекших сессий', rows)
+
+
+if __name__ == '__main__':
+    main()
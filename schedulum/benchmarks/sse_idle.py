@@ -0,0 +1,83 @@
+"""
+Нагрузочный тест потока событий SSE: подключение SUBSCRIBERS
+простаивающих подписчиков к ASGI приложению одного процесса, память
+на подписчика и время доставки события всем подписчикам.
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.harness import get_rss, setup
+
+setup(database=False)
+
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from schedulum.asgi import application  # noqa: E402
+from api.v1.streams import EVENTS_PATH  # noqa: E402
+from schedules.events import broker  # noqa: E402
+
+SUBSCRIBERS = 10000
+USERS = 1000
+
+
+def make_scope(token):
+    return {'type': 'http', 'method': 'GET', 'path': EVENTS_PATH,
+            'query_string': f'token={token}'.encode(), 'headers': []}
+
+
+async def run(subscribers):
+    tokens = []
+    for user_id in range(USERS):
+        token = AccessToken()
+        token['user_id'] = user_id
+        tokens.append(str(token))
+    disconnected = asyncio.Event()
+    delivered = {'events': 0}
+
+    async def receive():
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message.get('body', b'').startswith(b'id:'):
+            delivered['events'] += 1
+
+    rss_before = get_rss()
+    start = time.perf_counter()
+    connections = [
+        asyncio.ensure_future(application(
+            make_scope(tokens[number % USERS]), receive, send
+        ))
+        for number in range(subscribers)
+    ]
+    while broker.count() < subscribers:
+        await asyncio.sleep(0.01)
+    connect_time = time.perf_counter() - start
+    rss_after = get_rss()
+
+    event = {'cursor': 1, 'date': '2026-01-01', 'action': 'deleted',
+             'schedule': None}
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, lambda: [
+        broker.publish(user_id, event) for user_id in range(USERS)
+    ])
+    while delivered['events'] < subscribers:
+        await asyncio.sleep(0.001)
+    fanout_time = time.perf_counter() - start
+
+    disconnected.set()
+    await asyncio.gather(*connections)
+    print(f'Подписчиков: {subscribers}, пользователей: {USERS}')
+    print(f'подключение всех подписчиков: {connect_time:.2f} с')
+    print(f'память: {rss_after - rss_before:.1f} МБ, '
+          f'{(rss_after - rss_before) * 1024 / subscribers:.1f} КБ '
+          'на подписчика')
+    print(f'доставка события всем подписчикам: {fanout_time * 1000:.1f} мс')
+    print(f'подписчиков после отключения: {broker.count()}')
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else SUBSCRIBERS
+    asyncio.run(run(count))
@@ -0,0 +1,64 @@
+"""
+Время запуска процесса: импорт настроек, django.setup() и моделей.
+Для сравнения замеряется тот же запуск с вызовом locale.setlocale,
+который раньше выполнялся при импорте schedules.models.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUSSIAN_LOCALES = ('Russian', 'ru_RU.UTF-8', 'ru_RU.utf8')
+STARTUP_CODE = (
+    'import django; django.setup(); '
+    'import schedules.models, schedules.views, api.v1.views'
+)
+SETLOCALE_CODE = (
+    'import locale; locale.setlocale(locale.LC_ALL, {name!r}); '
+)
+RUNS = 10
+
+
+def find_russian_locale():
+    """Поиск доступного в системе русского locale."""
+    import locale
+    current = locale.setlocale(locale.LC_ALL)
+    for name in RUSSIAN_LOCALES:
+        try:
+            locale.setlocale(locale.LC_ALL, name)
+        except locale.Error:
+            continue
+        locale.setlocale(locale.LC_ALL, current)
+        return name
+    return None
+
+
+def run(code):
+    """Медиана времени запуска отдельного процесса Python в мс."""
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'schedulum.settings')
+    env.setdefault('SECRET_KEY', 'benchmarks')
+    env.setdefault('ALLOWED_HOSTS', 'localhost')
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], env=env, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    print(f'Запуск процесса, медиана {RUNS} запусков')
+    print(f'без setlocale: {run(STARTUP_CODE):.1f} мс')
+    name = find_russian_locale()
+    if name is None:
+        print('с setlocale: русский locale недоступен, прежний импорт '
+              'schedules.models завершился бы ошибкой locale.Error')
+        return
+    code = SETLOCALE_CODE.format(name=name) + STARTUP_CODE
+    print(f'с setlocale({name!r}): {run(code):.1f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Время отрисовки страниц календаря, расписания недели и профиля
+с кешированным загрузчиком шаблонов и без него.
+"""
+import copy
+import datetime
+
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+from benchmarks import fixtures  # noqa: E402
+
+USERS = 50
+MONTHS = 20
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def get_templates(cached):
+    """Настройки шаблонов с кешированным загрузчиком или без него."""
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['OPTIONS']['loaders'] = (
+        [('django.template.loaders.cached.Loader', LOADERS)]
+        if cached else LOADERS
+    )
+    return templates
+
+
+def main():
+    start = settings.CURRENT_DAY - datetime.timedelta(days=7)
+    weeks = fixtures.create_calendar(months=MONTHS, start=start)
+    users = fixtures.create_users(USERS)
+    total = fixtures.create_schedules(users, weeks)
+    client = Client()
+    client.force_login(users[0])
+    urls = (
+        ('календарь', '/calendar/'),
+        ('неделя', f'/schedule/week/{weeks[1].id}/'),
+        ('профиль', '/profile/'),
+    )
+    rows = []
+    for cached, title in ((True, 'кеш'), (False, 'без кеша')):
+        with override_settings(TEMPLATES=get_templates(cached)):
+            for name, url in urls:
+                def get(url=url):
+                    response = client.get(url)
+                    assert response.status_code == 200, response.status_code
+                get()
+                rows.append((f'{name}, {title}', measure(get, number=20),
+                             count_queries(get)))
+    report(f'Страницы: {len(weeks)} недель, {total} расписаний', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Сравнение сериализации недели и дня: прежний путь (запрос на каждый день,
+ModelSerializer, JSONRenderer), облегченный (values_list, BaseSerializer,
+FastJSONRenderer) и облегченный только с полем text (?fields=text).
+"""
+import datetime
+
+from benchmarks.harness import count_queries, measure, report, setup
+
+setup()
+
+from rest_framework import serializers  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.v1.renderers import FastJSONRenderer  # noqa: E402
+from api.v1.serializers import ScheduleDaySerializer  # noqa: E402
+from api.v1.serializers import DAY_FIELDS, serialize_week  # noqa: E402
+from benchmarks import fixtures  # noqa: E402
+from schedules.models import Schedule  # noqa: E402
+
+
+class LegacyDaySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Schedule
+        fields = ('text', 'notes')
+
+
+def legacy_week(week, user):
+    schedules = {}
+    for number in range(7):
+        date = week.start + datetime.timedelta(days=number)
+        schedule = Schedule.objects.filter(
+            date__week_day=date.weekday() + 2, author=user, week=week
+        ).first()
+        date = date.strftime('%Y-%m-%d')
+        if schedule is None:
+            schedules[date] = ''
+        else:
+            schedules[date] = {'text': schedule.text, 'notes': schedule.notes}
+    return JSONRenderer().render(schedules)
+
+
+def lean_week(week, user, fields=DAY_FIELDS):
+    rows = Schedule.objects.filter(
+        author=user, week=week
+    ).values_list('date', *fields)
+    return FastJSONRenderer().render(serialize_week(week, rows, fields))
+
+
+def legacy_days(weeks, user):
+    for week in weeks:
+        for schedule in Schedule.objects.filter(author=user, week=week):
+            JSONRenderer().render(LegacyDaySerializer(schedule).data)
+
+
+def lean_days(weeks, user):
+    for week in weeks:
+        rows = Schedule.objects.filter(
+            author=user, week=week
+        ).values_list('text', 'notes')
+        for row in rows:
+            FastJSONRenderer().render(ScheduleDaySerializer(row).data)
+
+
+def main():
+    weeks = fixtures.create_calendar(months=10)
+    users = fixtures.create_users(5)
+    fixtures.create_schedules(users, weeks)
+    user = users[0]
+    week = weeks[0]
+    assert legacy_week(week, user) == lean_week(week, user)
+    rows = []
+    for name, func in (
+        ('неделя: прежний путь', lambda: legacy_week(week, user)),
+        ('неделя: облегченный путь', lambda: lean_week(week, user)),
+        ('неделя: только text', lambda: lean_week(week, user, ('text',))),
+        ('диапазон недель: прежний путь',
+         lambda: [legacy_week(item, user) for item in weeks]),
+        ('диапазон недель: облегченный путь',
+         lambda: [lean_week(item, user) for item in weeks]),
+        ('дни диапазона: прежний путь', lambda: legacy_days(weeks, user)),
+        ('дни диапазона: облегченный путь', lambda: lean_days(weeks, user)),
+    ):
+        rows.append((name, measure(func), count_queries(func)))
+    sizes = (len(lean_week(week, user)), len(lean_week(week, user, ('text',))))
+    report(f'Сериализация: {len(weeks)} недель, неделя {sizes[0]} байт, '
+           f'только text {sizes[1]} байт', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Запуск проекта в gunicorn: время до первого ответа, задержка первых
+запросов к рабочим процессам и память рабочих процессов (RSS, PSS,
+собственная память) с preload_app и прогревом и без них.
+Требуется установленный gunicorn, используется временная база данных.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+PORT = 8791
+WORKERS = 4
+URL = f'http://127.0.0.1:{PORT}/auth/login/'
+FIRST_REQUESTS = 40
+VARIANTS = (
+    ('preload + прогрев', {'GUNICORN_PRELOAD': 'True',
+                           'WSGI_WARMUP': 'True'}),
+    ('preload', {'GUNICORN_PRELOAD': 'True', 'WSGI_WARMUP': 'False'}),
+    ('без preload', {'GUNICORN_PRELOAD': 'False', 'WSGI_WARMUP': 'False'}),
+)
+
+
+def get_env(database, **extra):
+    """Окружение процесса gunicorn."""
+    env = dict(os.environ)
+    env.update({
+        'DJANGO_SETTINGS_MODULE': 'schedulum.settings',
+        'SECRET_KEY': env.get('SECRET_KEY', 'benchmarks'),
+        'ALLOWED_HOSTS': '127.0.0.1,localhost',
+        'SQLITE_PATH': database,
+        'GUNICORN_BIND': f'127.0.0.1:{PORT}',
+        'GUNICORN_WORKERS': str(WORKERS),
+    })
+    env.update(extra)
+    return env
+
+
+def request():
+    """Запрос страницы входа, время ответа в мс или None при ошибке."""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(URL, timeout=5) as response:
+            response.read()
+    except (urllib.error.URLError, ConnectionError):
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+def read_memory(pid):
+    """RSS, PSS и собственная память процесса в МБ."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    private = values['Private_Clean'] + values['Private_Dirty']
+    return values['Rss'], values['Pss'], private
+
+
+def get_workers(pid):
+    """id рабочих процессов gunicorn."""
+    with open(f'/proc/{pid}/task/{pid}/children') as children:
+        return [int(child) for child in children.read().split()]
+
+
+def run(env):
+    """Запуск gunicorn и замеры."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        cwd=PROJECT_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while request() is None:
+            time.sleep(0.01)
+        first = (time.perf_counter() - start) * 1000
+        latencies = [request() for _ in range(FIRST_REQUESTS)]
+        time.sleep(0.5)
+        memory = [read_memory(pid) for pid in get_workers(process.pid)]
+    finally:
+        process.terminate()
+        process.wait()
+    return first, latencies, memory
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(Path(directory) / 'db.sqlite3')
+        subprocess.run(
+            [sys.executable, 'manage.py', 'migrate', '-v', '0'],
+            cwd=PROJECT_DIR, env=get_env(database), check=True
+        )
+        print(f'\ngunicorn: {WORKERS} рабочих процесса, '
+              f'{FIRST_REQUESTS} первых запросов')
+        print(f'{"вариант":<20}{"первый ответ, мс":>18}{"max, мс":>10}'
+              f'{"median, мс":>12}{"RSS, МБ":>10}{"PSS, МБ":>10}'
+              f'{"свое, МБ":>10}')
+        for name, extra in VARIANTS:
+            first, latencies, memory = run(get_env(database, **extra))
+            rss, pss, private = (
+                statistics.mean(values) for values in zip(*memory)
+            )
+            print(f'{name:<20}{first:>18.0f}{max(latencies):>10.1f}'
+                  f'{statistics.median(latencies):>12.1f}{rss:>10.1f}'
+                  f'{pss:>10.1f}{private:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
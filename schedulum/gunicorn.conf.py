@@ -0,0 +1,43 @@
+"""
+Настройки gunicorn для запуска проекта в нескольких процессах:
+
+    gunicorn -c gunicorn.conf.py
+
+1. Приложение загружается и прогревается один раз в мастер-процессе
+(preload_app), рабочие процессы получают его при fork и делят страницы
+памяти, пока те не изменяются;
+2. После загрузки объекты переносятся в постоянное поколение сборщика
+мусора (gc.freeze), чтобы сборка мусора в рабочих процессах не
+записывала в общие страницы памяти;
+3. Настройки текущего дня обновляются перед запросом при смене даты,
+поэтому ночной перезапуск процессов не нужен.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.getenv('GUNICORN_WORKERS',
+                        multiprocessing.cpu_count() * 2 + 1))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+wsgi_app = 'schedulum.wsgi:application'
+accesslog = os.getenv('GUNICORN_ACCESS_LOG')
+
+
+def when_ready(server):
+    """Перенос загруженных объектов в постоянное поколение GC."""
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    """Обновление настроек дня в новом рабочем процессе."""
+    if preload_app:
+        from schedulum.days import refresh_day_state
+        refresh_day_state()
+
+
+def pre_request(worker, req):
+    """Обновление настроек дня, если дата сменилась."""
+    from schedulum.days import refresh_day_state
+    refresh_day_state()
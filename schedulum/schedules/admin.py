@@ -1,39 +1,247 @@
 from django.contrib import admin
 
-from schedules.models import Month, Schedule, Week, Year
+from schedules.models import (Lesson, Month, Profile, Schedule, Task, Week,
+                              Year)
+from schedules.paginators import EstimatedCountPaginator
 
 
-class MonthAdmin(admin.ModelAdmin):
+class MonthListFilter(admin.RelatedFieldListFilter):
+    """Фильтр по месяцам с загрузкой годов одним запросом."""
+
+    def field_choices(self, field, request, model_admin):
+        """Получение списка месяцев вместе с годами."""
+        months = Month.objects.select_related('year')
+        return [(month.pk, str(month)) for month in months]
+
+
+class ScheduleMonthFilter(admin.SimpleListFilter):
+    """
+    Фильтр расписаний по учебному месяцу.
+    Список строится по таблице месяцев, а фильтрация идет по интервалу
+    дат, поэтому не требует сканирования таблицы расписаний.
+    """
+
+    title = 'учебный месяц'
+    parameter_name = 'month'
+
+    def lookups(self, request, model_admin):
+        """Получение списка месяцев вместе с годами."""
+        months = Month.objects.select_related('year')
+        return [(month.pk, str(month)) for month in months]
+
+    def queryset(self, request, queryset):
+        """Фильтрация расписаний по интервалу дат выбранного месяца."""
+        if self.value() is None:
+            return queryset
+        month = Month.objects.filter(pk=self.value()).first()
+        if month is None:
+            return queryset.none()
+        return queryset.filter(date__range=(month.start, month.end))
+
+
+class DeletedListFilter(admin.SimpleListFilter):
+    """Фильтр по состоянию объекта: по умолчанию только неудаленные."""
+
+    title = 'состояние'
+    parameter_name = 'deleted'
+
+    def lookups(self, request, model_admin):
+        """Варианты фильтра."""
+        return (('yes', 'Удаленные'), ('all', 'Все'))
+
+    def choices(self, changelist):
+        """Вариант "Неудаленные" выбран по умолчанию."""
+        yield {
+            'selected': self.value() is None,
+            'query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+            'display': 'Неудаленные',
+        }
+        for lookup, title in self.lookup_choices:
+            yield {
+                'selected': self.value() == lookup,
+                'query_string': changelist.get_query_string(
+                    {self.parameter_name: lookup}
+                ),
+                'display': title,
+            }
+
+    def queryset(self, request, queryset):
+        """Фильтрация объектов по полю deleted_at."""
+        if self.value() == 'yes':
+            return queryset.deleted()
+        if self.value() == 'all':
+            return queryset
+        return queryset.alive()
+
+
+class SoftDeleteAdmin(admin.ModelAdmin):
+    """
+    Админ-модель с мягким удалением.
+    1. Удаление в админ-зоне помечает объекты удаленными одним UPDATE
+    вместе со связанными объектами, окончательно они удаляются командой
+    purge_deleted;
+    2. Удаленные объекты доступны через фильтр и восстанавливаются
+    действием "Восстановить".
+    """
+
+    actions = ('restore_selected',)
+
+    def get_queryset(self, request):
+        """Получение всех объектов, включая удаленные."""
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_list_filter(self, request):
+        """Добавление фильтра по состоянию объекта."""
+        return (DeletedListFilter,) + tuple(super().get_list_filter(request))
+
+    def delete_model(self, request, obj):
+        """Мягкое удаление объекта."""
+        self.model.all_objects.filter(pk=obj.pk).soft_delete()
+
+    def delete_queryset(self, request, queryset):
+        """Мягкое удаление выбранных объектов."""
+        queryset.soft_delete()
+
+    @admin.action(description='Восстановить выбранные объекты',
+                  permissions=('delete',))
+    def restore_selected(self, request, queryset):
+        """Восстановление выбранных объектов и удаленных вместе с ними."""
+        count = queryset.restore()
+        self.message_user(request, f'Восстановлено объектов: {count}.')
+
+
+class LessonInline(admin.TabularInline):
+    """Пары расписания только для просмотра: они разбираются из текста."""
+
+    model = Lesson
+    extra = 0
+    can_delete = False
+    readonly_fields = (
+        'start_time',
+        'end_time',
+        'subject',
+        'room',
+    )
+
+    def has_add_permission(self, request, obj=None):
+        """Пары создаются только при сохранении расписания."""
+        return False
+
+
+class MonthAdmin(SoftDeleteAdmin):
     list_display = (
         'title',
         'year',
+        'deleted_at',
     )
     list_filter = (
         'year',
     )
+    list_select_related = (
+        'year',
+    )
 
 
-class ScheduleAdmin(admin.ModelAdmin):
+class ScheduleAdmin(SoftDeleteAdmin):
+    inlines = (
+        LessonInline,
+    )
     list_display = (
         'date',
         'author',
+        'deleted_at',
     )
-    list_filter = (
+    list_select_related = (
         'author',
     )
+    autocomplete_fields = (
+        'author',
+    )
+    list_filter = (
+        ScheduleMonthFilter,
+    )
+    search_fields = (
+        'author__username',
+    )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
-class WeekAdmin(admin.ModelAdmin):
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'kind',
+        'status',
+        'get_progress',
+        'created_at',
+        'updated_at',
+    )
+    list_filter = (
+        'status',
+        'kind',
+    )
+    readonly_fields = (
+        'kind',
+        'payload',
+        'status',
+        'progress',
+        'total',
+        'error',
+        'created_at',
+        'updated_at',
+    )
+
+    @admin.display(description='Прогресс')
+    def get_progress(self, obj):
+        """Прогресс выполнения задачи в виде "обработано/всего (%)"."""
+        if not obj.total:
+            return f'{obj.progress}/{obj.total}'
+        percent = obj.progress * 100 // obj.total
+        return f'{obj.progress}/{obj.total} ({percent}%)'
+
+    def has_add_permission(self, request):
+        """Задачи создаются только сигналами."""
+        return False
+
+
+class WeekAdmin(SoftDeleteAdmin):
     list_display = (
         'title',
         'month',
+        'deleted_at',
     )
     list_filter = (
-        'month',
+        ('month', MonthListFilter),
+    )
+    list_select_related = (
+        'month__year',
+    )
+
+
+class ProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        'user',
+        'timezone',
+    )
+    list_select_related = (
+        'user',
+    )
+    search_fields = (
+        'user__username',
+    )
+    raw_id_fields = (
+        'user',
     )
 
 
 admin.site.register(Month, MonthAdmin)
+admin.site.register(Profile, ProfileAdmin)
 admin.site.register(Schedule, ScheduleAdmin)
+admin.site.register(Task, TaskAdmin)
 admin.site.register(Week, WeekAdmin)
 admin.site.register(Year)
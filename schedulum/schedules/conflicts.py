@@ -0,0 +1,71 @@
+import datetime as dt
+from collections import namedtuple
+from itertools import islice
+
+from schedules.models import Schedule
+from schedules.occurrences import group_ordinals
+
+CHUNK_SIZE = 5000
+
+Conflict = namedtuple('Conflict', ('author_id', 'schedule_id', 'date',
+                                   'kept_id'))
+
+
+class ConflictStats():
+    """Счетчики проверки пересечений расписаний."""
+
+    def __init__(self):
+        self.schedules = 0
+        self.occurrences = 0
+        self.authors = 0
+
+
+def iter_schedule_rows(chunk_size=CHUNK_SIZE):
+    """
+    Чтение всех расписаний одним запросом, упорядоченных по автору,
+    дате и id. Сортировку выполняет база данных, поэтому каждое следующее
+    расписание автора начинается не раньше предыдущего.
+    """
+    return Schedule.objects.order_by('author_id', 'date', 'id').values_list(
+        'id', 'author_id', 'date', 'repetition_rate', 'repetition_count'
+    ).iterator(chunk_size=chunk_size)
+
+
+def find_conflicts(rows, stats=None, chunk_size=CHUNK_SIZE):
+    """
+    Поиск расписаний, даты или повторения которых совпадают с датами
+    более раннего расписания того же автора.
+    1. Проход по расписаниям выполняется один раз: для текущего автора
+    хранится словарь занятых дат, проверка даты - O(1);
+    2. Расписание, пересекающееся с ранее принятым, считается дубликатом,
+    его даты не занимаются, поэтому удаление всех найденных дубликатов
+    устраняет все пересечения;
+    3. Даты повторений вычисляются сразу для части из chunk_size расписаний.
+    """
+    stats = stats or ConflictStats()
+    author_id = None
+    occupied = {}
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        dates = group_ordinals(
+            [row[2].toordinal() for row in chunk],
+            [row[3] for row in chunk],
+            [row[4] for row in chunk],
+        )
+        stats.schedules += len(chunk)
+        stats.occurrences += sum(len(group) for group in dates)
+        for (schedule_id, author, *_), schedule_dates in zip(chunk, dates):
+            if author != author_id:
+                author_id = author
+                occupied = {}
+                stats.authors += 1
+            conflict = next((ordinal for ordinal in schedule_dates
+                             if ordinal in occupied), None)
+            if conflict is not None:
+                yield Conflict(author_id, schedule_id,
+                               dt.date.fromordinal(conflict),
+                               occupied[conflict])
+                continue
+            for ordinal in schedule_dates:
+                occupied[ordinal] = schedule_id
+        chunk = list(islice(rows, chunk_size))
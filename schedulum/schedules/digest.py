@@ -0,0 +1,113 @@
+import datetime as dt
+from itertools import groupby, islice
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.mail import get_connection, send_mass_mail
+from django.db import transaction
+from django.template.loader import get_template
+from django.utils import timezone
+
+from schedules.formats import format_date
+from schedules.models import TASK_RUNNING, Schedule, Task
+from schedules.routing import get_week_routes
+
+DIGEST_KIND = 'send_digest'
+DIGEST_KEY = DIGEST_KIND + ':{date}'
+DIGEST_TEMPLATE = 'emails/daily_digest.txt'
+DIGEST_SUBJECT = 'Расписание на {date}'
+DIGEST_FIELDS = ('author_id', 'author__username', 'author__email', 'text',
+                 'notes')
+CHUNK_SIZE = 100
+
+
+def get_digest_queryset(date):
+    """
+    Расписания на дату с данными авторов одним запросом с JOIN.
+    Неделя даты берется из таблицы маршрутов, поэтому отдельный запрос
+    к неделям не нужен; без недели возвращается пустой QuerySet.
+    """
+    route = get_week_routes().by_iso.get(date.isocalendar()[:2])
+    if route is None or not route.start <= date <= route.end:
+        return Schedule.objects.none()
+    return Schedule.objects.filter(
+        week=route.id,
+        date__week_day=date.weekday() + 2,
+        author__is_active=True,
+    ).exclude(author__email='').order_by('author_id', 'date')
+
+
+def get_digest_task(date):
+    """Последняя задача рассылки на дату или None."""
+    return Task.objects.filter(
+        kind=DIGEST_KIND, payload__date=date.isoformat()
+    ).order_by('-id').first()
+
+
+def create_digest_task(date):
+    """
+    Создание задачи рассылки на дату сразу в статусе "Выполняется",
+    чтобы ее не взял обработчик фоновых задач run_tasks. Ключ задачи
+    уникален среди незавершенных задач, поэтому при одновременном
+    создании второй процесс получает IntegrityError.
+    """
+    with transaction.atomic():
+        return Task.objects.create(
+            kind=DIGEST_KIND,
+            key=DIGEST_KEY.format(date=date.isoformat()),
+            status=TASK_RUNNING,
+            payload={'date': date.isoformat(), 'last_author_id': 0},
+        )
+
+
+def build_messages(rows, date, template):
+    """Письма пользователям из строк (автор, логин, почта, текст, заметки)."""
+    title = format_date(date)
+    subject = DIGEST_SUBJECT.format(date=title)
+    return [
+        (subject,
+         template.render({'username': username, 'date': title,
+                          'text': text, 'notes': notes}),
+         settings.DEFAULT_FROM_EMAIL, (email,))
+        for _, username, email, text, notes in rows
+    ]
+
+
+def send_digest(task, chunk_size=CHUNK_SIZE):
+    """
+    Рассылка расписания на дату задачи всем пользователям с расписанием.
+    1. Расписания и авторы читаются одним запросом частями, каждому автору
+    отправляется его первое расписание на дату, шаблон письма загружается
+    один раз;
+    2. Письма каждой части отправляются через send_mass_mail по одному
+    открытому соединению;
+    3. После каждой части в задаче сохраняется id последнего автора,
+    поэтому прерванная рассылка продолжается без повторных писем.
+    """
+    date = dt.date.fromisoformat(task.payload['date'])
+    queryset = get_digest_queryset(date)
+    last_author_id = task.payload.get('last_author_id', 0)
+    if not task.total:
+        task.total = queryset.order_by().values('author_id').distinct().count()
+        Task.objects.filter(pk=task.pk).update(total=task.total)
+    template = get_template(DIGEST_TEMPLATE)
+    rows = queryset.filter(author_id__gt=last_author_id).values_list(
+        *DIGEST_FIELDS
+    ).iterator(chunk_size=chunk_size)
+    authors = (next(group) for _, group in groupby(rows, itemgetter(0)))
+    connection = get_connection()
+    connection.open()
+    try:
+        chunk = list(islice(authors, chunk_size))
+        while chunk:
+            send_mass_mail(build_messages(chunk, date, template),
+                           connection=connection)
+            task.progress += len(chunk)
+            task.payload['last_author_id'] = chunk[-1][0]
+            Task.objects.filter(pk=task.pk).update(
+                progress=task.progress, payload=task.payload,
+                updated_at=timezone.now()
+            )
+            chunk = list(islice(authors, chunk_size))
+    finally:
+        connection.close()
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+
+QUEUE_SIZE = 100
+
+
+class EventBroker():
+    """
+    Внутрипроцессная рассылка событий расписания подписчикам.
+    1. Подписчик - очередь asyncio в event loop ASGI сервера;
+    2. Публиковать события можно из любого потока, например из сигналов,
+    выполняемых в потоке sync_to_async;
+    3. При переполнении очереди событие отбрасывается: клиент получит
+    пропущенные изменения через журнал изменений по курсору.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id):
+        """Создание очереди событий пользователя в текущем event loop."""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        """Удаление очереди событий пользователя."""
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id, event):
+        """Отправка события во все очереди пользователя."""
+        with self._lock:
+            subscribers = tuple(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, event)
+            except RuntimeError:
+                self.unsubscribe(user_id, (loop, queue))
+
+    def count(self):
+        """Количество подписчиков во всех очередях процесса."""
+        with self._lock:
+            return sum(len(items) for items in self._subscribers.values())
+
+    @staticmethod
+    def _put(queue, event):
+        """Добавление события в очередь без ожидания."""
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+
+broker = EventBroker()
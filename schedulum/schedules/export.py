@@ -0,0 +1,89 @@
+import csv
+import json
+from itertools import islice
+
+from schedules.occurrences import get_schedules_dates
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_HEADER = ('author', 'date', 'schedule_date', 'text', 'notes',
+                 'repetition_rate', 'repetition_count')
+EXPORT_FIELDS = ('author__username', 'date', 'text', 'notes',
+                 'repetition_rate', 'repetition_count')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+CHUNK_SIZE = 2000
+
+
+class Echo():
+    """Буфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        """Возврат строки вместо записи в файл."""
+        return value
+
+
+def iter_schedules(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Получение расписаний экспорта вместе со списком их дат, включая даты
+    повторений. Объекты читаются частями через iterator(), даты
+    повторений вычисляются сразу для всей части, поэтому память
+    не зависит от количества расписаний.
+    """
+    rows = queryset.order_by('author_id', 'date').values_list(
+        *EXPORT_FIELDS
+    ).iterator(chunk_size=chunk_size)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        dates = get_schedules_dates(
+            (date, rate, count) for _, date, _, _, rate, count in chunk
+        )
+        yield from zip(chunk, dates)
+        chunk = list(islice(rows, chunk_size))
+
+
+def iter_rows(queryset, chunk_size=CHUNK_SIZE):
+    """Получение строк экспорта: по одной строке на каждую дату расписания."""
+    for (author, date, text, notes, rate, count), schedule_dates in (
+        iter_schedules(queryset, chunk_size)
+    ):
+        base_date = date.isoformat()
+        for new_date in schedule_dates:
+            yield (author, new_date.isoformat(), base_date, text, notes,
+                   rate, count)
+
+
+def iter_csv(rows):
+    """Преобразование строк экспорта в строки CSV с заголовком."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_ndjson(schedules):
+    """
+    Преобразование расписаний экспорта в строки NDJSON: по одной строке
+    на расписание со списком дат повторений в поле dates.
+    """
+    for (author, date, text, notes, rate, count), schedule_dates in (
+        schedules
+    ):
+        fields = {
+            'author': author,
+            'schedule_date': date.isoformat(),
+            'dates': [new_date.isoformat() for new_date in schedule_dates],
+            'text': text,
+            'notes': notes,
+            'repetition_rate': rate,
+            'repetition_count': count,
+        }
+        yield json.dumps(fields, ensure_ascii=False) + '\n'
+
+
+def iter_export(queryset, export_format, chunk_size=CHUNK_SIZE):
+    """Потоковый экспорт расписаний в указанном формате."""
+    if export_format == 'csv':
+        return iter_csv(iter_rows(queryset, chunk_size))
+    return iter_ndjson(iter_schedules(queryset, chunk_size))
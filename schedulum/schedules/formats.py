@@ -0,0 +1,23 @@
+MONTH_GENITIVE_TITLES = (
+    'января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
+    'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря',
+)
+WEEKDAY_TITLES = (
+    'Понедельник', 'Вторник', 'Среда', 'Четверг', 'Пятница', 'Суббота',
+    'Воскресенье',
+)
+
+
+def format_day(date):
+    """Дата в формате "05 октября" (фильтр date:"d E")."""
+    return f'{date:%d} {MONTH_GENITIVE_TITLES[date.month - 1]}'
+
+
+def format_date(date):
+    """Дата в формате "5 октября 2024 г." (формат даты по умолчанию)."""
+    return f'{date.day} {MONTH_GENITIVE_TITLES[date.month - 1]} {date.year} г.'
+
+
+def format_interval(start, end):
+    """Интервал дат в формате "05 октября — 11 октября"."""
+    return f'{format_day(start)} — {format_day(end)}'
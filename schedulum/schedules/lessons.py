@@ -0,0 +1,307 @@
+import datetime as dt
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from schedules.models import Lesson, Schedule
+from schedules.occurrences import get_schedules_dates
+from schedules.routing import is_expired
+
+LESSON_DURATION = dt.timedelta(minutes=90)
+SUBJECT_MAX_LENGTH = 255
+ROOM_MAX_LENGTH = 20
+BATCH_SIZE = 2000
+VERSION_KEY = 'schedules:occupancy:version'
+CACHE_MAX_DATES = 400
+LINE_SEPARATOR = re.compile(r'[\n;]+')
+TIME_PATTERN = re.compile(
+    r'^\s*(?:\d+[.)]\s+)?'
+    r'(?P<start>\d{1,2})[:.](?P<start_minute>\d{2})'
+    r'(?:\s*[-–—]\s*(?P<end>\d{1,2})[:.](?P<end_minute>\d{2}))?'
+)
+ROOM_PATTERN = re.compile(
+    r'(?:\b(?:ауд(?:итория)?|каб(?:инет)?|room)\.?\s*'
+    r'(?P<room>[^\W_][\w-]*)'
+    r'|\b(?P<number>[^\W\d_]?-?\d[\w-]*))\s*$',
+    re.IGNORECASE
+)
+SUBJECT_STRIP = ' ,.-–—:'
+
+ParsedLesson = namedtuple(
+    'ParsedLesson', ('start_time', 'end_time', 'subject', 'room')
+)
+
+
+def get_time(hour, minute):
+    """Получение времени из строк часа и минут или None."""
+    hour, minute = int(hour), int(minute)
+    if hour > 23 or minute > 59:
+        return None
+    return dt.time(hour, minute)
+
+
+def parse_line(line):
+    """
+    Разбор одной строки расписания вида "9:00-10:30 Математика ауд. 301".
+    1. Строка должна начинаться со времени начала пары, время окончания
+    необязательно и по умолчанию равно началу плюс LESSON_DURATION;
+    2. Аудитория - слово после "ауд."/"каб."/"room" или последнее слово
+    строки с цифрой, остальное - название пары;
+    3. Возвращает None, если строка не описывает пару.
+    """
+    match = TIME_PATTERN.match(line)
+    if match is None:
+        return None
+    start_time = get_time(match['start'], match['start_minute'])
+    if start_time is None:
+        return None
+    if match['end'] is None:
+        start = dt.datetime.combine(dt.date.min, start_time)
+        end_time = min(start + LESSON_DURATION,
+                       dt.datetime.combine(dt.date.min, dt.time.max)).time()
+    else:
+        end_time = get_time(match['end'], match['end_minute'])
+    if end_time is None or end_time <= start_time:
+        return None
+    rest = line[match.end():]
+    room = ''
+    room_match = ROOM_PATTERN.search(rest)
+    if room_match is not None:
+        room = (room_match['room'] or room_match['number']).upper()
+        rest = rest[:room_match.start()]
+    return ParsedLesson(
+        start_time=start_time,
+        end_time=end_time,
+        subject=rest.strip(SUBJECT_STRIP)[:SUBJECT_MAX_LENGTH],
+        room=room[:ROOM_MAX_LENGTH],
+    )
+
+
+def parse_lessons(text):
+    """Разбор текста расписания на пары, строки без времени пропускаются."""
+    lessons = []
+    for line in LINE_SEPARATOR.split(text or ''):
+        lesson = parse_line(line)
+        if lesson is not None:
+            lessons.append(lesson)
+    return lessons
+
+
+def build_lessons(schedule_id, text):
+    """Объекты Lesson расписания, разобранные из его текста."""
+    return [Lesson(schedule_id=schedule_id, **lesson._asdict())
+            for lesson in parse_lessons(text)]
+
+
+def sync_lessons(schedule):
+    """Пересоздание пар расписания по его тексту."""
+    Lesson.objects.filter(schedule_id=schedule.pk).delete()
+    lessons = build_lessons(schedule.pk, schedule.text)
+    if lessons:
+        Lesson.objects.bulk_create(lessons)
+
+
+def backfill_lessons(batch_size=BATCH_SIZE):
+    """
+    Заполнение пар по текстам всех расписаний частями, например после
+    загрузки расписаний через bulk_create или SQL, минуя сигналы.
+    Возвращает количество обработанных расписаний и созданных пар.
+    """
+    rows = Schedule.all_objects.order_by('id').values_list(
+        'id', 'text'
+    ).iterator(chunk_size=batch_size)
+    schedules = lessons = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            lessons += replace_lessons(batch)
+            schedules += len(batch)
+            batch = []
+    lessons += replace_lessons(batch)
+    schedules += len(batch)
+    invalidate_occupancy()
+    return schedules, lessons
+
+
+def replace_lessons(rows):
+    """Замена пар части расписаний, принимает кортежи (id, text)."""
+    if not rows:
+        return 0
+    Lesson.objects.filter(schedule_id__in=[pk for pk, _ in rows]).delete()
+    lessons = []
+    for schedule_id, text in rows:
+        lessons.extend(build_lessons(schedule_id, text))
+    Lesson.objects.bulk_create(lessons, batch_size=BATCH_SIZE)
+    return len(lessons)
+
+
+def merge_intervals(intervals):
+    """
+    Объединение пересекающихся интервалов времени, возвращает пару
+    упорядоченных списков начал и окончаний непересекающихся интервалов.
+    """
+    starts, ends = [], []
+    for start, end in sorted(intervals):
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], end)
+            continue
+        starts.append(start)
+        ends.append(end)
+    return starts, ends
+
+
+class OccupancyIndex():
+    """
+    Индекс занятости аудиторий по датам.
+    1. Для каждой даты и аудитории хранится упорядоченный список
+    непересекающихся интервалов занятости, поэтому одинаковые пары
+    разных пользователей занимают один интервал;
+    2. Проверка занятости аудитории на интервал - один бинарный поиск.
+    """
+
+    def __init__(self, by_date):
+        """Индекс из словаря {дата: {аудитория: (начала, окончания)}}."""
+        self.by_date = by_date
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Построение индекса из кортежей (date, room, start, end)."""
+        intervals = {}
+        for date, room, start, end in rows:
+            intervals.setdefault(date, {}).setdefault(room, []).append(
+                (start, end)
+            )
+        return cls({
+            date: {room: merge_intervals(room_intervals)
+                   for room, room_intervals in rooms.items()}
+            for date, rooms in intervals.items()
+        })
+
+    def is_free(self, date, room, start, end):
+        """Проверка, что аудитория свободна на интервале [start, end)."""
+        starts, ends = self.by_date.get(date, {}).get(room, ((), ()))
+        position = bisect_right(ends, start)
+        return position == len(ends) or starts[position] >= end
+
+    def get_free_rooms(self, date, start, end, rooms):
+        """Аудитории из списка rooms, свободные на интервале [start, end)."""
+        return [room for room in rooms
+                if self.is_free(date, room, start, end)]
+
+    def get_occupancy(self, date, rooms=None):
+        """Интервалы занятости аудиторий на дату."""
+        occupancy = self.by_date.get(date, {})
+        if rooms is None:
+            rooms = sorted(occupancy)
+        return {room: list(zip(*occupancy[room]))
+                for room in rooms if room in occupancy}
+
+
+def get_lesson_rows(start, end):
+    """
+    Получение пар с аудиторией, проходящих в интервале дат, одним запросом.
+    1. Расписания выбираются по неделям, пересекающим интервал, поэтому
+    повторения, начатые раньше интервала, тоже учитываются;
+    2. Одинаковые пары разных пользователей схлопываются в базе данных
+    через DISTINCT до развертывания повторений;
+    3. Возвращает кортежи (date, room, start_time, end_time).
+    """
+    schedules = Schedule.objects.filter(
+        week__start__lte=end, week__end__gte=start
+    ).values('id')
+    rows = list(Lesson.objects.filter(
+        schedule__in=schedules
+    ).exclude(room='').order_by().values_list(
+        'schedule__date', 'schedule__repetition_rate',
+        'schedule__repetition_count', 'room', 'start_time', 'end_time',
+    ).distinct())
+    dates = get_schedules_dates(row[:3] for row in rows)
+    for row, lesson_dates in zip(rows, dates):
+        for date in lesson_dates:
+            if start <= date <= end:
+                yield date, row[3], row[4], row[5]
+
+
+_lock = threading.Lock()
+_state = {'version': None, 'dates': {}, 'rooms': None, 'built_at': 0.0}
+
+
+def get_version():
+    """Текущая версия данных о парах из кеша Django."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def invalidate_occupancy():
+    """Сброс индекса занятости во всех процессах при изменении пар."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+    _state['dates'] = {}
+    _state['rooms'] = None
+
+
+def check_version(version):
+    """
+    Сброс кеша процесса, если версия данных о парах изменилась
+    или кеш старше PROCESS_CACHE_MAX_AGE секунд.
+    """
+    if _state['version'] != version or is_expired(_state['built_at']):
+        _state['version'] = version
+        _state['dates'] = {}
+        _state['rooms'] = None
+        _state['built_at'] = time.monotonic()
+
+
+def get_occupancy_index(start, end):
+    """
+    Получение индекса занятости аудиторий на интервал дат.
+    1. Индекс каждой даты хранится в кеше процесса до изменения версии
+    в кеше Django, поэтому повторные запросы не обращаются к базе данных;
+    2. Недостающие даты загружаются одним запросом.
+    """
+    version = get_version()
+    dates = [start + dt.timedelta(days=number)
+             for number in range((end - start).days + 1)]
+    with _lock:
+        check_version(version)
+        cached = _state['dates']
+        by_date = {date: cached[date] for date in dates if date in cached}
+    missing = [date for date in dates if date not in by_date]
+    if missing:
+        loaded = OccupancyIndex.from_rows(
+            get_lesson_rows(min(missing), max(missing))
+        ).by_date
+        for date in missing:
+            by_date[date] = loaded.get(date, {})
+        with _lock:
+            if _state['version'] == version:
+                cached = _state['dates']
+                if len(cached) + len(missing) > CACHE_MAX_DATES:
+                    cached.clear()
+                cached.update((date, by_date[date]) for date in missing)
+    return OccupancyIndex(by_date)
+
+
+def get_rooms():
+    """Список всех аудиторий, указанных в парах, из кеша процесса."""
+    version = get_version()
+    with _lock:
+        check_version(version)
+        rooms = _state['rooms']
+    if rooms is None:
+        rooms = list(Lesson.objects.exclude(room='').order_by(
+            'room'
+        ).values_list('room', flat=True).distinct())
+        with _lock:
+            if _state['version'] == version:
+                _state['rooms'] = rooms
+    return rooms
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from schedules.lessons import BATCH_SIZE, backfill_lessons
+
+
+class Command(BaseCommand):
+    """Команда заполнения пар по текстам всех расписаний."""
+
+    help = 'Разбор текстов всех расписаний на пары с аудиториями.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество расписаний, обрабатываемых за один проход.',
+        )
+
+    def handle(self, *args, **options):
+        """Заполнение пар в одной транзакции."""
+        start = time.perf_counter()
+        with transaction.atomic():
+            schedules, lessons = backfill_lessons(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано расписаний: {schedules}, создано пар: {lessons} '
+            f'за {time.perf_counter() - start:.2f} с.'
+        ))
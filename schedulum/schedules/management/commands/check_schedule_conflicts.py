@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from schedules.conflicts import (CHUNK_SIZE, ConflictStats, find_conflicts,
+                                 iter_schedule_rows)
+from schedules.models import Schedule, User
+from schedules.tasks import iter_chunks
+
+
+class Command(BaseCommand):
+    """Команда поиска пересекающихся расписаний во всей базе данных."""
+
+    help = ('Поиск расписаний, даты или повторения которых совпадают '
+            'с другим расписанием того же пользователя.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Удалить более поздние пересекающиеся расписания.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество объектов Schedule, читаемых за один запрос.',
+        )
+
+    def handle(self, *args, **options):
+        """Проверка расписаний, вывод пересечений и статистики."""
+        stats = ConflictStats()
+        start = time.perf_counter()
+        conflicts = list(find_conflicts(
+            iter_schedule_rows(options['chunk_size']), stats,
+            options['chunk_size']
+        ))
+        scan_time = time.perf_counter() - start
+        usernames = dict(User.objects.filter(
+            id__in={conflict.author_id for conflict in conflicts}
+        ).values_list('id', 'username'))
+        for conflict in conflicts:
+            self.stdout.write(
+                f'{usernames.get(conflict.author_id, conflict.author_id)}: '
+                f'расписание {conflict.schedule_id} совпадает '
+                f'{conflict.date:%Y-%m-%d} с расписанием {conflict.kept_id}.'
+            )
+        rate = stats.schedules / scan_time if scan_time else 0
+        self.stdout.write(
+            f'Проверено расписаний: {stats.schedules}, дат: '
+            f'{stats.occurrences}, пользователей: {stats.authors} '
+            f'за {scan_time:.2f} с ({rate:.0f} расписаний/с).'
+        )
+        if not conflicts:
+            self.stdout.write(self.style.SUCCESS('Пересечений не найдено.'))
+            return
+        if not options['fix']:
+            self.stdout.write(self.style.WARNING(
+                f'Найдено пересекающихся расписаний: {len(conflicts)}. '
+                'Для удаления запустите команду с параметром --fix.'
+            ))
+            return
+        start = time.perf_counter()
+        ids = [conflict.schedule_id for conflict in conflicts]
+        for chunk in iter_chunks(ids, options['chunk_size']):
+            Schedule.objects.filter(id__in=chunk).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено расписаний: {len(ids)} за '
+            f'{time.perf_counter() - start:.2f} с.'
+        ))
@@ -0,0 +1,55 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """Команда удаления истекших сессий частями."""
+
+    help = ('Удаление истекших сессий из базы данных частями, чтобы не '
+            'блокировать таблицу сессий одним большим запросом.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество сессий, удаляемых за один запрос.',
+        )
+
+    def clear(self, model, batch_size):
+        """Удаление истекших сессий частями, возвращает количество."""
+        now = timezone.now()
+        expired = model.objects.filter(expire_date__lt=now).order_by(
+            'expire_date'
+        ).values_list('session_key', flat=True)
+        count = 0
+        while True:
+            keys = list(expired[:batch_size])
+            if not keys:
+                return count
+            model.objects.filter(session_key__in=keys).delete()
+            count += len(keys)
+
+    def handle(self, *args, **options):
+        """
+        Удаление истекших сессий для хранилищ с базой данных (db,
+        cached_db). Записи в кеше истекают вместе с сессией, подписанные
+        cookie не хранятся на сервере.
+        """
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(store, 'get_model_class'):
+            self.stdout.write('Сессии не хранятся в базе данных, '
+                              'удалять нечего.')
+            return
+        start = time.perf_counter()
+        count = self.clear(store.get_model_class(), options['batch_size'])
+        self.stdout.write(
+            f'Удалено истекших сессий: {count} '
+            f'за {time.perf_counter() - start:.2f} с.'
+        )
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from schedules.export import CHUNK_SIZE, EXPORT_FORMATS, iter_export
+from schedules.models import Schedule, User
+
+
+class Command(BaseCommand):
+    """Команда потокового экспорта расписаний в CSV или NDJSON."""
+
+    help = ('Экспорт расписаний пользователей (или всех пользователей) '
+            'с датами повторений в CSV или NDJSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help='Username пользователя, можно указать несколько раз. '
+                 'По умолчанию экспортируются все пользователи.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=EXPORT_FORMATS,
+            default='csv',
+            help='Формат файла экспорта.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Путь к файлу. По умолчанию вывод в stdout.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество объектов Schedule, читаемых за один запрос.',
+        )
+
+    def handle(self, *args, **options):
+        """Запись экспорта в файл или stdout."""
+        queryset = Schedule.objects.all()
+        usernames = options['usernames']
+        if usernames:
+            found = set(User.objects.filter(
+                username__in=usernames
+            ).values_list('username', flat=True))
+            missing = sorted(set(usernames) - found)
+            if missing:
+                raise CommandError(
+                    f'Пользователи не найдены: {", ".join(missing)}.'
+                )
+            queryset = queryset.filter(author__username__in=usernames)
+        lines = iter_export(queryset, options['format'],
+                            options['chunk_size'])
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(lines)
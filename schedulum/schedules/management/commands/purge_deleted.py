@@ -0,0 +1,55 @@
+import datetime as dt
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from schedules.models import Month, Schedule, Week
+from schedules.tasks import iter_chunks
+
+RETENTION_DAYS = 30
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """Команда окончательного удаления мягко удаленных объектов."""
+
+    help = ('Окончательное удаление расписаний, недель и месяцев, '
+            'удаленных раньше указанного количества дней назад.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=RETENTION_DAYS,
+            help='Сколько дней хранить удаленные объекты.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество объектов, удаляемых за один запрос.',
+        )
+
+    def purge(self, model, before, batch_size):
+        """Удаление объектов модели частями, возвращает количество."""
+        ids = list(model.all_objects.filter(
+            deleted_at__lt=before
+        ).order_by('pk').values_list('pk', flat=True))
+        for chunk in iter_chunks(ids, batch_size):
+            model.all_objects.filter(pk__in=chunk).delete()
+        return len(ids)
+
+    def handle(self, *args, **options):
+        """
+        Удаление сначала расписаний, затем недель и месяцев, чтобы
+        каскадное удаление не обрабатывало расписания повторно.
+        """
+        before = timezone.now() - dt.timedelta(days=options['days'])
+        for model in (Schedule, Week, Month):
+            start = time.perf_counter()
+            count = self.purge(model, before, options['batch_size'])
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: удалено {count} '
+                f'за {time.perf_counter() - start:.2f} с.'
+            )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from schedules.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """Команда перестроения полнотекстового индекса расписаний."""
+
+    help = 'Перестроение полнотекстового индекса по тексту и заметкам.'
+
+    def handle(self, *args, **options):
+        """Перестроение индекса в одной транзакции."""
+        with transaction.atomic():
+            count = rebuild_index()
+        if count is None:
+            self.stdout.write(self.style.WARNING(
+                'Индекс FTS5 недоступен, поиск работает через LIKE.'
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано расписаний: {count}.'
+        ))
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from schedules.tasks import CHUNK_SIZE, claim_next_task, run_task
+
+
+class Command(BaseCommand):
+    """Команда запуска обработчика фоновых задач из базы данных."""
+
+    help = 'Запуск обработчика фоновых задач (каскадные изменения календаря).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить все задачи из очереди и завершить работу.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Пауза в секундах между проверками пустой очереди.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество объектов Schedule, обрабатываемых за один шаг.',
+        )
+
+    def handle(self, *args, **options):
+        """Цикл получения и выполнения задач из очереди."""
+        while True:
+            task = claim_next_task()
+            if task is None:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+                continue
+            self.stdout.write(f'Задача {task.pk}: {task}')
+            if run_task(task, options['chunk_size']):
+                self.stdout.write(self.style.SUCCESS(
+                    f'Задача {task.pk} выполнена.'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(
+                    f'Задача {task.pk} завершилась ошибкой.'
+                ))
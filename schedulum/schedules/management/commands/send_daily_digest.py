@@ -0,0 +1,82 @@
+import datetime as dt
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from schedules.digest import CHUNK_SIZE, create_digest_task, get_digest_task
+from schedules.models import TASK_DONE
+from schedules.tasks import claim_task, get_available, run_task
+
+
+class Command(BaseCommand):
+    """Команда рассылки пользователям расписания на завтра."""
+
+    help = ('Рассылка расписания на завтра всем пользователям, у которых '
+            'оно есть. Прерванная рассылка продолжается при повторном '
+            'запуске.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=dt.date.fromisoformat,
+            help='Дата расписания в формате ГГГГ-ММ-ДД, по умолчанию завтра.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество писем, отправляемых через одно соединение.',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать рассылку на дату заново.',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Получение задачи рассылки на дату и ее выполнение.
+        1. Незавершенная задача продолжается, только если ее удалось
+        захватить тем же условным UPDATE, что и в run_tasks: ожидающая,
+        брошенная или завершенная ошибкой;
+        2. Новая задача создается, если задач на дату нет или указан
+        --restart и рассылка на дату сейчас не выполняется; из двух
+        одновременных запусков задачу создает только один, второй
+        завершается ошибкой по уникальному ключу задачи.
+        """
+        date = options['date'] or settings.NEXT_DAY
+        task = get_digest_task(date)
+        if task is not None and task.status == TASK_DONE:
+            if not options['restart']:
+                self.stdout.write(self.style.WARNING(
+                    f'Рассылка на {date} уже выполнена, для повторной '
+                    'укажите --restart.'
+                ))
+                return
+            task = None
+        running = CommandError(f'Рассылка на {date} уже выполняется '
+                               'другим процессом.')
+        if task is None:
+            try:
+                task = create_digest_task(date)
+            except IntegrityError:
+                raise running
+        elif not claim_task(task, get_available(include_failed=True)):
+            raise running
+        elif options['restart']:
+            task.payload['last_author_id'] = 0
+            task.progress = task.total = 0
+            task.save(update_fields=('payload', 'progress', 'total'))
+        else:
+            task.refresh_from_db()
+        start = time.perf_counter()
+        if not run_task(task, options['chunk_size']):
+            raise CommandError(f'Рассылка на {date} завершилась ошибкой, '
+                               'повторный запуск продолжит ее.')
+        task.refresh_from_db()
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {task.progress} из {task.total} '
+            f'за {time.perf_counter() - start:.2f} с.'
+        ))
@@ -0,0 +1,252 @@
+from django.apps import apps
+from django.db import connection, models, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+
+def get_model(model_name):
+    """Получение модели приложения schedules по названию."""
+    return apps.get_model(app_label='schedules', model_name=model_name)
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    QuerySet моделей с мягким удалением.
+    1. Удаленный объект хранит время удаления в поле deleted_at;
+    2. Все объекты, удаленные одной операцией, получают одинаковое время,
+    поэтому восстановление возвращает только их, а не объекты,
+    удаленные раньше отдельно.
+    """
+
+    def alive(self):
+        """Неудаленные объекты."""
+        return self.filter(deleted_at__isnull=True)
+
+    def deleted(self):
+        """Удаленные объекты."""
+        return self.filter(deleted_at__isnull=False)
+
+    def soft_delete(self, deleted_at=None):
+        """Мягкое удаление объектов одним UPDATE, возвращает количество."""
+        return self.alive().update(deleted_at=deleted_at or timezone.now())
+
+    def restore(self):
+        """Восстановление объектов одним UPDATE, возвращает количество."""
+        return self.deleted().update(deleted_at=None)
+
+    def get_deletion_groups(self):
+        """Удаленные объекты, сгруппированные по времени удаления."""
+        groups = {}
+        for pk, deleted_at in self.deleted().values_list('pk', 'deleted_at'):
+            groups.setdefault(deleted_at, []).append(pk)
+        return groups
+
+
+class AliveManager(models.Manager):
+    """Менеджер по умолчанию: только неудаленные объекты."""
+
+    def get_queryset(self):
+        """Исключение удаленных объектов."""
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class ScheduleQuerySet(SoftDeleteQuerySet):
+    """
+    QuerySet модели Schedule. Мягкое удаление и восстановление выполняются
+    через UPDATE без сигналов, поэтому сами записывают изменения в журнал,
+    обновляют полнотекстовый индекс и отправляют события подписчикам.
+    """
+
+    def log_changes(self, rows, action):
+        """
+        Запись изменений в журнал одним запросом, возвращает записи с id.
+        Если база данных не возвращает id из bulk_create, записи читаются
+        заново: вызывается внутри транзакции после UPDATE, поэтому
+        записи после last_id созданы этим вызовом.
+        """
+        change_model = get_model('ScheduleChange')
+        changes = [change_model(author_id=author_id, date=date, action=action,
+                                schedule_id=schedule_id)
+                   for schedule_id, author_id, date in rows]
+        last_id = None
+        if not connection.features.can_return_rows_from_bulk_insert:
+            last_id = change_model.objects.order_by('-id').values_list(
+                'id', flat=True
+            ).first() or 0
+        change_model.objects.bulk_create(changes)
+        if last_id is not None:
+            changes = list(change_model.objects.filter(
+                id__gt=last_id, action=action
+            ).order_by('id'))
+        return changes
+
+    def publish_changes(self, changes, schedules=None):
+        """Отправка событий об изменениях после фиксации транзакции."""
+        from schedules.signals import publish_change
+
+        schedules = schedules or {}
+        for change in changes:
+            publish_change(change, schedules.get(change.schedule_id))
+
+    @transaction.atomic
+    def soft_delete(self, deleted_at=None):
+        """
+        Мягкое удаление с записью удалений в журнал изменений, удалением
+        из полнотекстового индекса и отправкой событий.
+        """
+        from schedules.lessons import invalidate_occupancy
+        from schedules.models import CHANGE_DELETED
+        from schedules.search import unindex_schedules
+
+        queryset = self.alive()
+        rows = list(queryset.values_list('id', 'author_id', 'date'))
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+        count = self.model.all_objects.filter(id__in=ids).update(
+            deleted_at=deleted_at or timezone.now()
+        )
+        changes = self.log_changes(((None, author_id, date)
+                                    for _, author_id, date in rows),
+                                   CHANGE_DELETED)
+        unindex_schedules(ids)
+        self.publish_changes(changes)
+        transaction.on_commit(invalidate_occupancy)
+        return count
+
+    @transaction.atomic
+    def restore(self):
+        """
+        Восстановление с записью в журнал изменений, добавлением
+        в полнотекстовый индекс и отправкой событий. Расписание не
+        восстанавливается, если у автора уже есть расписание на эту дату.
+        """
+        from schedules.lessons import invalidate_occupancy
+        from schedules.models import CHANGE_CREATED
+        from schedules.search import index_schedules
+
+        taken = self.model.objects.filter(author=OuterRef('author'),
+                                          date=OuterRef('date'))
+        rows = list(self.deleted().exclude(Exists(taken)).values_list(
+            'id', 'author_id', 'date'
+        ))
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+        count = self.model.all_objects.filter(id__in=ids).update(
+            deleted_at=None
+        )
+        changes = self.log_changes(rows, CHANGE_CREATED)
+        index_schedules(ids)
+        self.publish_changes(changes, self.model.objects.in_bulk(ids))
+        transaction.on_commit(invalidate_occupancy)
+        return count
+
+
+class IntervalQuerySet(SoftDeleteQuerySet):
+    """
+    QuerySet моделей Month и Week: уникальность интервала и заголовка
+    в родительском объекте (parent_field) проверяется только среди
+    неудаленных объектов.
+    """
+
+    parent_field = None
+
+    def restorable(self):
+        """
+        Удаленные объекты, которые можно восстановить: их интервал
+        и заголовок не заняты неудаленными объектами.
+        """
+        taken = self.model.objects.filter(
+            Q(start__lte=OuterRef('end'), end__gte=OuterRef('start'))
+            | Q(title=OuterRef('title'),
+                **{self.parent_field: OuterRef(self.parent_field)})
+        )
+        return self.deleted().exclude(Exists(taken))
+
+
+class WeekQuerySet(IntervalQuerySet):
+    """QuerySet модели Week с каскадным мягким удалением расписаний."""
+
+    parent_field = 'month'
+
+    def get_schedules(self, ids):
+        """Все объекты Schedule, привязанные к неделям."""
+        schedule_model = get_model('Schedule')
+        through = schedule_model.week.through
+        return schedule_model.all_objects.filter(
+            id__in=through.objects.filter(
+                week_id__in=ids
+            ).values('schedule_id')
+        )
+
+    @transaction.atomic
+    def soft_delete(self, deleted_at=None):
+        """Мягкое удаление недель и всех привязанных к ним расписаний."""
+        from schedules.routing import invalidate_week_routes
+
+        deleted_at = deleted_at or timezone.now()
+        ids = list(self.alive().values_list('id', flat=True))
+        if not ids:
+            return 0
+        count = self.model.all_objects.filter(id__in=ids).update(
+            deleted_at=deleted_at
+        )
+        self.get_schedules(ids).soft_delete(deleted_at)
+        transaction.on_commit(invalidate_week_routes)
+        return count
+
+    @transaction.atomic
+    def restore(self):
+        """
+        Восстановление недель и расписаний, удаленных вместе с ними.
+        Неделя не восстанавливается, если ее место заняла другая неделя.
+        """
+        from schedules.routing import invalidate_week_routes
+
+        count = 0
+        for deleted_at, ids in self.restorable().get_deletion_groups().items():
+            count += self.model.all_objects.filter(id__in=ids).update(
+                deleted_at=None
+            )
+            self.get_schedules(ids).filter(deleted_at=deleted_at).restore()
+        if count:
+            transaction.on_commit(invalidate_week_routes)
+        return count
+
+
+class MonthQuerySet(IntervalQuerySet):
+    """QuerySet модели Month с каскадным мягким удалением недель."""
+
+    parent_field = 'year'
+
+    @transaction.atomic
+    def soft_delete(self, deleted_at=None):
+        """Мягкое удаление месяцев, их недель и расписаний."""
+        deleted_at = deleted_at or timezone.now()
+        ids = list(self.alive().values_list('id', flat=True))
+        if not ids:
+            return 0
+        count = self.model.all_objects.filter(id__in=ids).update(
+            deleted_at=deleted_at
+        )
+        get_model('Week').all_objects.filter(month_id__in=ids).soft_delete(
+            deleted_at
+        )
+        return count
+
+    @transaction.atomic
+    def restore(self):
+        """
+        Восстановление месяцев и недель, удаленных вместе с ними.
+        Месяц не восстанавливается, если его место занял другой месяц.
+        """
+        count = 0
+        for deleted_at, ids in self.restorable().get_deletion_groups().items():
+            count += self.model.all_objects.filter(id__in=ids).update(
+                deleted_at=None
+            )
+            get_model('Week').all_objects.filter(
+                month_id__in=ids, deleted_at=deleted_at
+            ).restore()
+        return count
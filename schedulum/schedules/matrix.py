@@ -0,0 +1,93 @@
+import datetime as dt
+import json
+from itertools import islice
+
+from schedules.models import Schedule, User
+
+MATRIX_MAX_USERS = 1000
+MATRIX_DAYS = 6
+CHUNK_SIZE = 200
+MATRIX_FIELDS = ('author_id', 'date', 'text', 'notes')
+
+
+def get_matrix_users(usernames=None, query=None):
+    """
+    Получение пользователей матрицы: по списку логинов или по началу
+    логина, не больше MATRIX_MAX_USERS. Возвращается QuerySet,
+    упорядоченный по id, чтобы его можно было передать подзапросом.
+    """
+    users = User.objects.filter(is_active=True)
+    if usernames:
+        users = users.filter(username__in=usernames)
+    if query:
+        users = users.filter(username__istartswith=query)
+    return users.order_by('id')[:MATRIX_MAX_USERS]
+
+
+def get_week_dates(week):
+    """Учебные дни недели: с понедельника по субботу."""
+    return [week.start + dt.timedelta(days=number)
+            for number in range(MATRIX_DAYS)]
+
+
+def iter_matrix_rows(week, users, chunk_size=CHUNK_SIZE):
+    """
+    Получение строк матрицы пользователи x дни недели.
+    1. Пользователи и их расписания читаются двумя потоками, упорядоченными
+    по id автора, и объединяются слиянием, поэтому расписания всех
+    пользователей загружаются одним запросом и не хранятся в памяти целиком;
+    2. Строка - кортеж (логин, дни), день - кортеж (text, notes) или None.
+    """
+    user_rows = users.values_list('id', 'username').iterator(
+        chunk_size=chunk_size
+    )
+    schedules = Schedule.objects.filter(
+        week=week.id,
+        author__in=users.values('id'),
+    ).order_by('author_id', 'date').values_list(
+        *MATRIX_FIELDS
+    ).iterator(chunk_size=chunk_size)
+    schedule = next(schedules, None)
+    for user_id, username in user_rows:
+        days = [None] * MATRIX_DAYS
+        while schedule is not None and schedule[0] <= user_id:
+            author_id, date, text, notes = schedule
+            weekday = date.weekday()
+            if (author_id == user_id and weekday < MATRIX_DAYS
+                    and days[weekday] is None):
+                days[weekday] = (text, notes)
+            schedule = next(schedules, None)
+        yield username, days
+
+
+def iter_chunks(rows, chunk_size=CHUNK_SIZE):
+    """Разбиение потока строк на списки указанного размера."""
+    rows = iter(rows)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(rows, chunk_size))
+
+
+def iter_matrix_json(week, rows):
+    """
+    Потоковая сборка матрицы в JSON: заголовок с датами недели, затем
+    строки пользователей по мере чтения из базы данных.
+    """
+    dates = [date.isoformat() for date in get_week_dates(week)]
+    head = json.dumps({'week': week.id, 'title': week.title,
+                       'dates': dates}, ensure_ascii=False)
+    yield head[:-1] + ', "users": ['
+    separator = ''
+    for chunk in iter_chunks(rows):
+        yield separator + ', '.join(
+            json.dumps({
+                'username': username,
+                'days': [None if day is None
+                         else {'text': day[0], 'notes': day[1]}
+                         for day in days],
+            }, ensure_ascii=False)
+            for username, days in chunk
+        )
+        separator = ', '
+    yield ']}'
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('delete_schedules', 'Удаление расписаний'), ('relink_schedules', 'Пересчет недель расписаний')], max_length=50, verbose_name='Тип задачи')),
+                ('payload', models.JSONField(default=dict, verbose_name='Параметры')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Выполнена'), ('failed', 'Ошибка')], default='pending', max_length=10, verbose_name='Статус')),
+                ('progress', models.PositiveIntegerField(default=0, verbose_name='Обработано')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Всего')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создана')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлена')),
+            ],
+            options={
+                'verbose_name': 'фоновая задача',
+                'verbose_name_plural': 'Фоновые задачи',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'id'], name='task_status_id'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def create_initial_changes(apps, schema_editor):
+    """Запись изменений "Создано" для уже существующих расписаний."""
+    Schedule = apps.get_model('schedules', 'Schedule')
+    ScheduleChange = apps.get_model('schedules', 'ScheduleChange')
+    changes = (
+        ScheduleChange(author_id=author_id, schedule_id=schedule_id,
+                       date=date, action='created')
+        for schedule_id, author_id, date in Schedule.objects.order_by(
+            'id'
+        ).values_list('id', 'author_id', 'date').iterator()
+    )
+    ScheduleChange.objects.bulk_create(changes, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('schedules', '0002_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Создано'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.CreateModel(
+            name='ScheduleChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Дата')),
+                ('action', models.CharField(choices=[('created', 'Создано'), ('updated', 'Изменено'), ('deleted', 'Удалено')], max_length=10, verbose_name='Действие')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Время изменения')),
+                ('author', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='schedule_changes', to=settings.AUTH_USER_MODEL, verbose_name='Автор расписания')),
+                ('schedule', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='changes', to='schedules.schedule', verbose_name='Расписание')),
+            ],
+            options={
+                'verbose_name': 'изменение расписания',
+                'verbose_name_plural': 'Изменения расписания',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='schedulechange',
+            index=models.Index(fields=['author', 'id'], name='change_author_id'),
+        ),
+        migrations.RunPython(create_initial_changes, migrations.RunPython.noop),
+    ]
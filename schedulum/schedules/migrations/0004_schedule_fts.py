@@ -0,0 +1,62 @@
+# Generated by Django 3.2.16 on 2026-10-19 13:10
+
+import re
+
+from django.db import migrations, OperationalError
+
+FTS_TABLE = 'schedules_schedule_fts'
+TERM_PATTERN = re.compile(r'[^\W_]+')
+
+
+def get_index_text(author_id, text):
+    """Текст для индекса: слова с префиксом автора (a<id>x<слово>)."""
+    terms = TERM_PATTERN.findall((text or '').lower())
+    return ' '.join(f'a{author_id}x{term}' for term in terms)
+
+
+def create_fts_index(apps, schema_editor):
+    """
+    Создание полнотекстового индекса FTS5 по тексту и заметкам расписаний
+    и заполнение его существующими данными. Для других СУБД и SQLite без
+    FTS5 поиск работает через LIKE.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    Schedule = apps.get_model('schedules', 'Schedule')
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(text, notes)'
+            )
+        except OperationalError:
+            return
+        rows = Schedule.objects.order_by().values_list(
+            'id', 'author_id', 'text', 'notes'
+        ).iterator()
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, text, notes) '
+            'VALUES (%s, %s, %s)',
+            [(pk, get_index_text(author_id, text),
+              get_index_text(author_id, notes))
+             for pk, author_id, text, notes in rows]
+        )
+
+
+def drop_fts_index(apps, schema_editor):
+    """Удаление полнотекстового индекса."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0003_schedule_changes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:18
+
+import django.core.validators
+from django.db import migrations, models
+import schedules.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0004_schedule_fts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='year',
+            name='year',
+            field=models.SmallIntegerField(error_messages={'unique': 'Такой год уже существует.'}, help_text='Можно указать только текущий и следующий год. Обязательное поле.', unique=True, validators=[django.core.validators.MinValueValidator(schedules.validators.get_current_year), django.core.validators.MaxValueValidator(schedules.validators.get_next_year)], verbose_name='Год'),
+        ),
+    ]
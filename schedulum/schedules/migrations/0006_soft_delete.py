@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0005_year_validators'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='schedule',
+            name='unique_date_author',
+        ),
+        migrations.AddField(
+            model_name='month',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Удалено'),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Удалено'),
+        ),
+        migrations.AddField(
+            model_name='week',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Удалено'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='schedule_deleted_at'),
+        ),
+        migrations.AddConstraint(
+            model_name='schedule',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('author', 'date'), name='unique_date_author'),
+        ),
+    ]
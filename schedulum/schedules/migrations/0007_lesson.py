@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0006_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Lesson',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_time', models.TimeField(verbose_name='Начало пары')),
+                ('end_time', models.TimeField(verbose_name='Конец пары')),
+                ('subject', models.CharField(blank=True, max_length=255, verbose_name='Название пары')),
+                ('room', models.CharField(blank=True, db_index=True, max_length=20, verbose_name='Аудитория')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lessons', to='schedules.schedule', verbose_name='Расписание')),
+            ],
+            options={
+                'verbose_name': 'пара',
+                'verbose_name_plural': 'Пары',
+                'ordering': ('schedule', 'start_time'),
+            },
+        ),
+    ]
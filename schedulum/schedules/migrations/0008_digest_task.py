@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0007_lesson'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='kind',
+            field=models.CharField(choices=[('delete_schedules', 'Удаление расписаний'), ('relink_schedules', 'Пересчет недель расписаний'), ('send_digest', 'Рассылка расписания на завтра')], max_length=50, verbose_name='Тип задачи'),
+        ),
+    ]
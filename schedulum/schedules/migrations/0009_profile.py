@@ -0,0 +1,29 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import schedules.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('schedules', '0008_digest_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Profile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timezone', models.CharField(blank=True, help_text='Например, Asia/Yekaterinburg.', max_length=64, validators=[schedules.validators.correct_timezone], verbose_name='Часовой пояс')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'профиль',
+                'verbose_name_plural': 'Профили',
+            },
+        ),
+    ]
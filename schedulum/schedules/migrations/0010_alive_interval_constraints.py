@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0009_profile'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='month',
+            name='unique_title_year',
+        ),
+        migrations.RemoveConstraint(
+            model_name='month',
+            name='unique_start_end_month',
+        ),
+        migrations.RemoveConstraint(
+            model_name='week',
+            name='unique_title_month',
+        ),
+        migrations.RemoveConstraint(
+            model_name='week',
+            name='unique_start_end_week',
+        ),
+        migrations.AddConstraint(
+            model_name='month',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('title', 'year'), name='unique_title_year'),
+        ),
+        migrations.AddConstraint(
+            model_name='month',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('start', 'end'), name='unique_start_end_month'),
+        ),
+        migrations.AddConstraint(
+            model_name='week',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('title', 'month'), name='unique_title_month'),
+        ),
+        migrations.AddConstraint(
+            model_name='week',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('start', 'end'), name='unique_start_end_week'),
+        ),
+    ]
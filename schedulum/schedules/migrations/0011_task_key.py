@@ -0,0 +1,22 @@
+# Generated by Django 3.2.16 on 2026-10-19 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0010_alive_interval_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='key',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='Ключ'),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(models.Q(('key', ''), _negated=True), models.Q(('status', 'done'), _negated=True)), fields=('key',), name='unique_active_task_key'),
+        ),
+    ]
@@ -3,6 +3,8 @@ import datetime
 from django.apps import apps
 from django.core.exceptions import ValidationError
 
+from schedules.occurrences import get_occurrence_dates, match_weeks
+
 ERROR_HIGHER_OBJ_SAMPLE = 'Необходимо изначально создать "{field}".'
 
 
@@ -27,6 +29,8 @@ class TrueDiffInterval():
 class MonthMixin(GetModel, TrueDiffInterval):
     """Миксин для модели Month."""
 
+    parent_field = 'year'
+
     def get_average_date(self):
         """Получение даты в середине месяца."""
         return self.start + datetime.timedelta(days=15)
@@ -69,6 +73,29 @@ class ValidationMonthAndWeekIntervalMixin(GetModel):
         """Запуск всех валидирующих методов."""
         self.validate_incorrect_interval()
         self.validate_exist_interval()
+        self.validate_exist_unique()
+        return None
+
+    def validate_exist_unique(self):
+        """
+        Проверка уникальности интервала и заголовка в родительском объекте
+        среди неудаленных объектов. Ограничения уникальности условные,
+        поэтому validate_unique их не проверяет.
+        """
+        model = self.get_model()
+        objects = model.objects.exclude(pk=self.pk)
+        if objects.filter(start=self.start, end=self.end).exists():
+            raise ValidationError(
+                f'{model._meta.verbose_name.capitalize()} с таким '
+                'интервалом уже существует.'
+            )
+        parent = self.get_related_obj()
+        if objects.filter(title=self.get_title(),
+                          **{self.parent_field: parent}).exists():
+            raise ValidationError(
+                f'{model._meta.verbose_name.capitalize()} с таким '
+                'заголовком уже существует.'
+            )
         return None
 
     def validate_exist_interval(self):
@@ -106,27 +133,28 @@ class ScheduleMixin(GetModel):
         model = self.get_model()
         return model._meta.get_field('week').related_model
 
-    def get_related_obj(self, date):
-        """Получение объекта related модели по полям start и end."""
+    def get_occurrence_dates(self):
+        """Получение даты расписания и всех дат его повторений."""
+        return get_occurrence_dates(self.date, self.repetition_rate,
+                                    self.repetition_count)
+
+    def get_related_objects(self, dates):
+        """
+        Получение объектов related модели для списка дат одним запросом.
+        Для дат вне существующих недель возвращается None.
+        """
         model = self.get_related_model()
-        return model.objects.filter(start__lte=date, end__gte=date).first()
+        weeks = model.objects.filter(
+            start__lte=max(dates), end__gte=min(dates)
+        ).order_by('start')
+        return match_weeks(dates, list(weeks))
 
     def get_related_week_objects(self):
         """
         Получение списка всех объектов Week, указанных при помощи даты
         и повторений.
         """
-        week_objects = []
-        if self.repetition_rate and self.repetition_count:
-            for repeat in range(1, self.repetition_count + 1):
-                new_date = self.date + datetime.timedelta(
-                    days=((7 * self.repetition_rate) * repeat)
-                )
-                week_obj = self.get_related_obj(new_date)
-                week_objects.append(week_obj)
-        basic_week_obj = self.get_related_obj(self.date)
-        week_objects.append(basic_week_obj)
-        return week_objects
+        return self.get_related_objects(self.get_occurrence_dates())
 
     def validate_empty_repetition(self):
         """Проверка на заполнение полей rate и count."""
@@ -136,27 +164,40 @@ class ScheduleMixin(GetModel):
                                   'указаны количество и частота.')
         return None
 
-    def validate_exist_schedule(self):
+    def validate_exist_date(self):
+        """Проверка отсутствия другого расписания автора на эту дату."""
+        model = self.get_model()
+        exists = model.objects.filter(
+            author=self.author, date=self.date
+        ).exclude(pk=self.pk).exists()
+        if exists:
+            raise ValidationError(
+                'У вас уже существует расписание на эту дату.'
+            )
+        return None
+
+    def validate_exist_schedule(self, week_objects=None):
         """Проверка попадания расписания в даты другого объекта расписания."""
         model = self.get_model()
-        current_schedule = model.objects.filter(date=self.date,
-                                                author=self.author).first()
-        for week_obj in self.get_related_week_objects():
-            schedule_objs = model.objects.filter(author=self.author,
-                                                 week=week_obj)
-            for schedule in schedule_objs:
-                if (schedule.date.weekday() == self.date.weekday()
-                        and schedule != current_schedule):
-                    raise ValidationError(
-                        'Ваше расписание попадает на день другого расписания. '
-                        'Или повтор совпадает с другим расписанием.'
-                    )
+        if week_objects is None:
+            week_objects = self.get_related_week_objects()
+        conflict = model.objects.filter(
+            author=self.author,
+            week__in=[week for week in week_objects if week is not None],
+            date__week_day=self.date.weekday() + 2,
+        ).exclude(date=self.date).exists()
+        if conflict:
+            raise ValidationError(
+                'Ваше расписание попадает на день другого расписания. '
+                'Или повтор совпадает с другим расписанием.'
+            )
         return None
 
-    def validate_exist_weeks(self):
+    def validate_exist_weeks(self, week_objects=None):
         """Проверка наличия необходимого объекта related модели."""
-        week_objs = self.get_related_week_objects()
-        if None in week_objs:
+        if week_objects is None:
+            week_objects = self.get_related_week_objects()
+        if None in week_objects:
             raise ValidationError('Вы пытаетесь добавить или повторить '
                                   'расписание на несуществующую неделю.')
         return None
@@ -171,6 +212,12 @@ class ScheduleMixin(GetModel):
 class WeekMixin(GetModel, TrueDiffInterval):
     """Миксин для модели Week."""
 
+    parent_field = 'month'
+
+    def get_title(self):
+        """Получение заголовка недели."""
+        return self.title
+
     def get_related_model(self):
         """Получение related модели из поля foreignkey."""
         model = self.get_model()
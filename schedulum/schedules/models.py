@@ -1,18 +1,45 @@
-import locale
-
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from schedules.managers import (AliveManager, MonthQuerySet,
+                                ScheduleQuerySet, WeekQuerySet)
 from schedules.mixins import (
     MonthMixin, ValidationMonthAndWeekIntervalMixin,
     ScheduleMixin, WeekMixin
 )
-from schedules.validators import correct_end, correct_start
+from schedules.validators import (correct_end, correct_start,
+                                  correct_timezone, get_current_year,
+                                  get_next_year)
 
-locale.setlocale(category=locale.LC_ALL, locale="Russian")
 User = get_user_model()
+TASK_PENDING = 'pending'
+TASK_RUNNING = 'running'
+TASK_DONE = 'done'
+TASK_FAILED = 'failed'
+TASK_STATUS_CHOICES = (
+    (TASK_PENDING, 'В очереди'),
+    (TASK_RUNNING, 'Выполняется'),
+    (TASK_DONE, 'Выполнена'),
+    (TASK_FAILED, 'Ошибка'),
+)
+TASK_KIND_CHOICES = (
+    ('delete_schedules', 'Удаление расписаний'),
+    ('relink_schedules', 'Пересчет недель расписаний'),
+    ('send_digest', 'Рассылка расписания на завтра'),
+)
+CHANGE_CREATED = 'created'
+CHANGE_UPDATED = 'updated'
+CHANGE_DELETED = 'deleted'
+CHANGE_ACTION_CHOICES = (
+    (CHANGE_CREATED, 'Создано'),
+    (CHANGE_UPDATED, 'Изменено'),
+    (CHANGE_DELETED, 'Удалено'),
+)
+MONTH_TITLES = (
+    'Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь',
+    'Июль', 'Август', 'Сентябрь', 'Октябрь', 'Ноябрь', 'Декабрь',
+)
 RATE_CHOICES = (
     (1, 'Каждую неделю'),
     (2, 'Раз в 2 недели'),
@@ -47,8 +74,8 @@ class Year(models.Model):
         verbose_name='Заголовок',
     )
     year = models.SmallIntegerField(
-        validators=[MinValueValidator(settings.CURRENT_YEAR),
-                    MaxValueValidator(settings.NEXT_YEAR)],
+        validators=[MinValueValidator(get_current_year),
+                    MaxValueValidator(get_next_year)],
         unique=True,
         error_messages={'unique': 'Такой год уже существует.'},
         verbose_name='Год',
@@ -77,8 +104,8 @@ class Month(MonthMixin, ValidationMonthAndWeekIntervalMixin, models.Model):
     Модель месяца для администратора.
     1. Заголовок и год заполняются автоматически из значений
     начала и конца месяца;
-    2. Установлены два Unique Constraint: заголовок и год,
-    начало и конец месяца.
+    2. Установлены два Unique Constraint для неудаленных месяцев:
+    заголовок и год, начало и конец месяца.
     """
 
     title = models.CharField(
@@ -105,6 +132,15 @@ class Month(MonthMixin, ValidationMonthAndWeekIntervalMixin, models.Model):
         verbose_name='Конец учебного месяца',
         help_text='Выберите конец учебного месяца (воскресенье).'
     )
+    deleted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Удалено',
+    )
+
+    objects = AliveManager.from_queryset(MonthQuerySet)()
+    all_objects = MonthQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'месяц'
@@ -113,10 +149,12 @@ class Month(MonthMixin, ValidationMonthAndWeekIntervalMixin, models.Model):
         constraints = (
             models.UniqueConstraint(
                 fields=('title', 'year',),
+                condition=models.Q(deleted_at__isnull=True),
                 name='unique_title_year',
             ),
             models.UniqueConstraint(
                 fields=('start', 'end',),
+                condition=models.Q(deleted_at__isnull=True),
                 name='unique_start_end_month',
             ),
         )
@@ -137,10 +175,14 @@ class Month(MonthMixin, ValidationMonthAndWeekIntervalMixin, models.Model):
         """Отключение метода для избежания дублирования ошибок."""
         return None
 
+    def get_title(self):
+        """Получение заголовка месяца по дате в его середине."""
+        return MONTH_TITLES[self.get_average_date().month - 1]
+
     def save(self, *args, **kwargs):
         """Привязка объекта к году, сохранение заголовка и объекта."""
         self.year = self.get_related_obj()
-        self.title = self.get_average_date().strftime('%B')
+        self.title = self.get_title()
         return super().save(*args, **kwargs)
 
 
@@ -151,8 +193,8 @@ class Week(ValidationMonthAndWeekIntervalMixin, WeekMixin, models.Model):
     необходимости администратор может редактировать их;
     2. Месяц заполняется автоматически из значений
     начала и конца недели;
-    3. Установлены два Unique Constraint: заголовок и месяц,
-    начало и конец недели.
+    3. Установлены два Unique Constraint для неудаленных недель:
+    заголовок и месяц, начало и конец недели.
     """
 
     title = models.CharField(
@@ -178,6 +220,15 @@ class Week(ValidationMonthAndWeekIntervalMixin, WeekMixin, models.Model):
         verbose_name='Конец учебной недели',
         help_text='Выберите конец учебной недели (воскресенье).'
     )
+    deleted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Удалено',
+    )
+
+    objects = AliveManager.from_queryset(WeekQuerySet)()
+    all_objects = WeekQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'неделя'
@@ -186,10 +237,12 @@ class Week(ValidationMonthAndWeekIntervalMixin, WeekMixin, models.Model):
         constraints = (
             models.UniqueConstraint(
                 fields=('title', 'month',),
+                condition=models.Q(deleted_at__isnull=True),
                 name='unique_title_month',
             ),
             models.UniqueConstraint(
                 fields=('start', 'end',),
+                condition=models.Q(deleted_at__isnull=True),
                 name='unique_start_end_week',
             ),
         )
@@ -267,6 +320,23 @@ class Schedule(ScheduleMixin, models.Model):
         editable=False,
         verbose_name='Недели',
     )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создано',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено',
+    )
+    deleted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Удалено',
+    )
+
+    objects = AliveManager.from_queryset(ScheduleQuerySet)()
+    all_objects = ScheduleQuerySet.as_manager()
 
     class Meta:
         default_related_name = 'schedules'
@@ -275,14 +345,23 @@ class Schedule(ScheduleMixin, models.Model):
         ordering = ('date', 'author',)
         constraints = (
             models.UniqueConstraint(
-                fields=('date', 'author',),
+                fields=('author', 'date',),
+                condition=models.Q(deleted_at__isnull=True),
                 name='unique_date_author',
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('deleted_at',),
+                condition=models.Q(deleted_at__isnull=False),
+                name='schedule_deleted_at',
+            ),
+        )
 
     def __str__(self):
         """Название объекта составляется из даты и автора."""
-        str_date = self.date.strftime('%d %B %Y')
+        month_title = MONTH_TITLES[self.date.month - 1]
+        str_date = f'{self.date:%d} {month_title} {self.date.year}'
         return f'{str_date} {self.author.username}'
 
     def clean(self):
@@ -290,11 +369,209 @@ class Schedule(ScheduleMixin, models.Model):
         super().clean_fields()
         self.validate_sunday()
         self.validate_empty_repetition()
-        self.validate_exist_weeks()
-        self.validate_exist_schedule()
+        self.validate_exist_date()
+        week_objects = self.get_related_week_objects()
+        self.validate_exist_weeks(week_objects)
+        self.validate_exist_schedule(week_objects)
         return super().clean()
 
-    def save(self, *args, **kwargs):
-        """Сохранение объекта и последующая привязка к указанным неделям."""
+    def save(self, *args, link_weeks=True, **kwargs):
+        """
+        Сохранение объекта и последующая привязка к указанным неделям.
+        При link_weeks=False привязку выполняет вызывающий код, например
+        массово для нескольких объектов.
+        """
         super().save(*args, **kwargs)
-        self.week.set(self.get_related_week_objects())
+        if link_weeks:
+            self.week.set(self.get_related_week_objects())
+
+
+class Lesson(models.Model):
+    """
+    Модель пары, разобранной из текста расписания.
+    1. Объекты создаются автоматически при сохранении Schedule
+    и командой backfill_lessons, вручную не редактируются;
+    2. Используется для поиска свободных аудиторий.
+    """
+
+    schedule = models.ForeignKey(
+        Schedule,
+        on_delete=models.CASCADE,
+        related_name='lessons',
+        verbose_name='Расписание',
+    )
+    start_time = models.TimeField(
+        verbose_name='Начало пары',
+    )
+    end_time = models.TimeField(
+        verbose_name='Конец пары',
+    )
+    subject = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Название пары',
+    )
+    room = models.CharField(
+        max_length=20,
+        blank=True,
+        db_index=True,
+        verbose_name='Аудитория',
+    )
+
+    class Meta:
+        verbose_name = 'пара'
+        verbose_name_plural = 'Пары'
+        ordering = ('schedule', 'start_time',)
+
+    def __str__(self):
+        """Название объекта составляется из времени и аудитории пары."""
+        return f'{self.start_time:%H:%M}-{self.end_time:%H:%M} {self.room}'
+
+
+class ScheduleChange(models.Model):
+    """
+    Модель журнала изменений Schedule для синхронизации клиентов.
+    1. Записи создаются сигналами при сохранении и удалении Schedule;
+    2. Удаление сохраняется как запись без расписания (tombstone);
+    3. Возрастающий id записи используется как курсор синхронизации.
+    """
+
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='schedule_changes',
+        verbose_name='Автор расписания',
+    )
+    schedule = models.ForeignKey(
+        Schedule,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='changes',
+        verbose_name='Расписание',
+    )
+    date = models.DateField(
+        verbose_name='Дата',
+    )
+    action = models.CharField(
+        max_length=10,
+        choices=CHANGE_ACTION_CHOICES,
+        verbose_name='Действие',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Время изменения',
+    )
+
+    class Meta:
+        verbose_name = 'изменение расписания'
+        verbose_name_plural = 'Изменения расписания'
+        ordering = ('id',)
+        indexes = (
+            models.Index(fields=('author', 'id'), name='change_author_id'),
+        )
+
+    def __str__(self):
+        """Название объекта составляется из действия и даты."""
+        return f'{self.get_action_display()} {self.date}'
+
+
+class Task(models.Model):
+    """
+    Модель фоновой задачи для обработчика run_tasks.
+    1. Задачи создаются сигналами при изменении календаря;
+    2. Прогресс выполнения отображается в админ-зоне;
+    3. Незавершенная задача с непустым ключом может быть только одна,
+    поэтому одновременные запуски не создают одну задачу дважды.
+    """
+
+    kind = models.CharField(
+        max_length=50,
+        choices=TASK_KIND_CHOICES,
+        verbose_name='Тип задачи',
+    )
+    key = models.CharField(
+        max_length=100,
+        blank=True,
+        editable=False,
+        verbose_name='Ключ',
+    )
+    payload = models.JSONField(
+        default=dict,
+        verbose_name='Параметры',
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=TASK_STATUS_CHOICES,
+        default=TASK_PENDING,
+        verbose_name='Статус',
+    )
+    progress = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Обработано',
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Всего',
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Ошибка',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создана',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Обновлена',
+    )
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('-created_at',)
+        indexes = (
+            models.Index(fields=('status', 'id'), name='task_status_id'),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('key',),
+                condition=~models.Q(key='') & ~models.Q(status=TASK_DONE),
+                name='unique_active_task_key',
+            ),
+        )
+
+    def __str__(self):
+        """Название объекта составляется из типа и статуса задачи."""
+        return f'{self.get_kind_display()} ({self.get_status_display()})'
+
+
+class Profile(models.Model):
+    """
+    Модель настроек пользователя.
+    Часовой пояс определяет, какой день считается для пользователя
+    сегодняшним, пустое значение - часовой пояс сервера (TIME_ZONE).
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='profile',
+        verbose_name='Пользователь',
+    )
+    timezone = models.CharField(
+        max_length=64,
+        blank=True,
+        validators=(correct_timezone,),
+        verbose_name='Часовой пояс',
+        help_text='Например, Asia/Yekaterinburg.',
+    )
+
+    class Meta:
+        verbose_name = 'профиль'
+        verbose_name_plural = 'Профили'
+
+    def __str__(self):
+        """Название объекта составляется из логина пользователя."""
+        return f'Профиль {self.user}'
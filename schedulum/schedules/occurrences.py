@@ -0,0 +1,113 @@
+import datetime as dt
+from bisect import bisect_right
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DAYS_IN_WEEK = 7
+
+
+def expand_ordinals(ordinals, rates, counts):
+    """
+    Получение дат всех повторений для множества расписаний сразу.
+    1. Принимает последовательности порядковых номеров дат
+    (date.toordinal()), частот и количеств повторений одной длины,
+    пустые частота или количество (None, 0) означают отсутствие повторений;
+    2. Возвращает пару последовательностей одной длины: номер расписания
+    во входных данных и порядковый номер даты. Для каждого расписания
+    первой идет его собственная дата, затем даты повторений
+    date + 7 * rate * repeat для repeat от 1 до count;
+    3. При наличии NumPy вычисление выполняется над массивами без цикла
+    по расписаниям и возвращаются массивы NumPy, иначе - списки.
+    """
+    if numpy is None:
+        return _expand_python(ordinals, rates, counts)
+    return _expand_numpy(ordinals, rates, counts)
+
+
+def _expand_python(ordinals, rates, counts):
+    """Развертывание повторений без NumPy."""
+    indexes = []
+    dates = []
+    for index, (ordinal, rate, count) in enumerate(
+        zip(ordinals, rates, counts)
+    ):
+        if not (rate and count):
+            indexes.append(index)
+            dates.append(ordinal)
+            continue
+        step = DAYS_IN_WEEK * rate
+        indexes.extend([index] * (count + 1))
+        dates.extend(range(ordinal, ordinal + step * count + 1, step))
+    return indexes, dates
+
+
+def _expand_numpy(ordinals, rates, counts):
+    """Развертывание повторений над массивами NumPy."""
+    ordinals = numpy.asarray(ordinals, dtype=numpy.int64)
+    rates = numpy.asarray([rate or 0 for rate in rates], dtype=numpy.int64)
+    counts = numpy.asarray([count or 0 for count in counts],
+                           dtype=numpy.int64)
+    counts = numpy.where(rates > 0, counts, 0)
+    sizes = counts + 1
+    indexes = numpy.repeat(numpy.arange(len(ordinals)), sizes)
+    starts = numpy.repeat(numpy.cumsum(sizes) - sizes, sizes)
+    repeats = numpy.arange(len(indexes)) - starts
+    dates = ordinals[indexes] + DAYS_IN_WEEK * rates[indexes] * repeats
+    return indexes, dates
+
+
+def get_occurrence_dates(date, rate=None, count=None):
+    """Получение даты расписания и всех дат его повторений."""
+    _, ordinals = _expand_python((date.toordinal(),), (rate,), (count,))
+    return [dt.date.fromordinal(ordinal) for ordinal in ordinals]
+
+
+def group_ordinals(ordinals, rates, counts):
+    """
+    Получение порядковых номеров дат повторений, сгруппированных
+    по расписаниям: список списков в порядке входных данных.
+    """
+    indexes, dates = expand_ordinals(ordinals, rates, counts)
+    if numpy is not None:
+        indexes, dates = indexes.tolist(), dates.tolist()
+    groups = [[] for _ in range(len(ordinals))]
+    for index, ordinal in zip(indexes, dates):
+        groups[index].append(ordinal)
+    return groups
+
+
+def get_schedules_dates(rows):
+    """
+    Получение дат повторений для множества расписаний.
+    Принимает кортежи (date, rate, count), возвращает список списков дат
+    в порядке входных данных.
+    """
+    rows = list(rows)
+    groups = group_ordinals(
+        [date.toordinal() for date, _, _ in rows],
+        [rate for _, rate, _ in rows],
+        [count for _, _, count in rows],
+    )
+    fromordinal = dt.date.fromordinal
+    return [[fromordinal(ordinal) for ordinal in group] for group in groups]
+
+
+def match_weeks(dates, weeks):
+    """
+    Сопоставление дат с неделями.
+    1. weeks - объекты с полями start и end, упорядоченные по start;
+    2. Для каждой даты возвращается неделя, в которую она попадает,
+    или None, если такой недели нет.
+    """
+    starts = [week.start for week in weeks]
+    matched = []
+    for date in dates:
+        position = bisect_right(starts, date) - 1
+        if position >= 0 and weeks[position].end >= date:
+            matched.append(weeks[position])
+        else:
+            matched.append(None)
+    return matched
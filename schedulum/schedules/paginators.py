@@ -0,0 +1,68 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+EXACT_COUNT_LIMIT = 10000
+
+
+def estimate_count(model, using):
+    """
+    Оценка количества строк таблицы без полного COUNT(*).
+    1. PostgreSQL - статистика планировщика из pg_class;
+    2. SQLite - максимальное значение первичного ключа по индексу;
+    3. Остальные СУБД - оценка недоступна.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s', [table]
+            )
+        elif connection.vendor == 'sqlite':
+            pk_column = connection.ops.quote_name(model._meta.pk.column)
+            cursor.execute(
+                f'SELECT MAX({pk_column}) FROM '
+                f'{connection.ops.quote_name(table)}'
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    return int(row[0])
+
+
+def is_unfiltered(queryset):
+    """
+    Проверка отсутствия фильтров в запросе. Исключение мягко удаленных
+    объектов (deleted_at IS NULL) не считается фильтром: их доля мала.
+    """
+    where = queryset.query.where
+    if not where.children:
+        return True
+    if len(where.children) != 1 or where.negated:
+        return False
+    lookup = where.children[0]
+    target = getattr(getattr(lookup, 'lhs', None), 'target', None)
+    return (getattr(lookup, 'lookup_name', None) == 'isnull'
+            and lookup.rhs is True
+            and getattr(target, 'name', None) == 'deleted_at')
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор для больших таблиц.
+    Для запросов без фильтров количество объектов берется из оценки СУБД,
+    если оценка превышает EXACT_COUNT_LIMIT, иначе считается точно.
+    """
+
+    @cached_property
+    def count(self):
+        """Оценка или точное количество объектов."""
+        queryset = self.object_list
+        if is_unfiltered(queryset):
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
@@ -0,0 +1,100 @@
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from schedules.models import Week
+
+VERSION_KEY = 'schedules:week_routes:version'
+WeekRoute = namedtuple(
+    'WeekRoute',
+    ('id', 'year', 'month_title', 'title', 'start', 'end')
+)
+
+
+class WeekRoutes():
+    """
+    Таблица маршрутов недель, построенная одним запросом.
+    1. by_id - по id недели;
+    2. by_title - по году, заголовку месяца и заголовку недели;
+    3. by_iso - по ISO году и ISO номеру недели.
+    """
+
+    def __init__(self, weeks):
+        self.by_id = {}
+        self.by_title = {}
+        self.by_iso = {}
+        for week in weeks:
+            month = week.month
+            route = WeekRoute(
+                id=week.id,
+                year=month.year.year,
+                month_title=month.title,
+                title=week.title,
+                start=week.start,
+                end=week.end,
+            )
+            self.by_id[route.id] = route
+            self.by_title[(route.year, route.month_title, route.title)] = route
+            self.by_iso[week.start.isocalendar()[:2]] = route
+
+
+_lock = threading.Lock()
+_state = {'version': None, 'routes': None, 'built_at': 0.0}
+
+
+def build_week_routes():
+    """Построение таблицы маршрутов по всем неделям."""
+    weeks = Week.objects.select_related('month__year').order_by('start')
+    return WeekRoutes(weeks)
+
+
+def is_expired(built_at):
+    """
+    Проверка возраста таблицы процесса. С кешем в памяти процесса
+    другие процессы не видят новую версию, поэтому таблица все равно
+    перестраивается не реже раза в PROCESS_CACHE_MAX_AGE секунд.
+    """
+    return time.monotonic() - built_at > settings.PROCESS_CACHE_MAX_AGE
+
+
+def get_week_routes():
+    """
+    Получение таблицы маршрутов из кеша процесса.
+    Таблица перестраивается, если версия в кеше Django изменилась
+    или таблица старше PROCESS_CACHE_MAX_AGE секунд.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    routes = _state['routes']
+    if (routes is not None and _state['version'] == version
+            and not is_expired(_state['built_at'])):
+        return routes
+    with _lock:
+        if (_state['routes'] is None or _state['version'] != version
+                or is_expired(_state['built_at'])):
+            _state['routes'] = build_week_routes()
+            _state['version'] = version
+            _state['built_at'] = time.monotonic()
+        return _state['routes']
+
+
+def invalidate_week_routes():
+    """Сброс таблицы маршрутов при изменении календаря."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+    _state['routes'] = None
+
+
+def get_route_or_404(index, key):
+    """Получение маршрута недели из указанного индекса или ошибка 404."""
+    route = getattr(get_week_routes(), index).get(key)
+    if route is None:
+        raise Http404('Неделя не найдена.')
+    return route
@@ -0,0 +1,176 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import connection
+from django.db.models import Q
+
+from schedules.models import Schedule
+
+FTS_TABLE = 'schedules_schedule_fts'
+SEARCH_LIMIT = 50
+BATCH_SIZE = 2000
+# Не больше числа параметров запроса SQLite.
+UNINDEX_BATCH_SIZE = 500
+TERM_PATTERN = re.compile(r'[^\W_]+')
+
+_available = {}
+
+
+def fts_available():
+    """
+    Проверка наличия полнотекстового индекса FTS5.
+    Индекс создается миграцией только для SQLite с поддержкой FTS5.
+    """
+    name = connection.settings_dict['NAME']
+    if name not in _available:
+        _available[name] = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _available[name]
+
+
+def get_terms(text):
+    """Получение слов текста в нижнем регистре."""
+    return TERM_PATTERN.findall((text or '').lower())
+
+
+def get_index_text(author_id, text):
+    """
+    Текст для индекса: каждое слово хранится с префиксом автора
+    (a<id>x<слово>), поэтому поиск читает только записи одного автора,
+    а не записи всех пользователей с тем же словом.
+    """
+    return ' '.join(f'a{author_id}x{term}' for term in get_terms(text))
+
+
+def build_match_query(author_id, terms):
+    """
+    Построение выражения MATCH: расписания автора, в тексте или заметках
+    которых есть слово, начинающееся с одного из слов запроса.
+    """
+    return ' OR '.join(f'"a{author_id}x{term}"*' for term in terms)
+
+
+def get_index_row(schedule_id, author_id, text, notes):
+    """Строка индекса для расписания."""
+    return (schedule_id, get_index_text(author_id, text),
+            get_index_text(author_id, notes))
+
+
+def index_schedule(schedule):
+    """Добавление или обновление расписания в полнотекстовом индексе."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, text, notes) '
+            'VALUES (%s, %s, %s)',
+            get_index_row(schedule.pk, schedule.author_id, schedule.text,
+                          schedule.notes)
+        )
+
+
+def unindex_schedule(schedule_id):
+    """Удаление расписания из полнотекстового индекса."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                       [schedule_id])
+
+
+def index_schedules(ids):
+    """
+    Добавление или обновление расписаний в полнотекстовом индексе
+    по списку id, например после восстановления через UPDATE.
+    """
+    if not fts_available():
+        return
+    for index in range(0, len(ids), BATCH_SIZE):
+        rows = Schedule.objects.filter(
+            id__in=ids[index:index + BATCH_SIZE]
+        ).values_list('id', 'author_id', 'text', 'notes')
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, text, notes) '
+                'VALUES (%s, %s, %s)', [get_index_row(*row) for row in rows]
+            )
+
+
+def unindex_schedules(ids):
+    """
+    Удаление расписаний из полнотекстового индекса по списку id,
+    например после мягкого удаления через UPDATE.
+    """
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        for index in range(0, len(ids), UNINDEX_BATCH_SIZE):
+            chunk = ids[index:index + UNINDEX_BATCH_SIZE]
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN '
+                f'({", ".join(["%s"] * len(chunk))})', chunk
+            )
+
+
+def rebuild_index():
+    """
+    Полное перестроение полнотекстового индекса, например после загрузки
+    расписаний через bulk_create или SQL, минуя сигналы.
+    """
+    if not fts_available():
+        return None
+    rows = Schedule.objects.order_by().values_list(
+        'id', 'author_id', 'text', 'notes'
+    ).iterator(chunk_size=BATCH_SIZE)
+    count = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        batch = []
+        for row in rows:
+            batch.append(get_index_row(*row))
+            if len(batch) == BATCH_SIZE:
+                count += insert_rows(cursor, batch)
+                batch = []
+        count += insert_rows(cursor, batch)
+    return count
+
+
+def insert_rows(cursor, rows):
+    """Вставка строк в полнотекстовый индекс."""
+    if rows:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, text, notes) '
+            'VALUES (%s, %s, %s)', rows
+        )
+    return len(rows)
+
+
+def search_schedules(author_id, query, limit=SEARCH_LIMIT):
+    """
+    Поиск расписаний автора по тексту и заметкам.
+    1. При наличии FTS5 результаты упорядочены по релевантности (bm25);
+    2. Иначе используется поиск по вхождению подстроки (LIKE).
+    """
+    terms = get_terms(query)
+    if not terms:
+        return []
+    if not fts_available():
+        condition = reduce(or_, (
+            Q(text__icontains=term) | Q(notes__icontains=term)
+            for term in terms
+        ))
+        return list(Schedule.objects.filter(
+            condition, author_id=author_id
+        )[:limit])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            'ORDER BY rank LIMIT %s',
+            [build_match_query(author_id, terms), limit]
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    schedules = Schedule.objects.in_bulk(ids)
+    return [schedules[pk] for pk in ids if pk in schedules]
@@ -1,8 +1,20 @@
 import datetime as dt
 
-from django.db.models.signals import post_save, pre_delete
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
-from schedules.models import Month, Week, Schedule
+from schedules.events import broker
+from schedules.lessons import invalidate_occupancy, sync_lessons
+from schedules.models import (CHANGE_CREATED, CHANGE_DELETED,
+                              CHANGE_UPDATED, Month, Profile, Schedule,
+                              ScheduleChange, Week, Year)
+from schedules.routing import invalidate_week_routes
+from schedules.search import index_schedule, unindex_schedule
+from schedules.tasks import (enqueue_schedules_deletion,
+                             enqueue_schedules_relink)
+from schedules.timezones import invalidate_user_timezone
+
+EVENT_FIELDS = ('text', 'notes', 'repetition_rate', 'repetition_count')
 
 
 @receiver(post_save, sender=Month, dispatch_uid='unique_signal')
@@ -25,7 +37,126 @@ def create_weeks(sender, instance, created, **kwargs):
         Week.objects.bulk_create(all_weeks)
 
 
+@receiver(post_save, sender=Month, dispatch_uid='month_relink_schedules')
+def relink_month_schedules(sender, instance, created, **kwargs):
+    """
+    Сигнал для пересчета недель объектов Schedule после создания недель
+    нового Month. Пересчет выполняется обработчиком фоновых задач.
+    """
+    if created:
+        enqueue_schedules_relink(instance.start, instance.end)
+
+
+@receiver(post_save, sender=Week, dispatch_uid='week_relink_schedules')
+def relink_week_schedules(sender, instance, **kwargs):
+    """
+    Сигнал для пересчета недель объектов Schedule после изменения Week.
+    Пересчет выполняется обработчиком фоновых задач.
+    """
+    enqueue_schedules_relink(instance.start, instance.end, [instance.id])
+
+
 @receiver(pre_delete, sender=Week, dispatch_uid='unique_signal')
 def delete_related_schedules(sender, instance, **kwargs):
-    """Сигнал для удаления всех объектов Schedule, связанных с Week."""
-    Schedule.objects.filter(week=instance).delete()
+    """
+    Сигнал для удаления всех объектов Schedule, связанных с Week.
+    Удаление выполняется частями обработчиком фоновых задач.
+    Окончательное удаление мягко удаленной недели (purge_deleted) не
+    затрагивает расписания: удаленные вместе с ней уже удалены командой,
+    а оставшиеся связанные расписания восстановлены отдельно.
+    """
+    if instance.deleted_at is not None:
+        return
+    enqueue_schedules_deletion(instance)
+
+
+@receiver(post_save, sender=Year, dispatch_uid='year_routes_save')
+@receiver(post_delete, sender=Year, dispatch_uid='year_routes_delete')
+@receiver(post_save, sender=Month, dispatch_uid='month_routes_save')
+@receiver(post_delete, sender=Month, dispatch_uid='month_routes_delete')
+@receiver(post_save, sender=Week, dispatch_uid='week_routes_save')
+@receiver(post_delete, sender=Week, dispatch_uid='week_routes_delete')
+def reset_week_routes(sender, **kwargs):
+    """Сигнал для сброса таблицы маршрутов недель при изменении календаря."""
+    transaction.on_commit(invalidate_week_routes)
+
+
+def publish_change(change, schedule):
+    """Отправка события об изменении расписания после фиксации транзакции."""
+    event = {
+        'cursor': change.id,
+        'date': change.date.strftime('%Y-%m-%d'),
+        'action': change.action,
+        'schedule': None if schedule is None else {
+            field: getattr(schedule, field) for field in EVENT_FIELDS
+        },
+    }
+    transaction.on_commit(
+        lambda: broker.publish(change.author_id, event)
+    )
+
+
+@receiver(post_save, sender=Schedule, dispatch_uid='schedule_change_save')
+def log_schedule_save(sender, instance, created, **kwargs):
+    """
+    Сигнал для записи создания или изменения Schedule в журнал
+    и отправки события подписчикам после фиксации транзакции.
+    """
+    change = ScheduleChange.objects.create(
+        author_id=instance.author_id,
+        schedule=instance,
+        date=instance.date,
+        action=CHANGE_CREATED if created else CHANGE_UPDATED,
+    )
+    publish_change(change, instance)
+
+
+@receiver(post_delete, sender=Schedule, dispatch_uid='schedule_change_delete')
+def log_schedule_delete(sender, instance, **kwargs):
+    """
+    Сигнал для записи удаления Schedule в журнал (tombstone)
+    и отправки события подписчикам после фиксации транзакции.
+    Для мягко удаленного расписания запись уже есть в журнале.
+    """
+    if instance.deleted_at is not None:
+        return
+    change = ScheduleChange.objects.create(
+        author_id=instance.author_id,
+        schedule=None,
+        date=instance.date,
+        action=CHANGE_DELETED,
+    )
+    publish_change(change, None)
+
+
+@receiver(post_save, sender=Schedule, dispatch_uid='schedule_search_save')
+def update_search_index(sender, instance, **kwargs):
+    """Сигнал для обновления полнотекстового индекса расписания."""
+    index_schedule(instance)
+
+
+@receiver(post_save, sender=Schedule, dispatch_uid='schedule_lessons_save')
+def update_lessons(sender, instance, **kwargs):
+    """Сигнал для пересоздания пар расписания по его тексту."""
+    sync_lessons(instance)
+    transaction.on_commit(invalidate_occupancy)
+
+
+@receiver(post_delete, sender=Schedule, dispatch_uid='schedule_lessons_delete')
+def reset_occupancy(sender, **kwargs):
+    """Сигнал для сброса индекса занятости аудиторий."""
+    transaction.on_commit(invalidate_occupancy)
+
+
+@receiver(post_delete, sender=Schedule, dispatch_uid='schedule_search_delete')
+def delete_search_index(sender, instance, **kwargs):
+    """Сигнал для удаления расписания из полнотекстового индекса."""
+    unindex_schedule(instance.pk)
+
+
+@receiver(post_save, sender=Profile, dispatch_uid='profile_timezone_save')
+@receiver(post_delete, sender=Profile, dispatch_uid='profile_timezone_delete')
+def reset_user_timezone(sender, instance, **kwargs):
+    """Сигнал для сброса часового пояса пользователя в кеше."""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user_timezone(user_id))
@@ -0,0 +1,178 @@
+import datetime as dt
+import logging
+import traceback
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from schedules.digest import DIGEST_KIND, send_digest
+from schedules.lessons import invalidate_occupancy
+from schedules.models import (TASK_DONE, TASK_FAILED, TASK_PENDING,
+                              TASK_RUNNING, Schedule, Task, Week)
+from schedules.occurrences import get_schedules_dates, match_weeks
+
+CHUNK_SIZE = 500
+# Задача в статусе "Выполняется" без обновлений дольше этого времени
+# считается брошенной и может быть повторно взята обработчиком.
+STALE_AFTER = dt.timedelta(minutes=10)
+# Максимальный сдвиг повторения: 4 недели * 10 повторений.
+MAX_REPETITION_SPAN = dt.timedelta(weeks=4 * 10)
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(kind, **payload):
+    """Постановка фоновой задачи в очередь."""
+    return Task.objects.create(kind=kind, payload=payload)
+
+
+def enqueue_schedules_deletion(week):
+    """Постановка в очередь удаления всех объектов Schedule недели."""
+    ids = list(
+        Schedule.objects.filter(week=week).values_list('id', flat=True)
+    )
+    if ids:
+        enqueue('delete_schedules', ids=ids)
+
+
+def enqueue_schedules_relink(start, end, week_ids=()):
+    """
+    Постановка в очередь пересчета недель для объектов Schedule,
+    чьи даты или повторения могут попадать в интервал start - end.
+    """
+    enqueue('relink_schedules', start=start.isoformat(),
+            end=end.isoformat(), week_ids=list(week_ids))
+
+
+def update_progress(task, progress):
+    """Сохранение прогресса задачи без перезаписи остальных полей."""
+    task.progress = progress
+    Task.objects.filter(pk=task.pk).update(progress=progress,
+                                           updated_at=timezone.now())
+
+
+def iter_chunks(ids, chunk_size):
+    """Разбиение списка id на части указанного размера."""
+    for index in range(0, len(ids), chunk_size):
+        yield ids[index:index + chunk_size]
+
+
+def delete_schedules(task, chunk_size):
+    """Удаление объектов Schedule частями по списку id."""
+    ids = task.payload['ids']
+    Task.objects.filter(pk=task.pk).update(total=len(ids))
+    done = 0
+    for chunk in iter_chunks(ids, chunk_size):
+        Schedule.objects.filter(id__in=chunk).delete()
+        done += len(chunk)
+        update_progress(task, done)
+
+
+def relink_chunk(ids):
+    """
+    Пересчет привязки к неделям для части объектов Schedule.
+    Даты повторений всех расписаний части вычисляются сразу, недели
+    читаются одним запросом, связи перезаписываются массово.
+    """
+    rows = list(Schedule.objects.filter(id__in=ids).values_list(
+        'id', 'date', 'repetition_rate', 'repetition_count'
+    ))
+    if not rows:
+        return
+    dates = get_schedules_dates(row[1:] for row in rows)
+    weeks = list(Week.objects.filter(
+        start__lte=max(max(schedule_dates) for schedule_dates in dates),
+        end__gte=min(min(schedule_dates) for schedule_dates in dates),
+    ).order_by('start'))
+    through = Schedule.week.through
+    links = [
+        through(schedule_id=schedule_id, week_id=week_id)
+        for (schedule_id, *_), schedule_dates in zip(rows, dates)
+        for week_id in {week.id for week in match_weeks(schedule_dates, weeks)
+                        if week is not None}
+    ]
+    with transaction.atomic():
+        through.objects.filter(schedule_id__in=ids).delete()
+        through.objects.bulk_create(links)
+        transaction.on_commit(invalidate_occupancy)
+
+
+def relink_schedules(task, chunk_size):
+    """Пересчет привязки к неделям для объектов Schedule частями."""
+    start = dt.date.fromisoformat(task.payload['start'])
+    end = dt.date.fromisoformat(task.payload['end'])
+    ids = list(
+        Schedule.objects.filter(
+            Q(date__range=(start - MAX_REPETITION_SPAN, end))
+            | Q(week__in=task.payload.get('week_ids', []))
+        ).distinct().order_by('id').values_list('id', flat=True)
+    )
+    Task.objects.filter(pk=task.pk).update(total=len(ids))
+    done = 0
+    for chunk in iter_chunks(ids, chunk_size):
+        relink_chunk(chunk)
+        done += len(chunk)
+        update_progress(task, done)
+
+
+TASK_HANDLERS = {
+    'delete_schedules': delete_schedules,
+    'relink_schedules': relink_schedules,
+    DIGEST_KIND: send_digest,
+}
+
+
+def get_available(include_failed=False):
+    """
+    Условие задач, которые можно взять на выполнение: ожидающие
+    и брошенные (выполняются без обновлений дольше STALE_AFTER),
+    при include_failed - также завершенные ошибкой.
+    """
+    stale = timezone.now() - STALE_AFTER
+    available = Q(status=TASK_PENDING) | Q(status=TASK_RUNNING,
+                                           updated_at__lt=stale)
+    if include_failed:
+        available |= Q(status=TASK_FAILED)
+    return available
+
+
+def claim_task(task, available):
+    """
+    Перевод задачи в статус "Выполняется" условным UPDATE, поэтому
+    одну задачу не возьмут два процесса одновременно. Возвращает True,
+    если задача захвачена.
+    """
+    claimed = Task.objects.filter(available, pk=task.pk).update(
+        status=TASK_RUNNING, updated_at=timezone.now()
+    )
+    if claimed:
+        task.status = TASK_RUNNING
+    return bool(claimed)
+
+
+def claim_next_task():
+    """Получение и захват следующей задачи из очереди."""
+    while True:
+        available = get_available()
+        task = Task.objects.filter(available).order_by('id').first()
+        if task is None:
+            return None
+        if claim_task(task, available):
+            return task
+
+
+def run_task(task, chunk_size=CHUNK_SIZE):
+    """Выполнение задачи и сохранение итогового статуса."""
+    try:
+        TASK_HANDLERS[task.kind](task, chunk_size)
+    except Exception:
+        logger.exception('Фоновая задача %s завершилась ошибкой.', task.pk)
+        Task.objects.filter(pk=task.pk).update(
+            status=TASK_FAILED, error=traceback.format_exc(),
+            updated_at=timezone.now()
+        )
+        return False
+    Task.objects.filter(pk=task.pk).update(status=TASK_DONE,
+                                           updated_at=timezone.now())
+    return True
@@ -0,0 +1,54 @@
+import datetime
+
+from django.test import TestCase
+
+from schedules.models import Month, User, Week, Year
+
+# Понедельник первой недели тестового календаря.
+START = datetime.date(2030, 1, 7)
+WEEKS_IN_MONTH = 5
+
+
+def create_calendar(months=1, start=START):
+    """
+    Создание объектов Year и Month с началом в start, недели создаются
+    сигналом. Каждый месяц содержит 5 недель.
+    """
+    for number in range(months):
+        month_start = start + datetime.timedelta(
+            weeks=WEEKS_IN_MONTH * number
+        )
+        month_end = month_start + datetime.timedelta(
+            weeks=WEEKS_IN_MONTH, days=-1
+        )
+        year = (month_start + datetime.timedelta(days=15)).year
+        Year.objects.get_or_create(year=year)
+        Month(start=month_start, end=month_end).save()
+    return list(Week.objects.all())
+
+
+def create_users(count, prefix='user'):
+    """Создание пользователей без паролей."""
+    User.objects.bulk_create(
+        User(username=f'{prefix}{number}',
+             email=f'{prefix}{number}@example.com')
+        for number in range(count)
+    )
+    return list(User.objects.filter(username__startswith=prefix).order_by(
+        'id'
+    ))
+
+
+class CalendarTestCase(TestCase):
+    """
+    TestCase с календарем из одного месяца с START и пользователями:
+    weeks - недели месяца, users - USERS пользователей, user - первый.
+    """
+
+    USERS = 1
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.weeks = create_calendar()
+        cls.users = create_users(cls.USERS)
+        cls.user = cls.users[0]
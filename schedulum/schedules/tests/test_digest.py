@@ -0,0 +1,53 @@
+import datetime
+import io
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+from django.test import TestCase
+
+from schedules.digest import create_digest_task
+from schedules.models import TASK_DONE, TASK_RUNNING, Task
+
+DATE = datetime.date(2030, 1, 8)
+
+
+class DigestTaskTests(TestCase):
+    """Создание задачи рассылки команды send_daily_digest."""
+
+    def send(self, *args):
+        call_command('send_daily_digest', '--date', DATE.isoformat(), *args,
+                     stdout=io.StringIO())
+
+    def test_second_running_task_rejected(self):
+        create_digest_task(DATE)
+        with self.assertRaises(IntegrityError):
+            create_digest_task(DATE)
+        create_digest_task(DATE + datetime.timedelta(days=1))
+
+    def test_concurrent_run_reports_running(self):
+        create_digest_task(DATE)
+        with mock.patch(
+            'schedules.management.commands.send_daily_digest.'
+            'get_digest_task', return_value=None
+        ):
+            with self.assertRaisesMessage(CommandError, 'уже выполняется'):
+                self.send()
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_restart_after_done(self):
+        self.send()
+        self.send('--restart')
+        self.assertEqual(
+            list(Task.objects.order_by('id').values_list(
+                'status', flat=True
+            )),
+            [TASK_DONE, TASK_DONE]
+        )
+
+    def test_fresh_running_task_not_claimed(self):
+        task = create_digest_task(DATE)
+        with self.assertRaisesMessage(CommandError, 'уже выполняется'):
+            self.send('--restart')
+        task.refresh_from_db()
+        self.assertEqual(task.status, TASK_RUNNING)
@@ -0,0 +1,114 @@
+import datetime
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from schedules.models import (CHANGE_CREATED, CHANGE_DELETED, Month,
+                              Schedule, ScheduleChange, Week)
+from schedules.tests.factories import START, CalendarTestCase
+
+
+class SoftDeleteTests(CalendarTestCase):
+    """Мягкое удаление и восстановление месяцев, недель и расписаний."""
+
+    def create_schedule(self, date, **fields):
+        schedule = Schedule(author=self.user, date=date, text='text',
+                            **fields)
+        schedule.save()
+        return schedule
+
+    def get_actions(self):
+        return list(ScheduleChange.objects.order_by('id').values_list(
+            'action', flat=True
+        ))
+
+    def test_schedule_soft_delete_and_restore(self):
+        schedule = self.create_schedule(START)
+        ScheduleChange.objects.all().delete()
+        Schedule.objects.filter(pk=schedule.pk).soft_delete()
+        self.assertFalse(Schedule.objects.exists())
+        self.assertTrue(Schedule.all_objects.deleted().exists())
+        self.assertEqual(self.get_actions(), [CHANGE_DELETED])
+        self.assertEqual(Schedule.all_objects.restore(), 1)
+        self.assertTrue(Schedule.objects.filter(pk=schedule.pk).exists())
+        self.assertEqual(self.get_actions(), [CHANGE_DELETED, CHANGE_CREATED])
+        change = ScheduleChange.objects.latest('id')
+        self.assertEqual(change.schedule_id, schedule.pk)
+        self.assertEqual(change.date, START)
+
+    def test_restore_skips_taken_date(self):
+        schedule = self.create_schedule(START)
+        Schedule.objects.filter(pk=schedule.pk).soft_delete()
+        replacement = self.create_schedule(START)
+        ScheduleChange.objects.all().delete()
+        self.assertEqual(Schedule.all_objects.restore(), 0)
+        self.assertEqual(
+            list(Schedule.objects.values_list('id', flat=True)),
+            [replacement.pk]
+        )
+        self.assertFalse(ScheduleChange.objects.exists())
+
+    def test_week_restore_groups_by_deleted_at(self):
+        week = self.weeks[0]
+        kept = self.create_schedule(START)
+        separate = self.create_schedule(START + datetime.timedelta(days=1))
+        Schedule.objects.filter(pk=separate.pk).soft_delete(
+            timezone.now() - datetime.timedelta(hours=1)
+        )
+        Week.objects.filter(pk=week.pk).soft_delete()
+        deleted_at = Week.all_objects.get(pk=week.pk).deleted_at
+        self.assertEqual(
+            Schedule.all_objects.get(pk=kept.pk).deleted_at, deleted_at
+        )
+        self.assertEqual(Week.all_objects.restore(), 1)
+        self.assertTrue(Week.objects.filter(pk=week.pk).exists())
+        self.assertEqual(
+            list(Schedule.objects.values_list('id', flat=True)), [kept.pk]
+        )
+        self.assertTrue(
+            Schedule.all_objects.filter(pk=separate.pk).deleted().exists()
+        )
+
+    def test_month_soft_delete_cascades(self):
+        self.create_schedule(START)
+        self.create_schedule(START + datetime.timedelta(weeks=1))
+        ScheduleChange.objects.all().delete()
+        Month.objects.all().soft_delete()
+        self.assertFalse(Week.objects.exists())
+        self.assertFalse(Schedule.objects.exists())
+        self.assertEqual(self.get_actions(), [CHANGE_DELETED] * 2)
+        self.assertEqual(Month.all_objects.restore(), 1)
+        self.assertEqual(Week.objects.count(), len(self.weeks))
+        self.assertEqual(Schedule.objects.count(), 2)
+        self.assertEqual(self.get_actions(),
+                         [CHANGE_DELETED] * 2 + [CHANGE_CREATED] * 2)
+
+    def test_restore_skips_recreated_month(self):
+        month = Month.objects.get()
+        Month.objects.all().soft_delete()
+        Month(start=month.start, end=month.end).save()
+        self.assertEqual(Month.all_objects.restore(), 0)
+        self.assertTrue(
+            Month.all_objects.filter(pk=month.pk).deleted().exists()
+        )
+        Month.objects.all().delete()
+        self.assertEqual(Month.all_objects.restore(), 1)
+
+    def test_clean_rejects_alive_duplicates(self):
+        month = Month.objects.get()
+        with self.assertRaises(ValidationError):
+            Month(start=month.start, end=month.end).full_clean()
+        first, last = self.weeks[0], self.weeks[-1]
+        with self.assertRaises(ValidationError):
+            Week(title='other', start=first.start,
+                 end=first.end).full_clean()
+        Week.objects.filter(pk=last.pk).soft_delete()
+        with self.assertRaises(ValidationError):
+            Week(title=first.title, start=last.start,
+                 end=last.end).full_clean()
+        Week(title=last.title, start=last.start, end=last.end).full_clean()
+
+    def test_clean_allows_deleted_duplicates(self):
+        month = Month.objects.get()
+        Month.objects.all().soft_delete()
+        Month(start=month.start, end=month.end).full_clean()
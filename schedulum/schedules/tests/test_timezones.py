@@ -0,0 +1,71 @@
+import datetime
+from unittest import mock
+
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from schedules.models import Profile
+from schedules.tests.factories import create_users
+from schedules.timezones import (TIMEZONE_TIMEOUT, get_local_days,
+                                 get_timezone_timeout)
+
+NEW_YORK = 'America/New_York'
+
+
+def utc(*args):
+    """Момент времени в UTC."""
+    return datetime.datetime(*args, tzinfo=pytz.utc)
+
+
+class LocalDaysTests(TestCase):
+    """Сегодняшняя и завтрашняя даты в часовом поясе пользователя."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, = create_users(1)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_local_days(self, now):
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            return get_local_days(self.user)
+
+    def test_days_switch_at_user_midnight(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Profile.objects.create(user=self.user, timezone=NEW_YORK)
+        self.assertNotEqual(NEW_YORK, settings.TIME_ZONE)
+        self.assertEqual(
+            self.get_local_days(utc(2030, 1, 8, 4, 59)),
+            (datetime.date(2030, 1, 7), datetime.date(2030, 1, 8))
+        )
+        self.assertEqual(
+            self.get_local_days(utc(2030, 1, 8, 5, 0)),
+            (datetime.date(2030, 1, 8), datetime.date(2030, 1, 9))
+        )
+
+    def test_profile_change_resets_cached_timezone(self):
+        profile = Profile.objects.create(user=self.user, timezone=NEW_YORK)
+        now = utc(2030, 1, 8, 4, 0)
+        self.assertEqual(self.get_local_days(now)[0],
+                         datetime.date(2030, 1, 7))
+        profile.timezone = 'Asia/Vladivostok'
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        self.assertEqual(self.get_local_days(now)[0],
+                         datetime.date(2030, 1, 8))
+
+    def test_server_timezone_uses_current_day(self):
+        self.assertEqual(get_local_days(self.user),
+                         (settings.CURRENT_DAY, settings.NEXT_DAY))
+
+    def test_timeout_bounded_with_local_cache(self):
+        backend = 'django.core.cache.backends.locmem.LocMemCache'
+        with override_settings(CACHE_BACKEND=backend):
+            self.assertEqual(get_timezone_timeout(),
+                             settings.PROCESS_CACHE_MAX_AGE)
+        backend = 'django.core.cache.backends.filebased.FileBasedCache'
+        with override_settings(CACHE_BACKEND=backend):
+            self.assertEqual(get_timezone_timeout(), TIMEZONE_TIMEOUT)
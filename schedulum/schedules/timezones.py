@@ -0,0 +1,59 @@
+import datetime as dt
+
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from schedules.models import Profile
+
+TIMEZONE_KEY = 'schedules:timezone:{user_id}'
+TIMEZONE_TIMEOUT = 24 * 60 * 60
+
+
+def get_timezone_timeout():
+    """Время хранения часового пояса пользователя в кеше."""
+    if settings.CACHE_BACKEND in settings.LOCAL_CACHE_BACKENDS:
+        return settings.PROCESS_CACHE_MAX_AGE
+    return TIMEZONE_TIMEOUT
+
+
+def get_user_timezone(user):
+    """
+    Название часового пояса пользователя из кеша Django.
+    1. При промахе кеша часовой пояс читается из профиля одним запросом,
+    поэтому повторные запросы пользователя не обращаются к базе данных;
+    2. Для анонимного пользователя и пользователя без профиля или
+    с пустым часовым поясом возвращается TIME_ZONE;
+    3. Сброс при изменении профиля виден только процессу, изменившему
+    профиль, если кеш хранится в памяти процесса, поэтому с таким кешем
+    запись живет PROCESS_CACHE_MAX_AGE секунд.
+    """
+    if not user.is_authenticated:
+        return settings.TIME_ZONE
+    key = TIMEZONE_KEY.format(user_id=user.pk)
+    name = cache.get(key)
+    if name is None:
+        name = Profile.objects.filter(user_id=user.pk).values_list(
+            'timezone', flat=True
+        ).first() or settings.TIME_ZONE
+        cache.set(key, name, get_timezone_timeout())
+    return name
+
+
+def invalidate_user_timezone(user_id):
+    """Сброс часового пояса пользователя в кеше при изменении профиля."""
+    cache.delete(TIMEZONE_KEY.format(user_id=user_id))
+
+
+def get_local_days(user):
+    """
+    Сегодняшняя и завтрашняя даты в часовом поясе пользователя.
+    Для часового пояса сервера используются CURRENT_DAY и NEXT_DAY
+    из настроек, которые процесс обновляет при смене дня.
+    """
+    name = get_user_timezone(user)
+    if name == settings.TIME_ZONE:
+        return settings.CURRENT_DAY, settings.NEXT_DAY
+    today = timezone.now().astimezone(pytz.timezone(name)).date()
+    return today, today + dt.timedelta(days=1)
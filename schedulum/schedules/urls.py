@@ -2,7 +2,8 @@ from django.urls import include, path
 
 from schedules.views import (CalendarView, DayListView, IndexView,
                              ProfileView, ScheduleCreateView,
-                             ScheduleDeleteView, ScheduleUpdateView)
+                             ScheduleDeleteView, ScheduleUpdateView,
+                             WeekMatrixView)
 
 app_name = 'schedules'
 
@@ -10,6 +11,12 @@ schedules_urls = [
     path('create/', ScheduleCreateView.as_view(), name='create'),
     path('<slug:date>/edit/', ScheduleUpdateView.as_view(), name='edit'),
     path('<slug:date>/delete/', ScheduleDeleteView.as_view(), name='delete'),
+    path('week/<int:week_id>/', DayListView.as_view(), name='week'),
+    path('week/<int:week_id>/matrix/', WeekMatrixView.as_view(),
+         name='matrix'),
+    path('<int:year>/week/<int:iso_week>/',
+         DayListView.as_view(),
+         name='iso_week'),
     path('<int:year>/<str:month_titl>/<str:week_title>/',
          DayListView.as_view(),
          name='days')
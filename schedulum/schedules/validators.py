@@ -1,24 +1,34 @@
 import datetime as dt
 
+import pytz
 from django.core.exceptions import ValidationError
 from django.conf import settings
 
-CURRENT_MONTH = settings.CURRENT_MONTH
-CURRENT_YEAR = settings.CURRENT_YEAR
-DATES = settings.VALIDATE_DATES
 INVALID_PAST_ERROR = 'Август и Июль неучебные месяцы.'
 
 
+def get_current_year():
+    """Текущий год для валидаторов поля year."""
+    return settings.CURRENT_YEAR
+
+
+def get_next_year():
+    """Следующий год для валидаторов поля year."""
+    return settings.NEXT_YEAR
+
+
 def correct_start(date):
     """
     Валидатор для проверки начала промежутка: запрещены Июль и Август,
     прошлый месяц. Можно выбрать только понедельник.
     """
-    correct_month = dt.date(year=CURRENT_YEAR, month=CURRENT_MONTH, day=1)
+    correct_month = dt.date(year=settings.CURRENT_YEAR,
+                            month=settings.CURRENT_MONTH, day=1)
+    dates = settings.VALIDATE_DATES
     if date < correct_month:
         raise ValidationError('Прошедший месяц не доступен для выбора.')
-    if (DATES['CURRENT_JULY'] < date < DATES['CURRENT_AUGUST']
-            or DATES['NEXT_JULY'] < date < DATES['NEXT_AUGUST']):
+    if (dates['CURRENT_JULY'] < date < dates['CURRENT_AUGUST']
+            or dates['NEXT_JULY'] < date < dates['NEXT_AUGUST']):
         raise ValidationError(INVALID_PAST_ERROR)
     if date.weekday() != 0:
         raise ValidationError('Промежуток должен начинаться с понедельника.')
@@ -30,9 +40,17 @@ def correct_end(date):
     Валидатор для проверки конца промежутка: запрещены Июль и Август,
     прошлый месяц. Можно выбрать только воскресенье.
     """
-    if (DATES['CURRENT_START_JULY'] < date < DATES['CURRENT_END_AUGUST']
-            or DATES['NEXT_START_JULY'] < date < DATES['NEXT_END_AUGUST']):
+    dates = settings.VALIDATE_DATES
+    if (dates['CURRENT_START_JULY'] < date < dates['CURRENT_END_AUGUST']
+            or dates['NEXT_START_JULY'] < date < dates['NEXT_END_AUGUST']):
         raise ValidationError(INVALID_PAST_ERROR)
     if date.weekday() != 6:
         raise ValidationError('Промежуток должен заканчиваться в воскресенье.')
     return date
+
+
+def correct_timezone(name):
+    """Валидатор названия часового пояса из базы IANA."""
+    if name and name not in pytz.all_timezones_set:
+        raise ValidationError('Неизвестный часовой пояс.')
+    return name
@@ -1,17 +1,23 @@
 import datetime
 
-from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.template.loader import get_template, render_to_string
 from django.views.generic import (CreateView, DeleteView, ListView,
-                                  TemplateView, UpdateView)
-from django.urls import reverse_lazy
+                                  TemplateView, UpdateView, View)
+from django.urls import reverse, reverse_lazy
 
 from schedules.forms import ScheduleCreationForm, ScheduleEditForm
-from schedules.models import Month, Year, Week, Schedule, User
+from schedules.models import Month, Year, Schedule, User
+from schedules.formats import (WEEKDAY_TITLES, format_date, format_day,
+                               format_interval)
+from schedules.matrix import (get_matrix_users, get_week_dates, iter_chunks,
+                              iter_matrix_rows)
+from schedules.routing import get_route_or_404, get_week_routes
+from schedules.timezones import get_local_days
 
-CURRENT_DAY = settings.CURRENT_DAY
-NEXT_DAY = settings.NEXT_DAY
+MATRIX_ROWS_MARKER = '<!-- matrix rows -->'
 
 
 def csrf_failure(request, reason=''):
@@ -29,6 +35,18 @@ def server_error(request):
     return render(request, 'error_pages/500.html', status=500)
 
 
+def get_schedule_fields(row):
+    """
+    Поля расписания для template: текст, заметки и ссылки на изменение
+    и удаление. Для отсутствующего расписания текст равен None.
+    """
+    if row is None:
+        return None, None, None, None
+    date, text, notes = row
+    return (text, notes, reverse('schedules:edit', args=(date,)),
+            reverse('schedules:delete', args=(date,)))
+
+
 class ScheduleChangeMixin(LoginRequiredMixin):
     """Миксин для обновления и удаления объектов Schedule."""
 
@@ -65,17 +83,25 @@ class CalendarView(LoginRequiredMixin, ListView):
     template_name = 'schedules/calendar.html'
 
     def get_queryset(self):
-        """Получение объектов Year, Month, Week."""
-        self.year_objects = Year.objects.all()[:2]
-        self.week_objects = Week.objects.all()
-        return super().get_queryset()
-
-    def get_context_data(self, **kwargs):
-        """Передача объектов в template через словарь context."""
-        context = super().get_context_data(**kwargs)
-        context['years'] = self.year_objects
-        context['weeks'] = self.week_objects
-        return context
+        """
+        Сборка календаря из таблицы маршрутов недель: список кортежей
+        (заголовок года, месяцы), месяц - кортеж (заголовок, недели),
+        неделя - кортеж (заголовок, ссылка, интервал дат).
+        """
+        years = Year.objects.values_list('year', 'title')[:2]
+        months = {}
+        for route in get_week_routes().by_id.values():
+            months.setdefault(route.year, {}).setdefault(
+                route.month_title, []
+            ).append((
+                route.title,
+                reverse('schedules:week', args=(route.id,)),
+                format_interval(route.start, route.end),
+            ))
+        return [
+            (title, tuple(months.get(year, {}).items()))
+            for year, title in years
+        ]
 
 
 class DayListView(LoginRequiredMixin, ListView):
@@ -84,31 +110,88 @@ class DayListView(LoginRequiredMixin, ListView):
     template_name = 'schedules/daylist.html'
 
     def dispatch(self, request, *args, **kwargs):
-        """Получение объектов пользователя, Year, Month, Week или ошибка."""
+        """Получение объекта пользователя и маршрута недели или ошибка."""
         self.user = get_object_or_404(User, username=request.user)
-        year = get_object_or_404(Year, year=kwargs['year'])
-        month = get_object_or_404(Month, title=kwargs['month_titl'], year=year)
-        week_title = kwargs['week_title']
-        week_title = week_title.replace('%20', ' ')
-        self.week = get_object_or_404(Week, title=week_title, month=month)
+        self.week = self.get_week_route()
         return super().dispatch(request, *args, **kwargs)
 
+    def get_week_route(self):
+        """
+        Получение маршрута недели из таблицы маршрутов по id недели,
+        ISO номеру недели или заголовкам месяца и недели.
+        """
+        if 'week_id' in self.kwargs:
+            return get_route_or_404('by_id', self.kwargs['week_id'])
+        if 'iso_week' in self.kwargs:
+            key = (self.kwargs['year'], self.kwargs['iso_week'])
+            return get_route_or_404('by_iso', key)
+        key = (self.kwargs['year'], self.kwargs['month_titl'],
+               self.kwargs['week_title'])
+        return get_route_or_404('by_title', key)
+
     def get_queryset(self):
         """
-        Получение и передача объектов Schedule в template исходя из их
-        номера дня недели, номера недели и пользователя.
+        Получение объектов Schedule недели одним запросом и передача
+        в template кортежей (день недели, дата, текст, заметки, ссылки
+        на изменение и удаление) для каждого дня недели.
         """
-        schedules = []
+        rows = Schedule.objects.filter(
+            author=self.user,
+            week=self.week.id
+        ).values_list('date', 'text', 'notes')
+        schedules = {}
+        for row in rows:
+            schedules.setdefault(row[0].weekday(), row)
+        days = []
         for number in range(7):
             date = self.week.start + datetime.timedelta(days=number)
-            schedule = Schedule.objects.filter(
-                date__week_day=date.weekday() + 2,
-                author=self.user,
-                week=self.week
-            ).first()
-            date_schedule_tuple = (date, schedule)
-            schedules.append(date_schedule_tuple)
-        return schedules
+            days.append((WEEKDAY_TITLES[date.weekday()], format_day(date),
+                         *get_schedule_fields(
+                             schedules.get(date.weekday())
+                         )))
+        return days
+
+
+class WeekMatrixView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """
+    View матрицы пользователи x дни недели для персонала.
+    1. Расписания всех пользователей читаются одним запросом;
+    2. Страница отдается потоком: сначала шапка таблицы, затем строки
+    частями по мере чтения из базы данных.
+    """
+
+    template_name = 'schedules/matrix.html'
+    rows_template_name = 'includes/matrix_rows.html'
+
+    def test_func(self):
+        """Доступ только для персонала."""
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        """Сборка шапки страницы и потоковая передача строк матрицы."""
+        week = get_route_or_404('by_id', self.kwargs['week_id'])
+        query = request.GET.get('q', '')
+        users = get_matrix_users(request.GET.getlist('username'), query)
+        page = render_to_string(self.template_name, {
+            'week_title': week.title,
+            'interval': format_interval(week.start, week.end),
+            'days': [(WEEKDAY_TITLES[date.weekday()], format_day(date))
+                     for date in get_week_dates(week)],
+            'query': query,
+            'rows_marker': MATRIX_ROWS_MARKER,
+        }, request)
+        head, tail = page.split(MATRIX_ROWS_MARKER)
+        return StreamingHttpResponse(
+            self.iter_page(head, tail, iter_matrix_rows(week, users))
+        )
+
+    def iter_page(self, head, tail, rows):
+        """Потоковая отрисовка строк матрицы между шапкой и концом."""
+        yield head
+        template = get_template(self.rows_template_name)
+        for chunk in iter_chunks(rows):
+            yield template.render({'rows': chunk})
+        yield tail
 
 
 class ScheduleCreateView(LoginRequiredMixin, CreateView):
@@ -146,23 +229,31 @@ class ProfileView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         """
         1. Получение объекта пользователя или ошибка;
-        2. Получение объектов Schedule на сегодняшнюю и завтрашнюю дату;
+        2. Получение объектов Schedule на сегодняшнюю и завтрашнюю дату
+        в часовом поясе пользователя;
         3. Передача объектов в template.
         """
         self.user = get_object_or_404(User, username=self.request.user)
+        today, tomorrow = get_local_days(self.request.user)
+        days = ((today, 'Сегодня'), (tomorrow, 'Завтра'))
+        routes = get_week_routes().by_iso
+        weeks = {}
+        for day, _ in days:
+            route = routes.get(day.isocalendar()[:2])
+            if route is not None and route.start <= day <= route.end:
+                weeks[day] = route.id
+        rows = list(Schedule.objects.filter(
+            author=self.user, week__in=weeks.values()
+        ).values_list('date', 'text', 'notes', 'week'))
         schedules = []
-        for day, title in ((CURRENT_DAY, 'Сегодня'), (NEXT_DAY, 'Завтра')):
-            week = Week.objects.filter(
-                start__lte=day,
-                end__gte=day
-            ).first()
-            schedule = Schedule.objects.filter(
-                date__week_day=day.weekday() + 2,
-                author=self.user,
-                week=week,
-            ).first()
-            schedule_date_tuple = (schedule, day, title)
-            schedules.append(schedule_date_tuple)
+        for day, title in days:
+            schedule = next((
+                row[:3] for row in rows
+                if row[3] == weeks.get(day)
+                and row[0].weekday() == day.weekday()
+            ), None)
+            schedules.append((title, format_date(day),
+                              *get_schedule_fields(schedule)))
         return schedules
 
     def get_context_data(self, **kwargs):
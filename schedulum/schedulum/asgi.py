@@ -4,4 +4,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schedulum.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from api.v1.streams import EVENTS_PATH, schedule_events  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """Передача потока событий SSE мимо Django, остальное - в Django."""
+    if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+        return await schedule_events(scope, receive, send)
+    return await django_application(scope, receive, send)
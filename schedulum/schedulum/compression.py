@@ -0,0 +1,258 @@
+import re
+import threading
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP = 'gzip'
+BROTLI = 'br'
+MIN_SIZE = 200
+# Потоковый ответ сжимается частями не меньше этого размера: сброс
+# буфера компрессора после каждой короткой строки экспорта увеличивает
+# сжатый ответ в несколько раз.
+STREAM_BUFFER_SIZE = 16 * 1024
+# Типы ответов, которые имеет смысл сжимать. Поток событий (SSE) не
+# сжимается: события короткие, а соединение держится долго.
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/(?!event-stream)[\w.+-]+'
+    r'|application/([\w.+-]*\+)?(json|xml|javascript|x-ndjson)'
+    r'|image/svg\+xml)\s*(;|$)',
+    re.IGNORECASE
+)
+UNRESOLVED = '<unresolved>'
+
+
+def get_min_size():
+    """Минимальный размер ответа для сжатия из настроек."""
+    return getattr(settings, 'COMPRESSION_MIN_SIZE', MIN_SIZE)
+
+
+def parse_accept_encoding(header):
+    """Кодировки из заголовка Accept-Encoding с ненулевым весом."""
+    encodings = set()
+    for item in header.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        weight = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name and weight > 0:
+            encodings.add(name)
+    return encodings
+
+
+def choose_encoding(header):
+    """
+    Выбор кодировки ответа по заголовку Accept-Encoding: brotli, если
+    модуль установлен и клиент его принимает, иначе gzip или None.
+    """
+    encodings = parse_accept_encoding(header)
+    if brotli is not None and BROTLI in encodings:
+        return BROTLI
+    if GZIP in encodings or '*' in encodings:
+        return GZIP
+    return None
+
+
+class Compressor():
+    """Потоковый компрессор с общим интерфейсом для gzip и brotli."""
+
+    def __init__(self, encoding):
+        """Создание компрессора для кодировки gzip или br."""
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self.compressor = brotli.Compressor()
+        else:
+            self.compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                               16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        """Сжатие части данных с выдачей всего, что уже можно отправить."""
+        if self.encoding == BROTLI:
+            return self.compressor.process(data) + self.compressor.flush()
+        return (self.compressor.compress(data)
+                + self.compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    def finish(self):
+        """Завершение потока сжатых данных."""
+        if self.encoding == BROTLI:
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+
+def compress_bytes(data, encoding):
+    """Сжатие ответа целиком."""
+    if encoding == BROTLI:
+        return brotli.compress(data)
+    return zlib.compress(data, 6, 16 + zlib.MAX_WBITS)
+
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def record(endpoint, encoding, original, compressed):
+    """Учет размеров ответа endpoint до и после сжатия."""
+    with _lock:
+        stats = _stats.setdefault(endpoint, {
+            'responses': 0, 'compressed': 0, 'original_bytes': 0,
+            'compressed_bytes': 0, 'encodings': {},
+        })
+        stats['responses'] += 1
+        stats['original_bytes'] += original
+        stats['compressed_bytes'] += compressed
+        if encoding is not None:
+            stats['compressed'] += 1
+            stats['encodings'][encoding] = (
+                stats['encodings'].get(encoding, 0) + 1
+            )
+
+
+def get_compression_stats():
+    """Копия счетчиков сжатия по endpoint с отношением размеров."""
+    with _lock:
+        stats = {endpoint: dict(values, encodings=dict(values['encodings']))
+                 for endpoint, values in _stats.items()}
+    for values in stats.values():
+        original = values['original_bytes']
+        values['ratio'] = (round(values['compressed_bytes'] / original, 3)
+                           if original else None)
+    return stats
+
+
+def reset_compression_stats():
+    """Сброс счетчиков сжатия процесса."""
+    with _lock:
+        _stats.clear()
+
+
+def get_endpoint(request):
+    """Название endpoint для счетчиков: имя маршрута URLconf."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNRESOLVED
+    return match.view_name
+
+
+def is_compressible(response):
+    """Проверка, что ответ можно сжимать."""
+    if response.has_header('Content-Encoding'):
+        return False
+    if response.status_code in (204, 206, 304):
+        return False
+    if 'no-transform' in response.get('Cache-Control', '').lower():
+        return False
+    if not COMPRESSIBLE_TYPES.match(response.get('Content-Type', '')):
+        return False
+    return True
+
+
+def weaken_etag(response):
+    """
+    ETag сжатого ответа становится слабым: байты отличаются от несжатого
+    ответа, но содержимое то же, поэтому условные запросы продолжают
+    работать для обеих кодировок.
+    """
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+
+
+class CompressionMiddleware():
+    """
+    Сжатие ответов gzip или brotli (если установлен модуль brotli).
+    1. Сжимаются текстовые ответы и JSON не меньше COMPRESSION_MIN_SIZE
+    байт, ответ всегда получает Vary: Accept-Encoding;
+    2. Потоковые ответы сжимаются частями по STREAM_BUFFER_SIZE байт
+    со сбросом буфера компрессора после каждой, поэтому клиент получает
+    данные по мере готовности без потери степени сжатия;
+    3. Размеры ответов до и после сжатия учитываются по endpoint,
+    см. get_compression_stats.
+    """
+
+    def __init__(self, get_response):
+        """Сохранение следующего обработчика цепочки middleware."""
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Сжатие ответа, если клиент и тип ответа это допускают."""
+        response = self.get_response(request)
+        if not is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        endpoint = get_endpoint(request)
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if response.streaming:
+            response.streaming_content = self.compress_stream(
+                response.streaming_content, encoding, endpoint
+            )
+            if encoding is not None:
+                del response['Content-Length']
+                self.set_encoding(response, encoding)
+            return response
+        original = len(response.content)
+        if encoding is None or original < get_min_size():
+            record(endpoint, None, original, original)
+            return response
+        compressed = compress_bytes(response.content, encoding)
+        if len(compressed) >= original:
+            record(endpoint, None, original, original)
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        self.set_encoding(response, encoding)
+        record(endpoint, encoding, original, len(compressed))
+        return response
+
+    @staticmethod
+    def set_encoding(response, encoding):
+        """Заголовки сжатого ответа."""
+        response['Content-Encoding'] = encoding
+        weaken_etag(response)
+
+    @staticmethod
+    def compress_stream(chunks, encoding, endpoint):
+        """
+        Сжатие потока частей ответа с учетом размеров по его окончании.
+        Части накапливаются до STREAM_BUFFER_SIZE байт и сжимаются вместе,
+        без кодировки части передаются как есть.
+        """
+        compressor = Compressor(encoding) if encoding is not None else None
+        original = compressed = 0
+        buffer = []
+        buffered = 0
+        try:
+            for chunk in chunks:
+                original += len(chunk)
+                if compressor is not None:
+                    buffer.append(chunk)
+                    buffered += len(chunk)
+                    if buffered < STREAM_BUFFER_SIZE:
+                        continue
+                    chunk = compressor.compress(b''.join(buffer))
+                    buffer = []
+                    buffered = 0
+                if chunk:
+                    compressed += len(chunk)
+                    yield chunk
+            if compressor is not None:
+                chunk = compressor.compress(b''.join(buffer)) + (
+                    compressor.finish()
+                )
+                compressed += len(chunk)
+                yield chunk
+        finally:
+            record(endpoint, encoding, original, compressed)
@@ -0,0 +1,45 @@
+import datetime
+
+
+def get_day_state(today=None):
+    """
+    Получение настроек, зависящих от текущего дня: даты сегодня и завтра,
+    текущего и следующего года, границ неучебных месяцев для валидации.
+    """
+    today = today or datetime.date.today()
+    current_year = today.year
+    next_year = current_year + 1
+    return {
+        'CURRENT_DAY': today,
+        'NEXT_DAY': today + datetime.timedelta(days=1),
+        'CURRENT_MONTH': today.month,
+        'CURRENT_YEAR': current_year,
+        'NEXT_YEAR': next_year,
+        'VALIDATE_DATES': {
+            'CURRENT_AUGUST': datetime.date(current_year, 8, 29),
+            'CURRENT_END_AUGUST': datetime.date(current_year, 8, 31),
+            'NEXT_AUGUST': datetime.date(next_year, 8, 29),
+            'NEXT_END_AUGUST': datetime.date(next_year, 8, 31),
+            'CURRENT_JULY': datetime.date(current_year, 7, 1),
+            'CURRENT_START_JULY': datetime.date(current_year, 7, 6),
+            'NEXT_JULY': datetime.date(next_year, 7, 1),
+            'NEXT_START_JULY': datetime.date(next_year, 7, 6),
+        },
+    }
+
+
+def refresh_day_state(today=None):
+    """
+    Обновление настроек текущего дня в запущенном процессе.
+    Вызывается перед обработкой запроса, поэтому процессы, работающие
+    дольше суток, не требуют перезапуска в полночь. Возвращает True,
+    если день сменился и настройки были обновлены.
+    """
+    from django.conf import settings
+
+    today = today or datetime.date.today()
+    if settings.CURRENT_DAY == today:
+        return False
+    for name, value in get_day_state(today).items():
+        setattr(settings, name, value)
+    return True
@@ -2,8 +2,11 @@ import datetime
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
+from schedulum.days import get_day_state
+
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -29,6 +32,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'schedulum.staticfiles.StaticFilesMiddleware',
+    'schedulum.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -41,12 +46,23 @@ ROOT_URLCONF = 'schedulum.urls'
 
 TEMPLATES_DIRS = BASE_DIR / 'templates'
 
+TEMPLATES_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+# Без DEBUG скомпилированные шаблоны хранятся в памяти процесса.
+if not DEBUG:
+    TEMPLATES_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATES_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIRS],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATES_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -62,7 +78,7 @@ WSGI_APPLICATION = 'schedulum.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
     }
 }
 
@@ -89,6 +105,17 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.v1.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': os.getenv('THROTTLE_AUTH_IP', '20/min'),
+        'auth_username': os.getenv('THROTTLE_AUTH_USERNAME', '5/min'),
+        'schedule_write': os.getenv('THROTTLE_SCHEDULE_WRITE', '60/min'),
+    },
 }
 
 SIMPLE_JWT = {
@@ -98,10 +125,15 @@ SIMPLE_JWT = {
 
 CSRF_FAILURE_VIEW = 'schedules.views.csrf_failure'
 
+# Ответы меньше этого размера в байтах не сжимаются.
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 200))
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
+
 LOGIN_URL = 'login'
 
 LOGIN_REDIRECT_URL = 'schedules:index'
@@ -122,27 +154,91 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static_backend',
 ]
 
+# Статика собирается командой collectstatic: имена файлов с хешем
+# содержимого и сжатые варианты, см. schedulum/staticfiles.py.
+STATIC_ROOT = os.getenv('STATIC_ROOT', BASE_DIR / 'static')
+
+STATICFILES_STORAGE = (
+    'schedulum.staticfiles.CompressedManifestStaticFilesStorage'
+)
+
+# Время кеширования клиентом файлов статики без хеша в имени, в секундах.
+STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', 60))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+CACHE_BACKEND = os.getenv(
+    'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+)
+
+# Кеши в памяти процесса: при нескольких процессах каждый видит только
+# свои записи.
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    },
+    # Ответы запросов с Idempotency-Key, см. api/v1/idempotency.py.
+    'idempotency': {
+        'BACKEND': os.getenv(
+            'IDEMPOTENCY_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('IDEMPOTENCY_CACHE_LOCATION', 'idempotency'),
+        'TIMEOUT': int(os.getenv('IDEMPOTENCY_TTL', 24 * 60 * 60)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('IDEMPOTENCY_MAX_ENTRIES', 10000)),
+        },
+    },
+}
+
+# Таблицы в памяти процесса (маршруты недель, занятость аудиторий)
+# сбрасываются по версии в кеше default, а с кешем в памяти процесса -
+# не реже раза в это количество секунд.
+PROCESS_CACHE_MAX_AGE = int(os.getenv('PROCESS_CACHE_MAX_AGE', 60))
+
+# Хранилище сессий: db - база данных, cached_db - база данных и кеш
+# default (чтение сессии без запроса к базе данных), signed_cookies -
+# подписанная cookie без хранения на сервере. По умолчанию cached_db
+# только при общем для процессов кеше: с кешем в памяти процесса другие
+# рабочие процессы продолжали бы отдавать сессию после выхода из аккаунта.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_MODE = os.getenv(
+    'SESSION_MODE',
+    'db' if CACHE_BACKEND in LOCAL_CACHE_BACKENDS else 'cached_db'
+)
+
+if SESSION_MODE == 'cached_db' and CACHE_BACKEND in LOCAL_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        'SESSION_MODE=cached_db требует общего для процессов кеша: '
+        'укажите CACHE_BACKEND, например FileBasedCache или Redis.'
+    )
+
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+
 # Даты для валидации значений в поле "date" у моделей.
+# В рабочих процессах обновляются при смене дня, см. schedulum/days.py.
 
-CURRENT_DAY = datetime.date.today()
+day_state = get_day_state()
 
-NEXT_DAY = CURRENT_DAY + datetime.timedelta(days=1)
+CURRENT_DAY = day_state['CURRENT_DAY']
 
-CURRENT_MONTH = datetime.date.today().month
+NEXT_DAY = day_state['NEXT_DAY']
 
-CURRENT_YEAR = datetime.date.today().year
+CURRENT_MONTH = day_state['CURRENT_MONTH']
 
-NEXT_YEAR = datetime.date.today().year + 1
+CURRENT_YEAR = day_state['CURRENT_YEAR']
 
-VALIDATE_DATES = {
-    'CURRENT_AUGUST': datetime.date(year=CURRENT_YEAR, month=8, day=29),
-    'CURRENT_END_AUGUST': datetime.date(year=CURRENT_YEAR, month=8, day=31),
-    'NEXT_AUGUST': datetime.date(year=NEXT_YEAR, month=8, day=29),
-    'NEXT_END_AUGUST': datetime.date(year=NEXT_YEAR, month=8, day=31),
-    'CURRENT_JULY': datetime.date(year=CURRENT_YEAR, month=7, day=1),
-    'CURRENT_START_JULY': datetime.date(year=CURRENT_YEAR, month=7, day=6),
-    'NEXT_JULY': datetime.date(year=NEXT_YEAR, month=7, day=1),
-    'NEXT_START_JULY': datetime.date(year=NEXT_YEAR, month=7, day=6)
-}
+NEXT_YEAR = day_state['NEXT_YEAR']
+
+VALIDATE_DATES = day_state['VALIDATE_DATES']
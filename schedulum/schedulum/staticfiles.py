@@ -0,0 +1,191 @@
+import gzip
+import json
+import mimetypes
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.http import http_date
+
+from schedulum.compression import (BROTLI, COMPRESSIBLE_TYPES, GZIP, brotli,
+                                   get_min_size, parse_accept_encoding)
+
+# Расширения сжатых вариантов файлов в порядке предпочтения.
+VARIANTS = ((BROTLI, '.br'), (GZIP, '.gz'))
+# Сжатый вариант сохраняется, только если он меньше исходного файла
+# хотя бы на эту долю.
+MIN_SAVING = 0.05
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+CACHE_CONTROL_IMMUTABLE = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+
+
+def get_content_type(name):
+    """Тип содержимого файла по расширению."""
+    content_type, _ = mimetypes.guess_type(name)
+    content_type = content_type or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type.endswith(
+        ('javascript', 'json', 'xml')
+    ):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def compress_file(path):
+    """
+    Сохранение сжатых вариантов файла рядом с ним (.gz и .br, если
+    установлен модуль brotli). Файлы несжимаемых типов, меньше
+    COMPRESSION_MIN_SIZE и файлы, которые почти не сжимаются, пропускаются.
+    Возвращает список созданных файлов.
+    """
+    if not COMPRESSIBLE_TYPES.match(get_content_type(path)):
+        return []
+    data = Path(path).read_bytes()
+    if len(data) < get_min_size():
+        return []
+    compressors = {GZIP: lambda data: gzip.compress(data, 9, mtime=0)}
+    if brotli is not None:
+        compressors[BROTLI] = brotli.compress
+    created = []
+    for encoding, suffix in VARIANTS:
+        if encoding not in compressors:
+            continue
+        target = path + suffix
+        compressed = compressors[encoding](data)
+        if len(compressed) <= len(data) * (1 - MIN_SAVING):
+            Path(target).write_bytes(compressed)
+            created.append(target)
+        elif os.path.exists(target):
+            os.remove(target)
+    return created
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Хранилище статики для collectstatic.
+    1. Файлы копируются в STATIC_ROOT с хешем содержимого в имени
+    (logo.png -> logo.0a1b2c3d4e5f.png), шаблоны ссылаются на них через
+    {% static %} по манифесту staticfiles.json;
+    2. Для сжимаемых файлов рядом сохраняются варианты .gz и .br, которые
+    отдает StaticFilesMiddleware без сжатия на каждый запрос;
+    3. Для файла, отсутствующего в манифесте, хеш вычисляется по файлу
+    в STATIC_ROOT вместо ошибки (manifest_strict = False), при DEBUG=True
+    ссылки строятся без хеша.
+    """
+
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        """Хеширование имен файлов, затем сохранение сжатых вариантов."""
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if self.exists(name):
+                compress_file(self.path(name))
+
+
+class StaticFile():
+    """Файл статики с заранее вычисленными заголовками вариантов."""
+
+    def __init__(self, path, immutable):
+        """Сбор вариантов файла: исходного и сжатых, если они есть."""
+        self.content_type = get_content_type(path)
+        self.cache_control = (
+            CACHE_CONTROL_IMMUTABLE if immutable
+            else f'public, max-age={settings.STATIC_MAX_AGE}'
+        )
+        self.variants = {}
+        for encoding, suffix in VARIANTS + ((None, ''),):
+            variant = path + suffix
+            if os.path.isfile(variant):
+                stat = os.stat(variant)
+                self.variants[encoding] = (
+                    variant, stat.st_size,
+                    f'"{int(stat.st_mtime):x}-{stat.st_size:x}"',
+                    http_date(stat.st_mtime),
+                )
+
+    def get_variant(self, accept_encoding):
+        """Вариант файла для заголовка Accept-Encoding клиента."""
+        encodings = parse_accept_encoding(accept_encoding)
+        for encoding, _ in VARIANTS:
+            if encoding in self.variants and encoding in encodings:
+                return encoding, self.variants[encoding]
+        return None, self.variants[None]
+
+
+def build_static_index(root, static_url, manifest_name='staticfiles.json'):
+    """
+    Индекс файлов STATIC_ROOT по URL. Файлы с хешем в имени (значения
+    манифеста) кешируются клиентами навсегда: при изменении содержимого
+    меняется и имя.
+    """
+    root = Path(root)
+    manifest = root / manifest_name
+    hashed = set()
+    if manifest.is_file():
+        hashed = set(json.loads(manifest.read_text()).get(
+            'paths', {}
+        ).values())
+    suffixes = tuple(suffix for _, suffix in VARIANTS)
+    index = {}
+    for path in root.rglob('*'):
+        if (not path.is_file() or path.name.endswith(suffixes)
+                or path == manifest):
+            continue
+        name = path.relative_to(root).as_posix()
+        index[static_url + name] = StaticFile(str(path), name in hashed)
+    return index
+
+
+class StaticFilesMiddleware():
+    """
+    Раздача статики из STATIC_ROOT в процессе приложения.
+    1. Индекс файлов строится один раз при создании middleware, поэтому
+    запрос к статике не обращается к файловой системе, кроме чтения файла;
+    2. Клиент получает заранее сжатый вариант файла (.br или .gz), если
+    принимает эту кодировку, и Cache-Control immutable для файлов с хешем;
+    3. При DEBUG=True middleware отключается, статику отдает runserver.
+    """
+
+    def __init__(self, get_response):
+        """Построение индекса файлов статики."""
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.files = build_static_index(settings.STATIC_ROOT,
+                                        settings.STATIC_URL)
+
+    def __call__(self, request):
+        """Ответ файлом статики или передача запроса дальше."""
+        static_file = self.files.get(request.path_info)
+        if static_file is None or request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+        return self.serve(request, static_file)
+
+    @staticmethod
+    def serve(request, static_file):
+        """Ответ вариантом файла с заголовками кеширования."""
+        encoding, (path, size, etag, last_modified) = static_file.get_variant(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                open(path, 'rb'), content_type=static_file.content_type
+            )
+            response['Content-Length'] = str(size)
+            del response['Content-Disposition']
+            if encoding is not None:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        response['Cache-Control'] = static_file.cache_control
+        if len(static_file.variants) > 1:
+            response['Vary'] = 'Accept-Encoding'
+        return response
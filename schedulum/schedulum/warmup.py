@@ -0,0 +1,80 @@
+import logging
+from importlib import import_module
+from pathlib import Path
+
+from django.db import DatabaseError, connections
+from django.template import engines
+from django.urls import get_resolver
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODULES = (
+    'api.v1.renderers',
+    'api.v1.serializers',
+    'api.v1.views',
+    'schedules.admin',
+    'schedules.forms',
+    'schedules.views',
+)
+API_SETTINGS = (
+    'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_PARSER_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES',
+    'DEFAULT_RENDERER_CLASSES',
+    'DEFAULT_THROTTLE_CLASSES',
+)
+
+
+def populate_resolver(resolver):
+    """Построение таблиц reverse и resolve для URLconf и вложенных."""
+    resolver.reverse_dict
+    for _, namespace_resolver in resolver.namespace_dict.values():
+        populate_resolver(namespace_resolver)
+
+
+def warmup_templates():
+    """
+    Загрузка шаблонов проекта. При DEBUG=False шаблоны сохраняются
+    в кеше загрузчика и не компилируются заново при первом запросе.
+    """
+    count = 0
+    for engine in engines.all():
+        for directory in getattr(engine, 'dirs', ()):
+            for path in sorted(Path(directory).rglob('*.html')):
+                engine.get_template(path.relative_to(directory).as_posix())
+                count += 1
+    return count
+
+
+def warmup_routes():
+    """Построение таблицы маршрутов недель в кеше процесса."""
+    from schedules.routing import get_week_routes
+    try:
+        return len(get_week_routes().by_id)
+    except DatabaseError:
+        logger.warning('Таблица маршрутов недель не построена: '
+                       'база данных недоступна.', exc_info=True)
+        return 0
+
+
+def warmup():
+    """
+    Прогрев процесса перед обработкой запросов.
+    1. Импорт модулей views, сериализаторов и классов из настроек DRF;
+    2. Построение таблиц URLconf, загрузка шаблонов и таблицы маршрутов
+    недель;
+    3. Закрытие соединений с базой данных: при preload_app прогрев
+    выполняется в мастер-процессе, и рабочие процессы не должны получить
+    открытое соединение в наследство.
+    """
+    for module in WARMUP_MODULES:
+        import_module(module)
+    for name in API_SETTINGS:
+        getattr(api_settings, name)
+    populate_resolver(get_resolver())
+    templates = warmup_templates()
+    routes = warmup_routes()
+    connections.close_all()
+    logger.info('Прогрев завершен: шаблонов %s, недель %s.',
+                templates, routes)
@@ -5,3 +5,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schedulum.settings')
 
 application = get_wsgi_application()
+
+if os.getenv('WSGI_WARMUP', 'True') == 'True':
+    from schedulum.warmup import warmup
+
+    warmup()